@@ -13,6 +13,25 @@ BEGIN
 END
 $$;
 
+CREATE OR REPLACE FUNCTION notify_feature_flag_change() RETURNS trigger
+  LANGUAGE plpgsql
+AS
+$$
+DECLARE
+  payload JSON;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    payload = json_build_object('op', TG_OP, 'code', OLD.code, 'updated_at', OLD.updated_at);
+  ELSIF TG_OP = 'UPDATE' AND NEW.code IS DISTINCT FROM OLD.code THEN
+    payload = json_build_object('op', TG_OP, 'code', NEW.code, 'old_code', OLD.code, 'updated_at', NEW.updated_at);
+  ELSE
+    payload = json_build_object('op', TG_OP, 'code', NEW.code, 'updated_at', NEW.updated_at);
+  END IF;
+  PERFORM pg_notify('feature_flag_changes', payload::TEXT);
+  RETURN NULL;
+END
+$$;
+
 -- Create table
 CREATE TABLE IF NOT EXISTS public.feature_flags (
     id uuid DEFAULT uuid_generate_v4() NOT NULL PRIMARY KEY,
@@ -34,3 +53,13 @@ DO $$
             EXECUTE PROCEDURE update_updated_at();
     END IF;
 END $$;
+
+DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'notify_feature_flag_change') THEN
+            CREATE TRIGGER notify_feature_flag_change
+                AFTER INSERT OR UPDATE OR DELETE ON feature_flags
+                FOR EACH ROW
+            EXECUTE PROCEDURE notify_feature_flag_change();
+    END IF;
+END $$;
@@ -0,0 +1,10 @@
+-- Change notifications written in the same transaction as the flag change and
+-- delivered by OutboxRelay.
+CREATE TABLE IF NOT EXISTS public.feature_flag_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    code VARCHAR(255) NOT NULL,
+    change_status VARCHAR(32) NOT NULL,
+    payload JSONB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
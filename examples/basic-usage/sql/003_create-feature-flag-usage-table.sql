@@ -0,0 +1,8 @@
+-- Hourly evaluation counts written by PostgresUsageStore.
+CREATE TABLE IF NOT EXISTS public.feature_flag_usage (
+    code VARCHAR(255) NOT NULL,
+    hour TIMESTAMP WITH TIME ZONE NOT NULL,
+    result BOOLEAN NOT NULL,
+    count BIGINT NOT NULL,
+    PRIMARY KEY (code, hour, result)
+);
@@ -2,5 +2,6 @@
 # core/__init__.py
 from .exceptions import (
     FeatureFlagError,
-    FeatureFlagNotFoundError
+    FeatureFlagNotFoundError,
+    FeatureFlagConflictError,
 )
\ No newline at end of file
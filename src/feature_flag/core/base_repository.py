@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, TypeVar, Generic, Type
+from typing import Iterable, List, Optional, TypeVar, Generic, Type
 
 import inflection
 
@@ -16,7 +16,9 @@ class BaseRepository(ABC, Generic[T]):
         pass
 
     @abstractmethod
-    async def update(self, entity: T) -> None:
+    async def update(
+        self, entity: T, fields: Optional[Iterable[str]] = None
+    ) -> Optional[T]:
         pass
 
     @abstractmethod
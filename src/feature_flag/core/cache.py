@@ -1,8 +1,34 @@
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import orjson
 from asyncpg.pgproto.pgproto import UUID as AsyncpgUUID
 from redis import RedisCluster
+from redis.asyncio import Redis as AsyncRedis
+from redis.asyncio import RedisCluster as AsyncRedisCluster
+
+from feature_flag.core.metrics import Metrics, get_default_metrics, timed
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    tombstones: int = 0
+    tombstone_hits: int = 0
+
+
+class _Tombstone:
+    def __repr__(self):
+        return "TOMBSTONE"
+
+
+# Cached marker for a key that is known not to exist in the repository.
+TOMBSTONE = _Tombstone()
+
+_TOMBSTONE_PAYLOAD = {"__tombstone__": True}
 
 
 def orjson_default(obj):
@@ -11,28 +37,210 @@ def orjson_default(obj):
     raise TypeError(f"Type is not JSON serializable: {type(obj)}")
 
 
-class RedisCache:
-    def __init__(self, connection: RedisCluster, namespace: str = ""):
+def _serialize(value: Any) -> bytes:
+    return orjson.dumps(value, default=orjson_default)
+
+
+def _deserialize(value: Any) -> Any:
+    if value is None:
+        return None
+    return orjson.loads(value)
+
+
+class _BaseRedisCache:
+    def __init__(
+        self, connection: Any, namespace: str = "", metrics: Optional[Metrics] = None
+    ):
         self.connection = connection
         self.namespace = namespace
+        self.stats = CacheStats()
+        self.metrics = metrics if metrics is not None else get_default_metrics()
+        self._hits = self.metrics.counter(
+            "feature_flag_cache_requests_total", tier="redis", result="hit"
+        )
+        self._misses = self.metrics.counter(
+            "feature_flag_cache_requests_total", tier="redis", result="miss"
+        )
 
     def _format_key(self, key: str):
         return f"{self.namespace}:{key}" if self.namespace else key
 
-    def set(self, key: str, value: Any):
+    def _mget(self, keys: List[str]):
+        # MGET across hash slots is rejected by Redis Cluster, so cluster clients
+        # split the keys per slot with mget_nonatomic instead.
+        if hasattr(self.connection, "mget_nonatomic"):
+            return self.connection.mget_nonatomic(keys)
+        return self.connection.mget(keys)
+
+    def _load(self, value: Any) -> Any:
+        value = _deserialize(value)
+        if value is None:
+            self.stats.misses += 1
+            self._misses.inc()
+            return None
+        self.stats.hits += 1
+        self._hits.inc()
+        if value == _TOMBSTONE_PAYLOAD:
+            self.stats.tombstone_hits += 1
+            return TOMBSTONE
+        return value
+
+    def _load_with_ttl(self, value: Any, pttl: int) -> Tuple[Any, Optional[float]]:
+        # PTTL is -2 for a missing key and -1 for a key without expiry.
+        return self._load(value), pttl / 1000 if pttl >= 0 else None
+
+    def _tombstone_args(self, key: str, ttl: float):
+        self.stats.tombstones += 1
+        return self._format_key(key), _serialize(_TOMBSTONE_PAYLOAD), _to_px(ttl)
+
+
+def _to_px(ttl: Optional[float]) -> Optional[int]:
+    return max(int(ttl * 1000), 1) if ttl is not None else None
+
+
+class RedisCache(_BaseRedisCache):
+    def __init__(
+        self,
+        connection: RedisCluster,
+        namespace: str = "",
+        metrics: Optional[Metrics] = None,
+    ):
+        super().__init__(connection=connection, namespace=namespace, metrics=metrics)
+
+    @timed("redis", "set")
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
         formatted_key = self._format_key(key)
-        serialized_value = orjson.dumps(value, default=orjson_default)  # Use the custom serialization function
-        self.connection.set(formatted_key, serialized_value)
+        serialized_value = _serialize(value)  # Use the custom serialization function
+        self.connection.set(formatted_key, serialized_value, px=_to_px(ttl))
 
+    @timed("redis", "get")
     def get(self, key: str):
         formatted_key = self._format_key(key)
         value = self.connection.get(formatted_key)
+        return self._load(value)
 
-        if value is None:
-            return None
-
-        return orjson.loads(value)
+    @timed("redis", "get_with_ttl")
+    def get_with_ttl(self, key: str) -> Tuple[Any, Optional[float]]:
+        """
+        Get a value together with its remaining time-to-live in seconds.
+        """
+        formatted_key = self._format_key(key)
+        pipeline = self.connection.pipeline(transaction=False)
+        pipeline.get(formatted_key)
+        pipeline.pttl(formatted_key)
+        value, pttl = pipeline.execute()
+        return self._load_with_ttl(value, pttl)
 
+    @timed("redis", "delete")
     def delete(self, key: str):
         formatted_key = self._format_key(key)
         self.connection.delete(formatted_key)
+
+    @timed("redis", "get_many")
+    def get_many(self, keys: List[str]) -> List[Any]:
+        if not keys:
+            return []
+        values = self._mget([self._format_key(key) for key in keys])
+        return [self._load(value) for value in values]
+
+    @timed("redis", "set_many")
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[float] = None):
+        if not mapping:
+            return
+        pipeline = self.connection.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipeline.set(self._format_key(key), _serialize(value), px=_to_px(ttl))
+        pipeline.execute()
+
+    @timed("redis", "set_tombstone")
+    def set_tombstone(self, key: str, ttl: float):
+        formatted_key, value, ttl_ms = self._tombstone_args(key, ttl)
+        self.connection.set(formatted_key, value, px=ttl_ms)
+
+    @timed("redis", "set_tombstones_many")
+    def set_tombstones_many(self, keys: List[str], ttl: float):
+        if not keys:
+            return
+        pipeline = self.connection.pipeline(transaction=False)
+        for key in keys:
+            formatted_key, value, ttl_ms = self._tombstone_args(key, ttl)
+            pipeline.set(formatted_key, value, px=ttl_ms)
+        pipeline.execute()
+
+
+class AsyncRedisCache(_BaseRedisCache):
+    """
+    Redis cache backed by ``redis.asyncio`` so lookups never block the event loop.
+
+    Accepts either an asyncio ``RedisCluster`` or a standalone asyncio ``Redis``
+    client. Keys and values are formatted exactly like ``RedisCache``, so both
+    implementations can share the same namespace.
+    """
+
+    def __init__(
+        self,
+        connection: Union[AsyncRedisCluster, AsyncRedis],
+        namespace: str = "",
+        metrics: Optional[Metrics] = None,
+    ):
+        super().__init__(connection=connection, namespace=namespace, metrics=metrics)
+
+    @timed("redis", "set")
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        formatted_key = self._format_key(key)
+        serialized_value = _serialize(value)
+        await self.connection.set(formatted_key, serialized_value, px=_to_px(ttl))
+
+    @timed("redis", "get")
+    async def get(self, key: str):
+        formatted_key = self._format_key(key)
+        value = await self.connection.get(formatted_key)
+        return self._load(value)
+
+    @timed("redis", "get_with_ttl")
+    async def get_with_ttl(self, key: str) -> Tuple[Any, Optional[float]]:
+        """
+        Get a value together with its remaining time-to-live in seconds.
+        """
+        formatted_key = self._format_key(key)
+        async with self.connection.pipeline(transaction=False) as pipeline:
+            pipeline.get(formatted_key)
+            pipeline.pttl(formatted_key)
+            value, pttl = await pipeline.execute()
+        return self._load_with_ttl(value, pttl)
+
+    @timed("redis", "delete")
+    async def delete(self, key: str):
+        formatted_key = self._format_key(key)
+        await self.connection.delete(formatted_key)
+
+    @timed("redis", "get_many")
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        if not keys:
+            return []
+        values = await self._mget([self._format_key(key) for key in keys])
+        return [self._load(value) for value in values]
+
+    @timed("redis", "set_many")
+    async def set_many(self, mapping: Dict[str, Any], ttl: Optional[float] = None):
+        if not mapping:
+            return
+        async with self.connection.pipeline(transaction=False) as pipeline:
+            for key, value in mapping.items():
+                pipeline.set(self._format_key(key), _serialize(value), px=_to_px(ttl))
+            await pipeline.execute()
+
+    @timed("redis", "set_tombstone")
+    async def set_tombstone(self, key: str, ttl: float):
+        formatted_key, value, ttl_ms = self._tombstone_args(key, ttl)
+        await self.connection.set(formatted_key, value, px=ttl_ms)
+
+    @timed("redis", "set_tombstones_many")
+    async def set_tombstones_many(self, keys: List[str], ttl: float):
+        if not keys:
+            return
+        async with self.connection.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                formatted_key, value, ttl_ms = self._tombstone_args(key, ttl)
+                pipeline.set(formatted_key, value, px=ttl_ms)
+            await pipeline.execute()
@@ -0,0 +1,67 @@
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Controls how feature flags are written to and served from the shared cache.
+
+    Attributes:
+        ttl (float, optional): Time-to-live of a cache entry in seconds. ``None`` keeps
+            entries until they are overwritten or deleted. Use a finite ``ttl`` while
+            releases with different ``FeatureFlag`` fields share the cache: their
+            writes do not evict each other's entries.
+        jitter (float): Fraction of ``ttl`` added or removed at random, so that entries
+            written together do not expire together. ``0.1`` means +/- 10%.
+        stale_while_revalidate (float): Number of seconds after ``ttl`` during which an
+            expired entry is still served while it is refreshed in the background.
+        write_on_miss_only (bool): Only write to the cache after a cache miss. When
+            ``False`` every read rewrites the entry, as in earlier versions.
+    """
+
+    ttl: Optional[float] = None
+    jitter: float = 0.0
+    stale_while_revalidate: float = 0.0
+    write_on_miss_only: bool = True
+
+    def __post_init__(self):
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+        if not 0 <= self.jitter < 1:
+            raise ValueError("jitter must be in the range [0, 1)")
+        if self.stale_while_revalidate < 0:
+            raise ValueError("stale_while_revalidate must not be negative")
+        if self.stale_while_revalidate and self.ttl is None:
+            raise ValueError("stale_while_revalidate requires a ttl")
+
+    def next_ttl(self) -> Optional[float]:
+        """
+        The time-to-live of a new entry in seconds, including jitter.
+        """
+        if self.ttl is None:
+            return None
+        if not self.jitter:
+            return self.ttl
+        return self.ttl * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def next_expiry(self) -> Optional[float]:
+        """
+        The time after which the cache must drop a new entry: the jittered ``ttl``
+        plus the ``stale_while_revalidate`` window.
+        """
+        ttl = self.next_ttl()
+        if ttl is None:
+            return None
+        return ttl + self.stale_while_revalidate
+
+    def is_stale(self, remaining_ttl: Optional[float]) -> bool:
+        """
+        Whether an entry with ``remaining_ttl`` seconds left is past its ``ttl``.
+        """
+        return (
+            self.stale_while_revalidate > 0
+            and remaining_ttl is not None
+            and remaining_ttl <= self.stale_while_revalidate
+        )
@@ -0,0 +1,162 @@
+import cProfile
+import functools
+import io
+import logging
+import pstats
+from contextvars import ContextVar
+from dataclasses import dataclass
+from random import random
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Wraps a sampled service call: receives the operation name and a function
+# starting the call, and must return the call's result.
+CallHook = Callable[[str, Callable[[], Awaitable[Any]]], Awaitable[Any]]
+
+# Time spent per phase ("redis", "postgres", "serialization", ...) by the
+# service call running in the current context, if it is being traced.
+_current_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "feature_flag_call_timings", default=None
+)
+
+
+@dataclass
+class DiagnosticsPolicy:
+    """
+    How ``FeatureFlagService`` logs and inspects its calls.
+
+    Attributes:
+        log_sample_rate (float): Fraction of hot-path reads, e.g.
+            ``get_feature_flag_by_code``, that are logged at INFO level.
+        slow_threshold (float, optional): Calls taking at least this many seconds are
+            logged at WARNING level with the time spent in Redis, Postgres and
+            serialization. ``None`` disables the slow-operation log.
+        call_hook (CallHook, optional): Wraps sampled calls, e.g. ``profile_hook()``.
+        hook_sample_rate (float): Fraction of calls passed to ``call_hook``.
+    """
+
+    log_sample_rate: float = 1.0
+    slow_threshold: Optional[float] = None
+    call_hook: Optional[CallHook] = None
+    hook_sample_rate: float = 1.0
+
+    def sample_log(self) -> bool:
+        return _sample(self.log_sample_rate)
+
+    def sample_hook(self) -> bool:
+        return _sample(self.hook_sample_rate)
+
+
+def _sample(rate: float) -> bool:
+    return rate >= 1.0 or (rate > 0.0 and random() < rate)
+
+
+def record_phase(phase: str, start: float) -> None:
+    """
+    Add the time elapsed since ``start`` (a ``perf_counter`` value) to ``phase``
+    of the traced call running in the current context, if any.
+    """
+    timings = _current_timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + perf_counter() - start
+
+
+def traced(operation: str):
+    """
+    Apply the ``DiagnosticsPolicy`` in ``self.diagnostics`` to a service method.
+
+    Without a slow threshold or a call hook the call is forwarded as is. Calls
+    made from within a traced call are part of the outer call's breakdown.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            policy = self.diagnostics
+            if (
+                policy.slow_threshold is None and policy.call_hook is None
+            ) or _current_timings.get() is not None:
+                return await method(self, *args, **kwargs)
+
+            timings: Dict[str, float] = {}
+            token = _current_timings.set(timings)
+            start = perf_counter()
+            try:
+                if policy.call_hook is not None and policy.sample_hook():
+                    return await policy.call_hook(
+                        operation, lambda: method(self, *args, **kwargs)
+                    )
+                return await method(self, *args, **kwargs)
+            finally:
+                _current_timings.reset(token)
+                elapsed = perf_counter() - start
+                if (
+                    policy.slow_threshold is not None
+                    and elapsed >= policy.slow_threshold
+                ):
+                    _log_slow(operation, elapsed, timings)
+
+        return wrapper
+
+    return decorator
+
+
+def _log_slow(operation: str, elapsed: float, timings: Dict[str, float]) -> None:
+    other = elapsed - sum(timings.values())
+    breakdown = ", ".join(
+        f"{phase}={seconds * 1000:.1f}ms"
+        for phase, seconds in (*sorted(timings.items()), ("other", max(other, 0.0)))
+    )
+    logger.warning(
+        "Slow feature flag operation %s took %.1fms (%s)",
+        operation,
+        elapsed * 1000,
+        breakdown,
+    )
+
+
+# cProfile supports a single active profiler per thread.
+_profiling = False
+
+
+def profile_hook(
+    report: Optional[Callable[[str, pstats.Stats], None]] = None,
+    limit: int = 20,
+) -> CallHook:
+    """
+    A ``CallHook`` profiling calls with ``cProfile``.
+
+    The profiler runs from the start to the end of the call, so it also sees
+    other tasks that run on the event loop meanwhile. Calls that start while
+    another call is being profiled are not profiled.
+
+    Args:
+        report (Callable[[str, pstats.Stats], None], optional): Receives the operation and
+            its profile. By default the ``limit`` most expensive functions by cumulative
+            time are logged at INFO level.
+        limit (int, optional): The number of functions logged by the default report.
+    """
+
+    async def hook(operation: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        global _profiling
+        if _profiling:
+            return await call()
+        _profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return await call()
+        finally:
+            profiler.disable()
+            _profiling = False
+            if report is not None:
+                report(operation, pstats.Stats(profiler))
+            else:
+                stream = io.StringIO()
+                stats = pstats.Stats(profiler, stream=stream)
+                stats.sort_stats("cumulative").print_stats(limit)
+                logger.info("Profile of %s:\n%s", operation, stream.getvalue())
+
+    return hook
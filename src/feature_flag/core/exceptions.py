@@ -9,5 +9,9 @@ class FeatureFlagNotFoundError(FeatureFlagError):
     """Raised when a feature flag is not found."""
 
 
+class FeatureFlagConflictError(FeatureFlagError):
+    """Raised when a feature flag was changed concurrently by another writer."""
+
+
 class NotifierError(Exception):
     """Base exception for notifier errors."""
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Callable, List, Optional
+
+import orjson
+from redis.asyncio import Redis as AsyncRedis
+
+from feature_flag.core.local_cache import LocalCache
+
+logger = logging.getLogger(__name__)
+
+InvalidationListener = Callable[[Optional[str]], Any]
+
+
+class CacheInvalidationBus:
+    """
+    Propagates feature flag invalidations between processes over Redis pub/sub.
+
+    Every write publishes a compact message on a namespace-scoped channel. A
+    background subscriber evicts the matching entry from the local cache of
+    every other process. When the subscription is lost, the subscriber
+    reconnects with exponential backoff and runs a full resync, since messages
+    published during the gap are never delivered.
+
+    Listeners registered with ``add_listener`` are called with the invalidated
+    code, or with ``None`` when everything must be resynchronized.
+    """
+
+    def __init__(
+        self,
+        connection: AsyncRedis,
+        local_cache: Optional[LocalCache] = None,
+        namespace: str = "",
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+    ):
+        """
+        Initializes the CacheInvalidationBus.
+
+        Args:
+            connection (redis.asyncio.Redis): Connection used to publish and subscribe. Pub/sub is not
+                available on the asyncio ``RedisCluster`` client, so a standalone client (for example one
+                connected to any cluster node) is expected.
+            local_cache (LocalCache, optional): The in-process cache to invalidate.
+            namespace (str, optional): Namespace of the channel; should match the cache namespace.
+            reconnect_delay (float, optional): Initial delay in seconds before reconnecting.
+            max_reconnect_delay (float, optional): Upper bound of the reconnect backoff in seconds.
+        """
+        self.connection = connection
+        self.local_cache = local_cache
+        self.channel = f"{namespace}:invalidations" if namespace else "invalidations"
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.node_id = uuid.uuid4().hex
+        self._listeners: List[InvalidationListener] = []
+        self._task: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    def add_listener(self, listener: InvalidationListener) -> None:
+        self._listeners.append(listener)
+
+    async def publish(self, code: str) -> None:
+        """
+        Publish an invalidation for the given code.
+
+        Publishing is best effort: a failure is logged and never fails the write
+        that triggered it.
+        """
+        await self._publish({"n": self.node_id, "c": code})
+
+    async def publish_resync(self) -> None:
+        """
+        Ask every other process to drop all of its cached feature flags.
+        """
+        await self._publish({"n": self.node_id, "r": 1})
+
+    async def _publish(self, message: dict) -> None:
+        try:
+            await self.connection.publish(self.channel, orjson.dumps(message))
+        except Exception as e:
+            logger.warning("Failed to publish cache invalidation: %s", e)
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._subscribed.clear()
+
+    async def wait_until_subscribed(self) -> None:
+        await self._subscribed.wait()
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        needs_resync = False
+        while True:
+            pubsub = self.connection.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                self._subscribed.set()
+                if needs_resync:
+                    logger.info("Resubscribed to %s; resynchronizing", self.channel)
+                    self._resync()
+                    needs_resync = False
+                delay = self.reconnect_delay
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "Lost subscription to %s: %s; reconnecting in %.1fs",
+                    self.channel,
+                    e,
+                    delay,
+                )
+            finally:
+                self._subscribed.clear()
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+            needs_resync = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _handle(self, data: Any) -> None:
+        try:
+            message = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            logger.warning("Ignoring malformed invalidation message: %r", data)
+            return
+
+        if message.get("n") == self.node_id:
+            return
+        if message.get("r"):
+            self._resync()
+            return
+
+        code = message.get("c")
+        if code is None:
+            return
+        if self.local_cache is not None:
+            self.local_cache.delete(code)
+        self._notify_listeners(code)
+
+    def _resync(self) -> None:
+        if self.local_cache is not None:
+            self.local_cache.clear()
+        self._notify_listeners(None)
+
+    def _notify_listeners(self, code: Optional[str]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(code)
+            except Exception as e:
+                logger.warning("Invalidation listener failed: %s", e)
@@ -0,0 +1,101 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from feature_flag.core.cache import TOMBSTONE, CacheStats
+from feature_flag.core.metrics import Metrics, get_default_metrics
+
+
+class LocalCache:
+    """
+    Bounded in-process cache with LRU eviction and per-entry TTL.
+
+    Intended as an L1 tier in front of ``RedisCache`` (or in front of the
+    repository when Redis is not configured). It is not thread-safe and is
+    meant to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: Optional[float] = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        metrics: Optional[Metrics] = None,
+    ):
+        """
+        Initializes the LocalCache.
+
+        Args:
+            max_size (int): Maximum number of entries kept before evicting the least recently used one.
+            ttl (float, optional): Default time-to-live of an entry in seconds. ``None`` disables expiry.
+            clock (Callable[[], float], optional): Monotonic clock used to compute expiry.
+            metrics (Metrics, optional): Receives the hit, miss and eviction counts.
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.metrics = metrics if metrics is not None else get_default_metrics()
+        self._hits = self.metrics.counter(
+            "feature_flag_cache_requests_total", tier="local", result="hit"
+        )
+        self._misses = self.metrics.counter(
+            "feature_flag_cache_requests_total", tier="local", result="miss"
+        )
+        self._evictions = self.metrics.counter(
+            "feature_flag_cache_evictions_total", tier="local"
+        )
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = (
+            OrderedDict()
+        )
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            self._misses.inc()
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            self._misses.inc()
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        self._hits.inc()
+        if value is TOMBSTONE:
+            self.stats.tombstone_hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+            self._evictions.inc()
+
+    def set_tombstone(self, key: Hashable, ttl: float) -> None:
+        """
+        Remember that ``key`` does not exist for ``ttl`` seconds.
+        """
+        self.stats.tombstones += 1
+        self.set(key, TOMBSTONE, ttl=ttl)
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,339 @@
+import functools
+import inspect
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from time import perf_counter
+from typing import Dict, List, Sequence, Tuple
+
+from feature_flag.core.diagnostics import record_phase
+
+# Latency buckets in seconds, from a local cache hit to a slow webhook.
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    """
+    A monotonically increasing value. This base class records nothing.
+    """
+
+    __slots__ = ()
+
+    def inc(self, value: float = 1) -> None:
+        pass
+
+
+class Gauge:
+    """
+    A value that can go up and down. This base class records nothing.
+    """
+
+    __slots__ = ()
+
+    def set(self, value: float) -> None:
+        pass
+
+
+class Histogram:
+    """
+    A distribution of observed values. This base class records nothing.
+    """
+
+    __slots__ = ()
+
+    def observe(self, value: float) -> None:
+        pass
+
+
+class OperationTimer:
+    __slots__ = ("latency", "errors")
+
+    def __init__(self, latency: Histogram, errors: Counter):
+        self.latency = latency
+        self.errors = errors
+
+
+class Metrics(ABC):
+    """
+    Creates the instruments the library records to.
+
+    Components resolve their instruments once and keep them, so recording a
+    value is a single method call on the instrument. Instruments are identified
+    by name and labels; asking twice returns the same instrument.
+    """
+
+    def __init__(self):
+        self._timers: Dict[Tuple[str, str], OperationTimer] = {}
+
+    @abstractmethod
+    def counter(self, name: str, **labels: str) -> Counter:
+        pass
+
+    @abstractmethod
+    def gauge(self, name: str, **labels: str) -> Gauge:
+        pass
+
+    @abstractmethod
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        pass
+
+    def timer(self, component: str, operation: str) -> OperationTimer:
+        """
+        The latency histogram and error counter of an operation, as used by ``timed``.
+        """
+        key = (component, operation)
+        timer = self._timers.get(key)
+        if timer is None:
+            timer = OperationTimer(
+                latency=self.histogram(
+                    "feature_flag_operation_duration_seconds",
+                    component=component,
+                    operation=operation,
+                ),
+                errors=self.counter(
+                    "feature_flag_operation_errors_total",
+                    component=component,
+                    operation=operation,
+                ),
+            )
+            self._timers[key] = timer
+        return timer
+
+
+class NoopMetrics(Metrics):
+    """
+    Discards every value; the default.
+    """
+
+    _counter = Counter()
+    _gauge = Gauge()
+    _histogram = Histogram()
+
+    def counter(self, name: str, **labels: str) -> Counter:
+        return self._counter
+
+    def gauge(self, name: str, **labels: str) -> Gauge:
+        return self._gauge
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        return self._histogram
+
+
+class _PrometheusCounter(Counter):
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, value: float = 1) -> None:
+        self.value += value
+
+
+class _PrometheusGauge(Gauge):
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _PrometheusHistogram(Histogram):
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        # One count per bucket plus +Inf, not cumulative.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class PrometheusMetrics(Metrics):
+    """
+    Keeps every instrument in memory and renders them in the Prometheus text
+    exposition format.
+
+    Serve ``render()`` with the ``PROMETHEUS_CONTENT_TYPE`` content type from a
+    ``/metrics`` endpoint.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initializes the PrometheusMetrics.
+
+        Args:
+            buckets (Sequence[float], optional): Upper bounds of the histogram buckets.
+        """
+        super().__init__()
+        self.buckets = tuple(sorted(buckets))
+        self._families: Dict[str, Tuple[str, Dict[Labels, object]]] = {}
+
+    def counter(self, name: str, **labels: str) -> Counter:
+        return self._instrument(name, "counter", labels, _PrometheusCounter)
+
+    def gauge(self, name: str, **labels: str) -> Gauge:
+        return self._instrument(name, "gauge", labels, _PrometheusGauge)
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        return self._instrument(
+            name, "histogram", labels, lambda: _PrometheusHistogram(self.buckets)
+        )
+
+    def _instrument(self, name, kind, labels, factory):
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = (kind, {})
+        elif family[0] != kind:
+            raise ValueError(f"Metric {name} is a {family[0]}, not a {kind}")
+        key = tuple(sorted(labels.items()))
+        instrument = family[1].get(key)
+        if instrument is None:
+            instrument = family[1][key] = factory()
+        return instrument
+
+    def render(self) -> str:
+        """
+        Render every instrument in the Prometheus text format.
+        """
+        lines: List[str] = []
+        for name, (kind, instruments) in sorted(self._families.items()):
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, instrument in sorted(instruments.items()):
+                if kind == "histogram":
+                    cumulative = 0
+                    for bound, count in zip(
+                        (*instrument.bounds, math.inf), instrument.counts
+                    ):
+                        cumulative += count
+                        le = "+Inf" if bound == math.inf else repr(float(bound))
+                        lines.append(
+                            f"{name}_bucket{_format_labels(labels + (('le', le),))}"
+                            f" {cumulative}"
+                        )
+                    lines.append(
+                        f"{name}_sum{_format_labels(labels)} {_format_value(instrument.sum)}"
+                    )
+                    lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+                else:
+                    lines.append(
+                        f"{name}{_format_labels(labels)} {_format_value(instrument.value)}"
+                    )
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+_default_metrics: Metrics = NoopMetrics()
+
+
+def get_default_metrics() -> Metrics:
+    return _default_metrics
+
+
+def set_default_metrics(metrics: Metrics) -> None:
+    """
+    Set the metrics used by components created without an explicit ``metrics``.
+
+    Call it on startup, before creating the caches, repositories and services.
+    """
+    global _default_metrics
+    _default_metrics = metrics
+
+
+def timed(
+    component: str,
+    operation: str,
+    expected: Tuple[type, ...] = (),
+    breakdown: bool = True,
+):
+    """
+    Record the latency and the errors of a method in ``self.metrics``.
+
+    With ``breakdown``, the latency is also added to the ``component`` phase of
+    the traced service call in progress, if any (see ``traced``).
+
+    Args:
+        component (str): The ``component`` label, e.g. ``"redis"``.
+        operation (str): The ``operation`` label, e.g. ``"get"``.
+        expected (Tuple[type, ...], optional): Exception types that are outcomes
+            rather than errors, e.g. ``FeatureFlagNotFoundError``.
+        breakdown (bool, optional): Whether the latency is part of the slow-operation breakdown.
+    """
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                timer = self.metrics.timer(component, operation)
+                start = perf_counter()
+                try:
+                    return await method(self, *args, **kwargs)
+                except expected:
+                    raise
+                except Exception:
+                    timer.errors.inc()
+                    raise
+                finally:
+                    timer.latency.observe(perf_counter() - start)
+                    if breakdown:
+                        record_phase(component, start)
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            timer = self.metrics.timer(component, operation)
+            start = perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            except expected:
+                raise
+            except Exception:
+                timer.errors.inc()
+                raise
+            finally:
+                timer.latency.observe(perf_counter() - start)
+                if breakdown:
+                    record_phase(component, start)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+R = TypeVar("R")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into a single in-flight call.
+
+    The first caller for a key runs the call; callers that arrive while it is in
+    flight wait for it and receive the same result, or the same exception. If
+    the first caller is cancelled, one of the waiters takes over.
+
+    Waiters receive the very same result object unless ``share`` is given, in
+    which case it is applied to the result (e.g. to hand out copies).
+
+    Share a single instance between services to coalesce calls across requests.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[R]],
+        share: Optional[Callable[[R], R]] = None,
+    ) -> R:
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            try:
+                result = await asyncio.shield(future)
+                return share(result) if share is not None else result
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    # The call was cancelled together with its caller; retry it.
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
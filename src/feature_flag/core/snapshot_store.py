@@ -0,0 +1,128 @@
+import zlib
+from typing import Any, Iterable, List, NamedTuple, Optional, Union
+
+import orjson
+from redis.asyncio import Redis as AsyncRedis
+from redis.asyncio import RedisCluster as AsyncRedisCluster
+
+from feature_flag.core.cache import orjson_default
+from feature_flag.models.codec import DataclassCodec, feature_flag_codec
+
+# First byte of every blob, bumped whenever the encoding changes.
+_FORMAT = 1
+
+# Atomically replaces the snapshot unless a snapshot built from newer data was
+# already published, and bumps the version. KEYS[1] is the snapshot hash,
+# ARGV[1] the time the data was read at and ARGV[2] the blob.
+_PUBLISH_SCRIPT = """
+local as_of = redis.call('HGET', KEYS[1], 'as_of')
+if as_of and tonumber(ARGV[1]) < tonumber(as_of) then
+  return 0
+end
+local version = redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('HSET', KEYS[1], 'as_of', ARGV[1], 'data', ARGV[2])
+return version
+"""
+
+
+class Snapshot(NamedTuple):
+    version: int
+    entities: List[Any]
+
+
+class SnapshotStore:
+    """
+    Stores every feature flag as a single versioned, compressed blob in Redis.
+
+    The snapshot lives in one hash with the fields ``version``, ``as_of`` and
+    ``data``, so a process can bootstrap the whole flag set with one round trip
+    and check for changes by reading the version alone. Every publish
+    increments the version; a publish built from data older than the stored
+    snapshot is discarded, so concurrent rebuilds never move the snapshot back.
+    """
+
+    def __init__(
+        self,
+        connection: Union[AsyncRedis, AsyncRedisCluster],
+        namespace: str = "",
+        codec: DataclassCodec = feature_flag_codec,
+        compression_level: int = 6,
+    ):
+        """
+        Initializes the SnapshotStore.
+
+        Args:
+            connection (redis.asyncio.Redis | redis.asyncio.RedisCluster): The Redis connection, created
+                with ``decode_responses=False`` (the default) since the snapshot is binary.
+            namespace (str, optional): Namespace of the snapshot key; should match the cache namespace.
+            codec (DataclassCodec, optional): Encodes the stored entities.
+            compression_level (int, optional): The ``zlib`` compression level, from 0 to 9.
+        """
+        self.connection = connection
+        self.key = f"{namespace}:snapshot" if namespace else "snapshot"
+        self.codec = codec
+        self.compression_level = compression_level
+
+    async def publish(self, entities: Iterable[Any], as_of: float) -> Optional[int]:
+        """
+        Replace the snapshot.
+
+        Args:
+            entities (Iterable): Every entity of the snapshot.
+            as_of (float): When the entities were read, as a Unix timestamp. Use one
+                clock for every publisher, e.g. the database's.
+
+        Returns:
+            Optional[int]: The new version, or ``None`` if a snapshot read after
+            ``as_of`` was already published.
+        """
+        version = await self.connection.eval(
+            _PUBLISH_SCRIPT, 1, self.key, repr(as_of), self.encode(entities)
+        )
+        return int(version) or None
+
+    async def version(self) -> Optional[int]:
+        """
+        The version of the stored snapshot, or ``None`` if there is none.
+        """
+        version = await self.connection.hget(self.key, "version")
+        return int(version) if version is not None else None
+
+    async def load(self, known_version: Optional[int] = None) -> Optional[Snapshot]:
+        """
+        Download and decode the snapshot.
+
+        Args:
+            known_version (int, optional): The version the caller already has; the
+                download is skipped when it is still current.
+
+        Returns:
+            Optional[Snapshot]: The snapshot, or ``None`` if there is no snapshot or
+            ``known_version`` is current.
+        """
+        if known_version is not None:
+            if await self.version() in (None, known_version):
+                return None
+        version, data = await self.connection.hmget(self.key, ["version", "data"])
+        if version is None or data is None:
+            return None
+        return Snapshot(version=int(version), entities=self.decode(data))
+
+    def encode(self, entities: Iterable[Any]) -> bytes:
+        payload = orjson.dumps(
+            [self.codec.encode(entity) for entity in entities],
+            default=orjson_default,
+        )
+        return bytes([_FORMAT]) + zlib.compress(payload, self.compression_level)
+
+    def decode(self, data: bytes) -> List[Any]:
+        """
+        Raises:
+            ValueError: If the blob was written in an unknown format.
+        """
+        if not data or data[0] != _FORMAT:
+            raise ValueError("Unsupported snapshot format")
+        return [
+            self.codec.decode(value)
+            for value in orjson.loads(zlib.decompress(data[1:]))
+        ]
@@ -0,0 +1,262 @@
+from collections import OrderedDict
+from typing import Any, FrozenSet, Mapping, Optional, Tuple
+
+# Number of percentage buckets: rollouts have a resolution of 0.01%.
+BUCKETS = 10_000
+
+_FNV_OFFSET = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+_RULE_KEYS = frozenset({"attributes", "segment"})
+
+# A rule is a conjunction of (attribute, allowed values) conditions.
+Rule = Tuple[Tuple[str, FrozenSet[Any]], ...]
+
+
+def _fnv1a(data: bytes, state: int = _FNV_OFFSET) -> int:
+    for byte in data:
+        state = ((state ^ byte) * _FNV_PRIME) & _MASK
+    return state
+
+
+def _fmix64(state: int) -> int:
+    # Finalizer of MurmurHash3, which spreads FNV's weak low bits over the word.
+    state ^= state >> 33
+    state = (state * 0xFF51AFD7ED558CCD) & _MASK
+    state ^= state >> 33
+    state = (state * 0xC4CEB9FE1A85EC53) & _MASK
+    state ^= state >> 33
+    return state
+
+
+def bucket(salt: str, key: Any) -> int:
+    """
+    The stable rollout bucket, from 0 to ``BUCKETS - 1``, of a key.
+
+    The bucket is ``fmix64(fnv1a_64(f"{salt}:{key}")) % BUCKETS`` over the UTF-8
+    bytes, so it is identical across processes, machines and restarts.
+    """
+    return _fmix64(_fnv1a(f"{salt}:{key}".encode())) % BUCKETS
+
+
+class TargetingEvaluator:
+    """
+    Decides whether a feature flag is on for a given context.
+
+    Built by ``compile_targeting`` from the ``targeting`` entry of the flag's
+    metadata. Evaluation only does set lookups and, for percentage rollouts,
+    hashes the context's key, so it never touches the network.
+    """
+
+    __slots__ = ("enabled", "rules", "bucket_by", "threshold", "default", "_seed")
+
+    def __init__(
+        self,
+        enabled: bool,
+        rules: Tuple[Rule, ...] = (),
+        bucket_by: str = "user_id",
+        salt: str = "",
+        threshold: Optional[int] = None,
+        default: bool = True,
+    ):
+        self.enabled = enabled
+        self.rules = rules
+        self.bucket_by = bucket_by
+        self.threshold = threshold
+        self.default = default
+        # The FNV state after the salt, so evaluations only hash the key.
+        self._seed = _fnv1a(f"{salt}:".encode())
+
+    def __call__(self, context: Mapping[str, Any]) -> bool:
+        """
+        Evaluate the flag for a context.
+
+        Args:
+            context (Mapping[str, Any]): Attributes of the subject, e.g. ``{"user_id": "42"}``.
+
+        Returns:
+            bool: ``False`` if the flag is disabled; otherwise whether any rule matches or
+            the context's key falls within the rollout percentage.
+        """
+        if not self.enabled:
+            return False
+        for rule in self.rules:
+            try:
+                for attribute, values in rule:
+                    if context.get(attribute) not in values:
+                        break
+                else:
+                    return True
+            except TypeError:
+                # Unhashable context values never match.
+                continue
+        if self.threshold is not None:
+            key = context.get(self.bucket_by)
+            if key is None:
+                return False
+            state = _fmix64(_fnv1a(str(key).encode(), self._seed))
+            return state % BUCKETS < self.threshold
+        return self.default
+
+
+def compile_targeting(feature_flag) -> TargetingEvaluator:
+    """
+    Compile the targeting rules of a feature flag.
+
+    The rules are read from ``feature_flag.metadata["targeting"]``::
+
+        {
+            "segments": {"beta-testers": ["u-1", "u-2"]},
+            "rules": [
+                {"segment": "beta-testers"},
+                {"attributes": {"country": ["DE", "AT"], "plan": ["pro"]}},
+            ],
+            "percentage": 12.5,
+            "bucket_by": "user_id",
+        }
+
+    A rule matches when every listed attribute has one of its values and, with
+    ``segment``, the context's ``bucket_by`` attribute is in the segment. A
+    context matching no rule is enabled when its ``bucket_by`` attribute hashes
+    into the first ``percentage`` percent of buckets. The bucket is salted with
+    ``salt``, the flag code by default, so rollouts of different flags are
+    independent. Without rules or a percentage an enabled flag is on for every
+    context.
+
+    Args:
+        feature_flag (FeatureFlag): The feature flag.
+
+    Returns:
+        TargetingEvaluator: The evaluator.
+
+    Raises:
+        ValueError: If the targeting rules are malformed.
+    """
+    enabled = feature_flag.enabled
+    targeting = (feature_flag.metadata or {}).get("targeting")
+    if targeting is None:
+        return TargetingEvaluator(enabled)
+    if not isinstance(targeting, dict):
+        raise ValueError("Targeting must be an object")
+
+    bucket_by = targeting.get("bucket_by", "user_id")
+    salt = targeting.get("salt", feature_flag.code)
+    if not isinstance(bucket_by, str) or not isinstance(salt, str):
+        raise ValueError("Targeting bucket_by and salt must be strings")
+
+    segments = targeting.get("segments", {})
+    if not isinstance(segments, dict):
+        raise ValueError("Targeting segments must be an object")
+    compiled_segments = {
+        name: _value_set(members, f"segment {name}")
+        for name, members in segments.items()
+    }
+
+    rules = targeting.get("rules", [])
+    if not isinstance(rules, list):
+        raise ValueError("Targeting rules must be a list")
+    compiled_rules = tuple(
+        _compile_rule(rule, bucket_by, compiled_segments) for rule in rules
+    )
+
+    percentage = targeting.get("percentage")
+    threshold = None
+    if percentage is not None:
+        if (
+            isinstance(percentage, bool)
+            or not isinstance(percentage, (int, float))
+            or not 0 <= percentage <= 100
+        ):
+            raise ValueError("Targeting percentage must be a number from 0 to 100")
+        threshold = round(percentage * BUCKETS / 100)
+
+    return TargetingEvaluator(
+        enabled,
+        rules=compiled_rules,
+        bucket_by=bucket_by,
+        salt=salt,
+        threshold=threshold,
+        default=not compiled_rules and threshold is None,
+    )
+
+
+def _compile_rule(
+    rule: Any, bucket_by: str, segments: Mapping[str, FrozenSet[Any]]
+) -> Rule:
+    if not isinstance(rule, dict) or not rule:
+        raise ValueError("Targeting rules must be non-empty objects")
+    unknown = rule.keys() - _RULE_KEYS
+    if unknown:
+        raise ValueError(f"Unknown targeting rule keys: {', '.join(sorted(unknown))}")
+
+    attributes = rule.get("attributes", {})
+    if not isinstance(attributes, dict):
+        raise ValueError("Targeting rule attributes must be an object")
+    conditions = [
+        (attribute, _value_set(values, f"attribute {attribute}"))
+        for attribute, values in attributes.items()
+    ]
+    if "segment" in rule:
+        segment = segments.get(rule["segment"])
+        if segment is None:
+            raise ValueError(f"Unknown targeting segment: {rule['segment']}")
+        conditions.append((bucket_by, segment))
+    if not conditions:
+        raise ValueError("Targeting rules need at least one condition")
+    # Test the smallest sets first; they are the most likely to reject.
+    conditions.sort(key=lambda condition: len(condition[1]))
+    return tuple(conditions)
+
+
+def _value_set(values: Any, name: str) -> FrozenSet[Any]:
+    if not isinstance(values, list):
+        raise ValueError(f"Targeting {name} must be a list of values")
+    try:
+        return frozenset(values)
+    except TypeError:
+        raise ValueError(f"Targeting {name} must only contain scalar values") from None
+
+
+class EvaluatorCache:
+    """
+    Bounded LRU cache of compiled evaluators keyed by flag code and version.
+
+    The version is ``COALESCE(updated_at, created_at)``, which changes on every
+    write, so an evaluator is compiled once per version of a flag. Flags without
+    timestamps are compiled on every call.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._evaluators: "OrderedDict[Tuple[str, Any], TargetingEvaluator]" = (
+            OrderedDict()
+        )
+
+    def get(self, feature_flag) -> TargetingEvaluator:
+        """
+        The evaluator of a feature flag, compiled on first use.
+
+        Raises:
+            ValueError: If the targeting rules are malformed.
+        """
+        version = feature_flag.updated_at or feature_flag.created_at
+        if version is None:
+            return compile_targeting(feature_flag)
+        key = (feature_flag.code, version)
+        evaluator = self._evaluators.get(key)
+        if evaluator is not None:
+            self._evaluators.move_to_end(key)
+            return evaluator
+        evaluator = compile_targeting(feature_flag)
+        self._evaluators[key] = evaluator
+        if len(self._evaluators) > self.maxsize:
+            self._evaluators.popitem(last=False)
+        return evaluator
+
+    def __len__(self) -> int:
+        return len(self._evaluators)
+
+
+# Shared by the services and snapshot clients of the process.
+evaluator_cache = EvaluatorCache()
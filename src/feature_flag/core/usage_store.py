@@ -0,0 +1,109 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from redis.asyncio import Redis as AsyncRedis
+from redis.asyncio import RedisCluster as AsyncRedisCluster
+
+# Evaluation counts keyed by (code, result, hour), where hour is the number of
+# hours since the Unix epoch.
+UsageCounts = Dict[Tuple[str, bool, int], int]
+
+SECONDS_PER_HOUR = 3600
+
+
+class UsageCount(NamedTuple):
+    hour: datetime
+    result: bool
+    count: int
+
+
+def hour_start(hour: int) -> datetime:
+    return datetime.fromtimestamp(hour * SECONDS_PER_HOUR, tz=timezone.utc)
+
+
+def hour_of(moment: datetime) -> int:
+    return int(moment.timestamp()) // SECONDS_PER_HOUR
+
+
+class UsageStore(ABC):
+    """
+    Durable storage of hourly flag evaluation counts.
+    """
+
+    @abstractmethod
+    async def add(self, counts: UsageCounts) -> None:
+        """
+        Add the counts to the stored totals in a single round trip.
+        """
+
+    @abstractmethod
+    async def query(
+        self, code: str, since: Optional[datetime] = None
+    ) -> List[UsageCount]:
+        """
+        The hourly counts of a flag, oldest first.
+
+        Args:
+            code (str): The code of the feature flag.
+            since (datetime, optional): Only return the hours starting at or after
+                the hour of ``since``.
+        """
+
+
+class RedisUsageStore(UsageStore):
+    """
+    Stores usage in one Redis hash per flag, with a ``<hour>:<result>`` field per
+    hour and result, incremented with a pipelined ``HINCRBY`` batch.
+    """
+
+    def __init__(
+        self,
+        connection: Union[AsyncRedis, AsyncRedisCluster],
+        namespace: str = "",
+        retention: Optional[float] = None,
+    ):
+        """
+        Initializes the RedisUsageStore.
+
+        Args:
+            connection (redis.asyncio.Redis | redis.asyncio.RedisCluster): The Redis connection.
+            namespace (str, optional): Namespace of the usage keys.
+            retention (float, optional): Time-to-live in seconds of a flag's usage hash,
+                renewed by every flush that touches it. ``None`` keeps it forever.
+        """
+        self.connection = connection
+        self.namespace = namespace
+        self.retention = retention
+
+    def _key(self, code: str) -> str:
+        return f"{self.namespace}:usage:{code}" if self.namespace else f"usage:{code}"
+
+    async def add(self, counts: UsageCounts) -> None:
+        if not counts:
+            return
+        pipeline = self.connection.pipeline(transaction=False)
+        for (code, result, hour), count in counts.items():
+            pipeline.hincrby(self._key(code), f"{hour}:{int(result)}", count)
+        if self.retention is not None:
+            for code in {code for code, _, _ in counts}:
+                pipeline.expire(self._key(code), int(self.retention))
+        await pipeline.execute()
+
+    async def query(
+        self, code: str, since: Optional[datetime] = None
+    ) -> List[UsageCount]:
+        fields = await self.connection.hgetall(self._key(code))
+        first_hour = hour_of(since) if since is not None else None
+        counts = []
+        for field, count in fields.items():
+            if isinstance(field, bytes):
+                field = field.decode()
+            hour, result = field.split(":")
+            hour = int(hour)
+            if first_hour is None or hour >= first_hour:
+                counts.append((hour, result == "1", int(count)))
+        return [
+            UsageCount(hour=hour_start(hour), result=result, count=count)
+            for hour, result, count in sorted(counts)
+        ]
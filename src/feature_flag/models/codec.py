@@ -0,0 +1,95 @@
+import zlib
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Dict, Generic, Tuple, Type, Union, get_args, get_type_hints
+
+from feature_flag.core.base_repository import T
+from feature_flag.models.feature_flag import FeatureFlag
+
+
+class DataclassCodec(Generic[T]):
+    """
+    Encodes dataclass entities to compact JSON-ready values and decodes them back
+    with their exact types.
+
+    Entities are encoded as a list of field values in declaration order, which is
+    smaller than a dict and is decoded by passing the values positionally to the
+    constructor. Datetimes, which JSON only carries as ISO 8601 strings, are
+    restored on decode.
+
+    ``as_dict`` encodes an entity as a dict keyed by field name instead, for
+    values that must outlive a change of the field layout. ``decode`` matches
+    such a dict by name: fields the layout does not know are ignored and missing
+    ones take their defaults.
+
+    The list starts with ``version``, a fingerprint of the field names in order,
+    so a value encoded with another field layout is rejected instead of being
+    decoded into the wrong fields. Stores shared by processes running different
+    releases should also key their entries by ``version``.
+    """
+
+    def __init__(self, entity_class: Type[T]):
+        self.entity_class = entity_class
+        self.fields: Tuple[str, ...] = tuple(entity_class.__dataclass_fields__)
+        self.version = f"{zlib.crc32(','.join(self.fields).encode()):08x}"
+        hints = get_type_hints(entity_class)
+        self._datetime_indexes = tuple(
+            index
+            for index, field in enumerate(self.fields)
+            if hints[field] is datetime or datetime in get_args(hints[field])
+        )
+        get_values = attrgetter(*self.fields)
+        version = self.version
+        if len(self.fields) == 1:
+            self._get_values = lambda entity: (version, get_values(entity))
+        else:
+            self._get_values = lambda entity: (version, *get_values(entity))
+
+    def encode(self, entity: T) -> Tuple[Any, ...]:
+        """
+        Encode an entity as a tuple of ``version`` and its field values, ready
+        for ``orjson``.
+        """
+        return self._get_values(entity)
+
+    def as_dict(self, entity: T) -> Dict[str, Any]:
+        """
+        Encode an entity as a dict of its field values keyed by field name.
+        """
+        return dict(zip(self.fields, self._get_values(entity)[1:]))
+
+    def decode(self, value: Union[list, dict]) -> T:
+        """
+        Decode a value produced by ``encode`` (after a JSON round trip) or a dict
+        keyed by field name.
+
+        Raises:
+            ValueError: If a list was encoded with another field layout or does not
+                hold one value per field.
+            TypeError: If a dict lacks a field without default.
+        """
+        if isinstance(value, dict):
+            value = {field: value[field] for field in self.fields if field in value}
+            for index in self._datetime_indexes:
+                field = self.fields[index]
+                if isinstance(value.get(field), str):
+                    value[field] = datetime.fromisoformat(value[field])
+            return self.entity_class(**value)
+        if not value or value[0] != self.version:
+            raise ValueError(
+                f"Unsupported {self.entity_class.__name__} encoding"
+                f" {value[0] if value else None!r}, expected {self.version!r}"
+            )
+        if len(value) != len(self.fields) + 1:
+            raise ValueError(
+                f"Expected {len(self.fields)} values for"
+                f" {self.entity_class.__name__}, got {len(value) - 1}"
+            )
+        value = list(value[1:])
+        for index in self._datetime_indexes:
+            if isinstance(value[index], str):
+                value[index] = datetime.fromisoformat(value[index])
+        return self.entity_class(*value)
+
+
+feature_flag_codec: DataclassCodec[FeatureFlag] = DataclassCodec(FeatureFlag)
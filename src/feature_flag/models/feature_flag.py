@@ -5,7 +5,7 @@ from typing import Optional, Dict, Any
 from feature_flag.core.decorators import table_name
 
 
-@dataclass
+@dataclass(slots=True)
 @table_name("feature_flags")
 class FeatureFlag:
     name: str
@@ -13,7 +13,7 @@ class FeatureFlag:
     id: Optional[str] = field(default=None, metadata={"exclude_from_db": True})
     description: Optional[str] = None
     enabled: bool = False
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = field(default=None, metadata={"jsonb": True})
 
     created_at: Optional[datetime] = field(
         default=None, metadata={"exclude_from_db": True}
@@ -0,0 +1,18 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from feature_flag.core.decorators import table_name
+
+
+@dataclass(slots=True)
+@table_name("feature_flag_outbox")
+class OutboxEvent:
+    code: str
+    change_status: str
+    payload: Dict[str, Any] = field(metadata={"jsonb": True})
+    id: Optional[int] = field(default=None, metadata={"exclude_from_db": True})
+    attempts: int = 0
+    created_at: Optional[datetime] = field(
+        default=None, metadata={"exclude_from_db": True}
+    )
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+import httpx
+
+from feature_flag.core.exceptions import NotifierError
+from feature_flag.core.metrics import Metrics, get_default_metrics, timed
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.notification.change_status import ChangeStatus
+from feature_flag.notification.notifier import AsyncNotifier, NotificationEvent
+from feature_flag.notification.slack_notifier import SlackNotifier
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSlackNotifier(AsyncNotifier):
+    """
+    Sends Slack notifications over a shared, connection-pooled ``httpx.AsyncClient``.
+
+    Requests time out after ``timeout`` seconds. Rate-limited (429), server error
+    (5xx) and transport failures are retried with exponential backoff; a 429
+    waits for the ``Retry-After`` delay sent by Slack instead.
+    """
+
+    def __init__(
+        self,
+        slack_webhook_url: str,
+        excluded_statuses: list[ChangeStatus] = None,
+        headers: dict = None,
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: float = 5.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        metrics: Optional[Metrics] = None,
+    ):
+        """
+        Initializes the AsyncSlackNotifier.
+
+        Args:
+            slack_webhook_url (str): The webhook URL to send Slack notifications.
+            excluded_statuses (list[ChangeStatus], optional): Statuses for which notifications should not be sent.
+            headers (dict, optional): Optional headers to include in the HTTP request.
+            client (httpx.AsyncClient, optional): The HTTP client to share. A client owned by the notifier
+                is created when omitted and closed by ``aclose``.
+            timeout (float, optional): Timeout in seconds of every request.
+            max_retries (int, optional): How many times a failed request is retried.
+            backoff (float, optional): Initial delay in seconds between retries.
+            max_backoff (float, optional): Upper bound in seconds of any delay between retries,
+                including ``Retry-After``.
+            metrics (Metrics, optional): Receives the latency and errors of every send.
+        """
+        self.slack_webhook_url = slack_webhook_url
+        self.excluded_statuses = excluded_statuses
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.metrics = metrics if metrics is not None else get_default_metrics()
+        self._owns_client = client is None
+        self.client = client if client is not None else httpx.AsyncClient()
+
+    @timed("slack", "send")
+    async def send(self, feature_flag: FeatureFlag, change_status: ChangeStatus):
+        """
+        Sends a Slack notification with details about the given feature flag.
+
+        Args:
+            feature_flag (FeatureFlag): The feature flag instance containing name, code, and status information.
+            change_status (ChangeStatus): The status of the change for the feature flag.
+
+        Raises:
+            NotifierError: If the notification could not be sent after all retries.
+        """
+        if self.excluded_statuses and change_status in self.excluded_statuses:
+            logger.debug(
+                "ChangeStatus %s is in the excluded statuses list; notification will not be sent.",
+                change_status,
+            )
+            return
+
+        message = SlackNotifier._build_message(feature_flag, change_status)
+        try:
+            await self._perform_send(payload={"text": message})
+        except Exception as e:
+            raise NotifierError(f"Error sending Slack notification: {e}") from e
+
+    @timed("slack", "send_batch")
+    async def send_batch(self, events: List[NotificationEvent]):
+        """
+        Sends a single Slack digest message listing several feature flag changes.
+
+        Args:
+            events (List[NotificationEvent]): The feature flags and the status of their change.
+
+        Raises:
+            NotifierError: If the notification could not be sent after all retries.
+        """
+        message = SlackNotifier._build_digest(events, self.excluded_statuses)
+        if message is None:
+            return
+        try:
+            await self._perform_send(payload={"text": message})
+        except Exception as e:
+            raise NotifierError(f"Error sending Slack notification: {e}") from e
+
+    async def aclose(self) -> None:
+        """
+        Close the HTTP client if it is owned by the notifier.
+        """
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def _perform_send(self, payload: dict) -> None:
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = await self.client.post(
+                    self.slack_webhook_url,
+                    json=payload,
+                    headers=self.headers,
+                    timeout=self.timeout,
+                )
+                logger.debug(
+                    "Slack API response: status=%s, body=%s",
+                    response.status_code,
+                    response.text,
+                )
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    return
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+                retry_after = self._retry_after(response)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.debug("Slack request failed: %s", e)
+
+            wait = min(
+                retry_after if retry_after is not None else delay, self.max_backoff
+            )
+            logger.debug("Retrying Slack request in %.1fs", wait)
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, self.max_backoff)
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
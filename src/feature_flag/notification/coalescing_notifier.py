@@ -0,0 +1,196 @@
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Union
+
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.notification.change_status import ChangeStatus
+from feature_flag.notification.notifier import (
+    AsyncNotifier,
+    NotificationEvent,
+    Notifier,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CoalescingStats:
+    received: int = 0
+    coalesced: int = 0
+    sent: int = 0
+    digests: int = 0
+    failed: int = 0
+
+
+class _PendingChange:
+    __slots__ = ("feature_flag", "initially_enabled", "updated", "deleted")
+
+    def __init__(self, feature_flag: FeatureFlag, change_status: ChangeStatus):
+        self.feature_flag = feature_flag
+        # The state before the first change of the window, as implied by it.
+        if change_status is ChangeStatus.ENABLED:
+            self.initially_enabled = False
+        elif change_status is ChangeStatus.DISABLED:
+            self.initially_enabled = True
+        else:
+            self.initially_enabled = feature_flag.enabled
+        self.updated = change_status is ChangeStatus.UPDATED
+        self.deleted = change_status is ChangeStatus.DELETED
+
+    def add(self, feature_flag: FeatureFlag, change_status: ChangeStatus) -> None:
+        self.feature_flag = feature_flag
+        self.updated = self.updated or change_status is ChangeStatus.UPDATED
+        self.deleted = change_status is ChangeStatus.DELETED
+
+    def net_status(self) -> Optional[ChangeStatus]:
+        if self.deleted:
+            return ChangeStatus.DELETED
+        if self.updated:
+            return ChangeStatus.UPDATED
+        if self.feature_flag.enabled == self.initially_enabled:
+            return None
+        return (
+            ChangeStatus.ENABLED if self.feature_flag.enabled else ChangeStatus.DISABLED
+        )
+
+
+class CoalescingNotifier(Notifier):
+    """
+    Collects changes over a time window and sends them as one digest.
+
+    The first change of a window starts a timer; when it fires, every change to
+    the same flag is collapsed into its net effect and the result is passed to
+    the wrapped notifier's ``send_batch`` in a single call:
+
+    - a flag deleted at the end of the window is reported as ``DELETED``;
+    - otherwise a flag updated at any point is reported as ``UPDATED`` with its
+      latest state;
+    - otherwise toggles are reported as ``ENABLED`` or ``DISABLED``, and dropped
+      when the flag ends the window in the state it started in.
+
+    ``send`` never blocks; share one instance per process and call ``stop`` on
+    shutdown to send the pending digest. ``send_batch`` bypasses the window: the
+    changes it is given are collapsed the same way and sent before it returns,
+    so callers that must know a delivery happened, such as ``OutboxRelay``, can
+    use a coalescing notifier too.
+    """
+
+    def __init__(self, notifier: Union[Notifier, AsyncNotifier], window: float = 5.0):
+        """
+        Initializes the CoalescingNotifier.
+
+        Args:
+            notifier (Notifier | AsyncNotifier): The notifier the digests are sent to.
+            window (float, optional): How long in seconds changes are collected before
+                a digest is sent.
+        """
+        self.notifier = notifier
+        self.window = window
+        self.stats = CoalescingStats()
+        self._pending: Dict[str, _PendingChange] = {}
+        self._pending_count = 0
+        self._task: Optional[asyncio.Task] = None
+        self._sending = False
+
+    def send(self, feature_flag: FeatureFlag, change_status: ChangeStatus):
+        """
+        Add a change to the current window.
+
+        A copy of the feature flag is kept, so the caller may keep mutating it.
+        """
+        self.stats.received += 1
+        self._pending_count += 1
+        self._add(self._pending, feature_flag, change_status)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_later())
+
+    async def send_batch(self, events: List[NotificationEvent]):
+        """
+        Send the net effect of several changes as one digest, without waiting
+        for the window.
+
+        Args:
+            events (List[NotificationEvent]): The feature flags and the status of their change.
+
+        Raises:
+            Exception: Whatever the wrapped notifier raised.
+        """
+        self.stats.received += len(events)
+        pending: Dict[str, _PendingChange] = {}
+        for feature_flag, change_status in events:
+            self._add(pending, feature_flag, change_status)
+        try:
+            await self._send_digest(pending, len(events))
+        except Exception:
+            self.stats.failed += 1
+            raise
+
+    async def flush(self) -> None:
+        """
+        Send the digest of the current window now.
+        """
+        pending, self._pending = self._pending, {}
+        pending_count, self._pending_count = self._pending_count, 0
+        try:
+            await self._send_digest(pending, pending_count)
+        except Exception as e:
+            self.stats.failed += 1
+            logger.warning("Failed to send digest of %d changes: %s", len(pending), e)
+
+    async def stop(self) -> None:
+        """
+        Send the pending digest and stop the timer.
+        """
+        if self._task is not None:
+            if not self._sending:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    @staticmethod
+    def _add(
+        pending: Dict[str, _PendingChange],
+        feature_flag: FeatureFlag,
+        change_status: ChangeStatus,
+    ) -> None:
+        feature_flag = replace(feature_flag)
+        change = pending.get(feature_flag.code)
+        if change is None:
+            pending[feature_flag.code] = _PendingChange(feature_flag, change_status)
+        else:
+            change.add(feature_flag, change_status)
+
+    async def _send_digest(
+        self, pending: Dict[str, _PendingChange], pending_count: int
+    ) -> None:
+        events: List[NotificationEvent] = []
+        for change in pending.values():
+            change_status = change.net_status()
+            if change_status is not None:
+                events.append((change.feature_flag, change_status))
+        self.stats.coalesced += pending_count - len(events)
+        if not events:
+            return
+
+        if inspect.iscoroutinefunction(self.notifier.send_batch):
+            await self.notifier.send_batch(events)
+        else:
+            await asyncio.to_thread(self.notifier.send_batch, events)
+        self.stats.sent += len(events)
+        self.stats.digests += 1
+
+    async def _flush_later(self) -> None:
+        # Changes received while a digest is being sent start the next window.
+        while self._pending:
+            await asyncio.sleep(self.window)
+            self._sending = True
+            try:
+                await self.flush()
+            finally:
+                self._sending = False
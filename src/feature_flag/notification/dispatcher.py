@@ -0,0 +1,147 @@
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple, Union
+
+from feature_flag.core.metrics import Metrics, get_default_metrics
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.notification.change_status import ChangeStatus
+from feature_flag.notification.notifier import AsyncNotifier, Notifier
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DispatcherStats:
+    sent: int = 0
+    failed: int = 0
+    dropped: int = 0
+
+
+class NotificationDispatcher(Notifier):
+    """
+    Sends notifications from a background worker so writes never wait for them.
+
+    ``send`` only puts the event on a bounded in-process queue and returns
+    immediately; a worker task delivers the events in order to the wrapped
+    notifier. Synchronous notifiers run in a thread so they cannot block the
+    event loop. When the queue is full new events are dropped and counted, so a
+    slow or unavailable notifier cannot exhaust memory.
+
+    Use the dispatcher as the service's notifier and share one instance per
+    process::
+
+        dispatcher = NotificationDispatcher(AsyncSlackNotifier(webhook_url))
+        await dispatcher.start()
+        service = FeatureFlagService(repository, notifier=dispatcher)
+        ...
+        await dispatcher.stop()
+    """
+
+    def __init__(
+        self,
+        notifier: Union[Notifier, AsyncNotifier],
+        max_queue_size: int = 1000,
+        drain_timeout: float = 10.0,
+        metrics: Optional[Metrics] = None,
+    ):
+        """
+        Initializes the NotificationDispatcher.
+
+        Args:
+            notifier (Notifier | AsyncNotifier): The notifier the events are delivered to.
+            max_queue_size (int, optional): How many events may wait for delivery.
+            drain_timeout (float, optional): How long ``stop`` waits in seconds for queued
+                events to be delivered.
+            metrics (Metrics, optional): Receives the queue depth and the sent, failed and
+                dropped counts.
+        """
+        self.notifier = notifier
+        self.drain_timeout = drain_timeout
+        self.stats = DispatcherStats()
+        self.metrics = metrics if metrics is not None else get_default_metrics()
+        self._queue_depth = self.metrics.gauge("feature_flag_notification_queue_depth")
+        self._sent = self.metrics.counter(
+            "feature_flag_notifications_total", result="sent"
+        )
+        self._failed = self.metrics.counter(
+            "feature_flag_notifications_total", result="failed"
+        )
+        self._dropped = self.metrics.counter(
+            "feature_flag_notifications_total", result="dropped"
+        )
+        self._queue: asyncio.Queue[Tuple[FeatureFlag, ChangeStatus]] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    def send(self, feature_flag: FeatureFlag, change_status: ChangeStatus):
+        """
+        Queue a notification for delivery.
+
+        A copy of the feature flag is queued, so the caller may keep mutating it.
+        """
+        try:
+            self._queue.put_nowait((replace(feature_flag), change_status))
+            self._queue_depth.set(self._queue.qsize())
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            self._dropped.inc()
+            logger.warning(
+                "Notification queue is full; dropping %s notification for %s",
+                change_status.value,
+                feature_flag.code,
+            )
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Deliver the queued events, waiting at most ``drain_timeout`` seconds, and
+        stop the worker.
+        """
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Stopping with %d undelivered notifications", self._queue.qsize()
+            )
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            feature_flag, change_status = await self._queue.get()
+            self._queue_depth.set(self._queue.qsize())
+            try:
+                await self._deliver(feature_flag, change_status)
+                self.stats.sent += 1
+                self._sent.inc()
+            except Exception as e:
+                self.stats.failed += 1
+                self._failed.inc()
+                logger.warning(
+                    "Failed to send %s notification for %s: %s",
+                    change_status.value,
+                    feature_flag.code,
+                    e,
+                )
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(
+        self, feature_flag: FeatureFlag, change_status: ChangeStatus
+    ) -> None:
+        if inspect.iscoroutinefunction(self.notifier.send):
+            await self.notifier.send(feature_flag, change_status)
+        else:
+            await asyncio.to_thread(self.notifier.send, feature_flag, change_status)
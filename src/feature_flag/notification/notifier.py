@@ -1,10 +1,35 @@
 from abc import ABC, abstractmethod
+from typing import List, Tuple
 
 from feature_flag.models.feature_flag import FeatureFlag
 from feature_flag.notification.change_status import ChangeStatus
 
+NotificationEvent = Tuple[FeatureFlag, ChangeStatus]
+
 
 class Notifier(ABC):
     @abstractmethod
     def send(self, feature_flag: FeatureFlag, change_status: ChangeStatus):
         pass
+
+    def send_batch(self, events: List[NotificationEvent]):
+        """
+        Send several changes at once. Notifiers that can combine them into a
+        single message override this; by default every change is sent on its own.
+        """
+        for feature_flag, change_status in events:
+            self.send(feature_flag, change_status)
+
+
+class AsyncNotifier(ABC):
+    @abstractmethod
+    async def send(self, feature_flag: FeatureFlag, change_status: ChangeStatus):
+        pass
+
+    async def send_batch(self, events: List[NotificationEvent]):
+        """
+        Send several changes at once. Notifiers that can combine them into a
+        single message override this; by default every change is sent on its own.
+        """
+        for feature_flag, change_status in events:
+            await self.send(feature_flag, change_status)
@@ -1,11 +1,13 @@
 import logging
+from typing import List, Optional
 
 import requests
 
 from feature_flag.core.exceptions import NotifierError
+from feature_flag.core.metrics import Metrics, get_default_metrics, timed
 from feature_flag.models.feature_flag import FeatureFlag
 from feature_flag.notification.change_status import ChangeStatus
-from feature_flag.notification.notifier import Notifier
+from feature_flag.notification.notifier import NotificationEvent, Notifier
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,7 @@ class SlackNotifier(Notifier):
         slack_webhook_url: str,
         excluded_statuses: list[ChangeStatus] = None,
         headers: dict = None,
+        metrics: Optional[Metrics] = None,
     ):
         """
         Initializes the SlackNotifier.
@@ -24,11 +27,14 @@ class SlackNotifier(Notifier):
             slack_webhook_url (str): The webhook URL to send Slack notifications.
             excluded_statuses (list[ChangeStatus], optional): Statuses for which notifications should not be sent.
             headers (dict, optional): Optional headers to include in the HTTP request.
+            metrics (Metrics, optional): Receives the latency and errors of every send.
         """
         self.slack_webhook_url = slack_webhook_url
         self.excluded_statuses = excluded_statuses
         self.headers = headers or {}
+        self.metrics = metrics if metrics is not None else get_default_metrics()
 
+    @timed("slack", "send")
     def send(self, feature_flag: FeatureFlag, change_status: ChangeStatus):
         """
         Sends a Slack notification with details about the given feature flag.
@@ -61,6 +67,25 @@ class SlackNotifier(Notifier):
         except Exception as e:
             raise NotifierError(f"Error sending Slack notification: {e}") from e
 
+    @timed("slack", "send_batch")
+    def send_batch(self, events: List[NotificationEvent]):
+        """
+        Sends a single Slack digest message listing several feature flag changes.
+
+        Args:
+            events (List[NotificationEvent]): The feature flags and the status of their change.
+
+        Raises:
+            NotifierError: If there is an error sending the notification.
+        """
+        message = self._build_digest(events, self.excluded_statuses)
+        if message is None:
+            return
+        try:
+            self._perform_send(payload={"text": message})
+        except Exception as e:
+            raise NotifierError(f"Error sending Slack notification: {e}") from e
+
     def _perform_send(self, payload: dict):
         response = requests.post(
             self.slack_webhook_url, json=payload, headers=self.headers
@@ -75,3 +100,18 @@ class SlackNotifier(Notifier):
         return (
             f"Feature Flag[Code=`{feature_flag.code}`] has been {change_status.value}"
         )
+
+    @staticmethod
+    def _build_digest(
+        events: List[NotificationEvent], excluded_statuses: list[ChangeStatus] = None
+    ) -> Optional[str]:
+        lines = [
+            SlackNotifier._build_message(feature_flag, change_status)
+            for feature_flag, change_status in events
+            if not (excluded_statuses and change_status in excluded_statuses)
+        ]
+        if not lines:
+            return None
+        if len(lines) == 1:
+            return lines[0]
+        return "\n".join([f"{len(lines)} feature flag changes:", *lines])
@@ -0,0 +1,211 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Generic, Iterable, Optional, Tuple, Type
+
+import orjson
+from sqlalchemy import TextClause, TypeDecorator, bindparam, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from feature_flag.core.base_repository import BaseRepository, T
+from feature_flag.core.cache import orjson_default
+
+# Keyset orderings supported by list_page: the ORDER BY clause, the condition
+# selecting the rows after the cursor and the columns stored in the cursor.
+KEYSET_ORDERINGS = {
+    "created_at": (
+        "created_at, id",
+        "(created_at, id) > (:created_at, CAST(:id AS uuid))",
+        ("created_at", "id"),
+    ),
+    "code": ("code", "code > :code", ("code",)),
+}
+
+
+class JSONBValue(TypeDecorator):
+    """
+    Binds a value as a ``jsonb`` parameter, serialized with ``orjson``.
+
+    Textual statements bind parameters untyped, and asyncpg only accepts JSON
+    text for ``jsonb`` columns, so fields holding dicts or lists are marked with
+    ``metadata={"jsonb": True}`` and bound with this type.
+    """
+
+    impl = JSONB
+    cache_ok = True
+
+    def bind_processor(self, dialect) -> Callable[[Any], Optional[str]]:
+        def process(value: Any) -> Optional[str]:
+            if value is None:
+                return None
+            return orjson.dumps(value, default=orjson_default).decode()
+
+        return process
+
+
+class EntityStatements(Generic[T]):
+    """
+    Column layout and precompiled SQL statements of an entity class.
+
+    Built once per class by ``entity_statements`` so the repository's hot paths
+    neither walk ``__dataclass_fields__`` nor build SQL strings on every call.
+    """
+
+    def __init__(self, entity_class: Type[T]):
+        dataclass_fields = entity_class.__dataclass_fields__
+        self.entity_class = entity_class
+        self.table_name = BaseRepository._get_table_name(entity_class)
+        self.fields: Tuple[str, ...] = tuple(dataclass_fields)
+        self.db_fields: Tuple[str, ...] = tuple(
+            field
+            for field in self.fields
+            if not dataclass_fields[field].metadata.get("exclude_from_db")
+        )
+        self.update_fields: Tuple[str, ...] = tuple(
+            field for field in self.db_fields if field != "id"
+        )
+        self.jsonb_fields = frozenset(
+            field
+            for field in self.db_fields
+            if dataclass_fields[field].metadata.get("jsonb")
+        )
+        self.from_row = self._build_row_constructor(entity_class)
+
+        table_name = self.table_name
+        columns = ", ".join(self.fields)
+        self.columns = columns
+        insert = (
+            f"INSERT INTO {table_name} ({', '.join(self.db_fields)})"
+            f" VALUES ({', '.join(f':{field}' for field in self.db_fields)})"
+        )
+        self.insert = self._text(f"{insert} RETURNING id;", self.jsonb_fields)
+        self.insert_returning = self._text(
+            f"{insert} RETURNING {columns};", self.jsonb_fields
+        )
+        self.delete = text(f"DELETE FROM {table_name} WHERE id = :id;")
+        self.get_by_id = text(f"SELECT {columns} FROM {table_name} WHERE id = :id;")
+        self.get_by_code = text(
+            f"SELECT {columns} FROM {table_name} WHERE code = :code;"
+        )
+        self.get_by_codes = text(
+            f"SELECT {columns} FROM {table_name} WHERE code = ANY(:codes);"
+        )
+        self.list_all = text(f"SELECT {columns} FROM {table_name};")
+        self.list = text(
+            f"SELECT {columns} FROM {table_name}"
+            f" ORDER BY created_at, id LIMIT :limit OFFSET :skip;"
+        )
+        self.stream = text(
+            f"SELECT {columns} FROM {table_name} ORDER BY created_at, id;"
+        )
+        self.list_page: Dict[Tuple[str, bool], TextClause] = {}
+        for order_by, (order_clause, after_clause, _) in KEYSET_ORDERINGS.items():
+            for after_cursor in (False, True):
+                where_clause = f" WHERE {after_clause}" if after_cursor else ""
+                self.list_page[(order_by, after_cursor)] = text(
+                    f"SELECT {columns} FROM {table_name}{where_clause}"
+                    f" ORDER BY {order_clause} LIMIT :limit;"
+                )
+        self._updates: Dict[Tuple[Tuple[str, ...], str], TextClause] = {}
+        self._upserts: Dict[Tuple[str, int], TextClause] = {}
+
+    def update(self, fields: Iterable[str]) -> TextClause:
+        """
+        An ``UPDATE ... WHERE id = :id RETURNING`` statement setting only the
+        given fields, in declaration order.
+
+        Raises:
+            ValueError: If no field is given or a field is not a writable column.
+        """
+        return self._update(self._update_key(fields), "id = :id")
+
+    def update_by_code(self, fields: Iterable[str], versioned: bool) -> TextClause:
+        """
+        An ``UPDATE ... WHERE code = :match_code RETURNING`` statement setting only
+        the given fields. A ``versioned`` statement also requires the row version,
+        ``COALESCE(updated_at, created_at)``, to equal ``:expected_version``.
+
+        Raises:
+            ValueError: If no field is given or a field is not a writable column.
+        """
+        condition = "code = :match_code"
+        if versioned:
+            condition += " AND COALESCE(updated_at, created_at) = :expected_version"
+        return self._update(self._update_key(fields), condition)
+
+    def _update_key(self, fields: Iterable[str]) -> Tuple[str, ...]:
+        fields = frozenset(fields)
+        if not fields:
+            raise ValueError("No fields to update")
+        unknown = fields.difference(self.update_fields)
+        if unknown:
+            raise ValueError(f"Cannot update fields: {', '.join(sorted(unknown))}")
+        return tuple(field for field in self.update_fields if field in fields)
+
+    def _update(self, fields: Tuple[str, ...], condition: str) -> TextClause:
+        key = (fields, condition)
+        statement = self._updates.get(key)
+        if statement is None:
+            set_clause = ", ".join(f"{field} = :{field}" for field in fields)
+            statement = self._text(
+                f"UPDATE {self.table_name} SET {set_clause}"
+                f" WHERE {condition} RETURNING {self.columns};",
+                self.jsonb_fields.intersection(fields),
+            )
+            self._updates[key] = statement
+        return statement
+
+    def upsert(self, conflict_column: str, rows: int, cache: bool) -> TextClause:
+        """
+        A multi-row ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` statement
+        for ``rows`` rows, with parameters named ``<field>_<row index>``.
+
+        Only statements built with ``cache=True`` are kept, so that callers can
+        reuse the full-batch statement without memoizing every remainder size.
+        """
+        key = (conflict_column, rows)
+        statement = self._upserts.get(key)
+        if statement is not None:
+            return statement
+
+        rows_clause = ", ".join(
+            f"({', '.join(f':{field}_{index}' for field in self.db_fields)})"
+            for index in range(rows)
+        )
+        update_clause = ", ".join(
+            f"{field} = EXCLUDED.{field}"
+            for field in self.db_fields
+            if field != conflict_column
+        )
+        statement = self._text(
+            f"INSERT INTO {self.table_name} ({', '.join(self.db_fields)})"
+            f" VALUES {rows_clause}"
+            f" ON CONFLICT ({conflict_column}) DO UPDATE SET {update_clause}"
+            f" RETURNING {self.columns};",
+            (
+                f"{field}_{index}"
+                for field in self.jsonb_fields
+                for index in range(rows)
+            ),
+        )
+        if cache:
+            self._upserts[key] = statement
+        return statement
+
+    @staticmethod
+    def _text(sql: str, jsonb_params: Iterable[str]) -> TextClause:
+        statement = text(sql)
+        jsonb_params = [bindparam(name, type_=JSONBValue()) for name in jsonb_params]
+        return statement.bindparams(*jsonb_params) if jsonb_params else statement
+
+    def _build_row_constructor(self, entity_class: Type[T]) -> Callable[..., T]:
+        dataclass_fields = entity_class.__dataclass_fields__
+        if all(dataclass_fields[field].init for field in self.fields):
+            # Rows select the fields in declaration order, which is also the order
+            # of the generated __init__, so they can be passed positionally.
+            return lambda row: entity_class(*row)
+        fields = self.fields
+        return lambda row: entity_class(**dict(zip(fields, row)))
+
+
+@lru_cache(maxsize=None)
+def entity_statements(entity_class: Type[T]) -> EntityStatements[T]:
+    return EntityStatements(entity_class)
@@ -0,0 +1,53 @@
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from feature_flag.models.outbox_event import OutboxEvent
+from feature_flag.repositories.entity_statements import entity_statements
+
+_statements = entity_statements(OutboxEvent)
+
+_FETCH_BATCH = text(
+    f"SELECT {_statements.columns} FROM {_statements.table_name}"
+    f" ORDER BY id LIMIT :limit FOR UPDATE SKIP LOCKED;"
+)
+_DELETE = text(f"DELETE FROM {_statements.table_name} WHERE id = ANY(:ids);")
+_RECORD_FAILURE = text(
+    f"UPDATE {_statements.table_name} SET attempts = attempts + 1"
+    f" WHERE id = ANY(:ids);"
+)
+
+
+class OutboxRepository:
+    """
+    Stores change notifications in the ``feature_flag_outbox`` table.
+
+    Events added with the session used for a flag change are committed or rolled
+    back together with it. ``OutboxRelay`` reads them back in batches and
+    deletes them once they were delivered.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, event: OutboxEvent) -> None:
+        params = {field: getattr(event, field) for field in _statements.db_fields}
+
+        await self.session.execute(_statements.insert, params)
+
+    async def fetch_batch(self, limit: int) -> List[OutboxEvent]:
+        """
+        Lock and return the oldest events not locked by another relay.
+
+        The rows stay locked until the session's transaction ends, so concurrent
+        relays never deliver the same event at the same time.
+        """
+        result = await self.session.execute(_FETCH_BATCH, {"limit": limit})
+        return [_statements.from_row(row) for row in result.fetchall()]
+
+    async def delete(self, ids: List[int]) -> None:
+        await self.session.execute(_DELETE, {"ids": list(ids)})
+
+    async def record_failure(self, ids: List[int]) -> None:
+        await self.session.execute(_RECORD_FAILURE, {"ids": list(ids)})
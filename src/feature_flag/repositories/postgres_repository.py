@@ -1,92 +1,300 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Type
+
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-from typing import List, Type
 
 from feature_flag.core.base_repository import BaseRepository, T
+from feature_flag.core.metrics import Metrics, get_default_metrics, timed
+from feature_flag.models.page import Page
+from feature_flag.repositories.entity_statements import (
+    KEYSET_ORDERINGS,
+    entity_statements,
+)
+
+
+# Postgres and asyncpg accept at most this many parameters per statement.
+MAX_PARAMETERS = 32767
+
+
+def _encode_cursor(order_by: str, values: list) -> str:
+    payload = orjson.dumps({"o": order_by, "k": values}, default=str)
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, order_by: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded))
+        columns = KEYSET_ORDERINGS[order_by][2]
+        if payload["o"] != order_by or len(payload["k"]) != len(columns):
+            raise ValueError
+        values = dict(zip(columns, payload["k"]))
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise ValueError(f"Invalid cursor for ordering by {order_by}: {cursor}")
+    if "created_at" in values:
+        values["created_at"] = datetime.fromisoformat(values["created_at"])
+    return values
 
 
 class PostgresRepository(BaseRepository[T]):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, metrics: Optional[Metrics] = None):
         self.session = session
+        self.metrics = metrics if metrics is not None else get_default_metrics()
 
+    @timed("postgres", "insert")
     async def insert(self, entity: T) -> str:
-        table_name = self._get_table_name(type(entity))
-        fields = [
-            field
-            for field in entity.__dataclass_fields__.keys()
-            if not entity.__dataclass_fields__[field].metadata.get("exclude_from_db")
-        ]
-        values = [getattr(entity, field) for field in fields]
-
-        query = (
-            f"INSERT INTO {table_name} ({', '.join(fields)})"
-            f" VALUES ({', '.join([f':{field}' for field in fields])}) RETURNING id;"
-        )
+        statements = entity_statements(type(entity))
+        params = {field: getattr(entity, field) for field in statements.db_fields}
 
-        result = await self.session.execute(text(query), dict(zip(fields, values)))
+        result = await self.session.execute(statements.insert, params)
         return result.scalar()
 
-    async def update(self, entity: T) -> None:
-        table_name = self._get_table_name(type(entity))
-        fields = [
-            field
-            for field in entity.__dataclass_fields__.keys()
-            if field != "id"
-            and not entity.__dataclass_fields__[field].metadata.get("exclude_from_db")
-        ]
-        values = [getattr(entity, field) for field in fields]
-
-        set_clause = ", ".join([f"{field} = :{field}" for field in fields])
-        query = f"UPDATE {table_name} SET {set_clause} WHERE id = :id;"
-
-        await self.session.execute(
-            text(query), {**dict(zip(fields, values)), "id": entity.id}
+    @timed("postgres", "insert_returning")
+    async def insert_returning(self, entity: T) -> T:
+        """
+        Insert an entity and read back the stored row, including the values
+        filled in by the database, in a single round trip.
+        """
+        statements = entity_statements(type(entity))
+        params = {field: getattr(entity, field) for field in statements.db_fields}
+
+        result = await self.session.execute(statements.insert_returning, params)
+        return statements.from_row(result.fetchone())
+
+    @timed("postgres", "update")
+    async def update(
+        self, entity: T, fields: Optional[Iterable[str]] = None
+    ) -> Optional[T]:
+        """
+        Update an entity and read back the stored row in a single round trip.
+
+        Args:
+            entity (T): The entity to write, identified by its ``id``.
+            fields (Iterable[str], optional): The fields to write. Defaults to every
+                writable field; passing only the changed fields keeps the row
+                update, and the WAL and trigger work it causes, small.
+
+        Returns:
+            Optional[T]: The stored entity, or ``None`` if no row has the entity's id.
+
+        Raises:
+            ValueError: If ``fields`` is empty or names a field that is not writable.
+        """
+        statements = entity_statements(type(entity))
+        fields = statements.update_fields if fields is None else tuple(fields)
+        statement = statements.update(fields)
+        params = {field: getattr(entity, field) for field in fields}
+        params["id"] = entity.id
+
+        result = await self.session.execute(statement, params)
+        row = result.fetchone()
+        if row:
+            return statements.from_row(row)
+        return None
+
+    @timed("postgres", "update_by_code")
+    async def update_by_code(
+        self,
+        code: str,
+        values: Dict[str, Any],
+        entity_class: Type[T],
+        expected_version: Optional[datetime] = None,
+    ) -> Optional[T]:
+        """
+        Atomically update the row with the given code and read it back, in a single
+        ``UPDATE ... RETURNING`` statement.
+
+        With ``expected_version`` the update is a compare-and-set: it only applies
+        while the row version, ``updated_at`` or ``created_at`` for rows that were
+        never updated, still equals the version the caller read.
+
+        Args:
+            code (str): The code of the row to update.
+            values (Dict[str, Any]): The new values keyed by field.
+            entity_class (Type[T]): The entity class.
+            expected_version (datetime, optional): The row version the update is
+                based on. ``None`` updates the row unconditionally.
+
+        Returns:
+            Optional[T]: The stored entity, or ``None`` if no row has the code or the
+            row version differs from ``expected_version``.
+
+        Raises:
+            ValueError: If ``values`` is empty or names a field that is not writable.
+        """
+        statements = entity_statements(entity_class)
+        statement = statements.update_by_code(
+            values, versioned=expected_version is not None
+        )
+        params = dict(values)
+        params["match_code"] = code
+        if expected_version is not None:
+            params["expected_version"] = expected_version
+
+        result = await self.session.execute(statement, params)
+        row = result.fetchone()
+        if row:
+            return statements.from_row(row)
+        return None
+
+    @timed("postgres", "bulk_upsert")
+    async def bulk_upsert(
+        self, entities: List[T], conflict_column: str = "code", batch_size: int = 1000
+    ) -> List[T]:
+        """
+        Insert or update many entities with multi-row
+        ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` statements.
+
+        Entities sharing the same ``conflict_column`` value are collapsed, the
+        last one wins.
+
+        Args:
+            entities (List[T]): The entities to write; all of the same class.
+            conflict_column (str): The unique column identifying existing rows.
+            batch_size (int): The number of rows written per statement, lowered if
+                needed so that a statement binds at most ``MAX_PARAMETERS`` parameters.
+
+        Returns:
+            List[T]: The stored entities, in no particular order.
+        """
+        if not entities:
+            return []
+        statements = entity_statements(type(entities[0]))
+        fields = statements.db_fields
+        batch_size = max(1, min(batch_size, MAX_PARAMETERS // len(fields)))
+        unique_entities = list(
+            {getattr(entity, conflict_column): entity for entity in entities}.values()
         )
 
+        stored = []
+        for start in range(0, len(unique_entities), batch_size):
+            batch = unique_entities[start : start + batch_size]
+            statement = statements.upsert(
+                conflict_column, len(batch), cache=len(batch) == batch_size
+            )
+            params = {
+                f"{field}_{index}": getattr(entity, field)
+                for index, entity in enumerate(batch)
+                for field in fields
+            }
+
+            result = await self.session.execute(statement, params)
+            stored.extend(statements.from_row(row) for row in result.fetchall())
+        return stored
+
+    @timed("postgres", "delete")
     async def delete(self, entity_id: str, entity_class: Type[T]) -> None:
-        table_name = self._get_table_name(entity_class)
-        query = f"DELETE FROM {table_name} WHERE id = :id;"
+        statements = entity_statements(entity_class)
 
-        await self.session.execute(text(query), {"id": entity_id})
+        await self.session.execute(statements.delete, {"id": entity_id})
 
+    @timed("postgres", "get_by_id")
     async def get_by_id(self, entity_id: str, entity_class: Type[T]) -> T:
-        table_name = self._get_table_name(entity_class)
-        fields = [field for field in entity_class.__dataclass_fields__.keys()]
-        query = f"SELECT {', '.join(fields)} FROM {table_name} WHERE id = :id;"
+        statements = entity_statements(entity_class)
 
-        result = await self.session.execute(text(query), {"id": entity_id})
+        result = await self.session.execute(statements.get_by_id, {"id": entity_id})
         row = result.fetchone()
         if row:
-            return entity_class(**dict(zip(fields, row)))
+            return statements.from_row(row)
         return None
 
+    @timed("postgres", "get_by_code")
     async def get_by_code(self, code: str, entity_class: Type[T]) -> T:
-        table_name = self._get_table_name(entity_class)
-        fields = [field for field in entity_class.__dataclass_fields__.keys()]
-        query = f"SELECT {', '.join(fields)} FROM {table_name} WHERE code = :code;"
+        statements = entity_statements(entity_class)
 
-        result = await self.session.execute(text(query), {"code": code})
+        result = await self.session.execute(statements.get_by_code, {"code": code})
         row = result.fetchone()
         if row:
-            return entity_class(**dict(zip(fields, row)))
+            return statements.from_row(row)
         return None
 
+    @timed("postgres", "get_by_codes")
+    async def get_by_codes(self, codes: List[str], entity_class: Type[T]) -> List[T]:
+        statements = entity_statements(entity_class)
+
+        result = await self.session.execute(
+            statements.get_by_codes, {"codes": list(codes)}
+        )
+        return [statements.from_row(row) for row in result.fetchall()]
+
+    @timed("postgres", "list_all")
     async def list_all(self, entity_class: Type[T]) -> List[T]:
-        table_name = self._get_table_name(entity_class)
-        fields = [field for field in entity_class.__dataclass_fields__.keys()]
-        query = f"SELECT {', '.join(fields)} FROM {table_name};"
+        statements = entity_statements(entity_class)
 
-        result = await self.session.execute(text(query))
-        rows = result.fetchall()
-        return [entity_class(**dict(zip(fields, row))) for row in rows]
+        result = await self.session.execute(statements.list_all)
+        return [statements.from_row(row) for row in result.fetchall()]
 
+    @timed("postgres", "list")
     async def list(self, skip: int, limit: int, entity_class: Type[T]) -> List[T]:
-        table_name = self._get_table_name(entity_class)
-        fields = [field for field in entity_class.__dataclass_fields__.keys()]
-        query = (
-            f"SELECT {', '.join(fields)} FROM {table_name} LIMIT {limit} OFFSET {skip};"
+        statements = entity_statements(entity_class)
+
+        result = await self.session.execute(
+            statements.list, {"limit": limit, "skip": skip}
         )
+        return [statements.from_row(row) for row in result.fetchall()]
+
+    @timed("postgres", "list_page")
+    async def list_page(
+        self,
+        limit: int,
+        entity_class: Type[T],
+        cursor: Optional[str] = None,
+        order_by: str = "created_at",
+    ) -> Page[T]:
+        """
+        List entities with keyset pagination.
+
+        Args:
+            limit (int): The maximum number of entities to return.
+            entity_class (Type[T]): The entity class.
+            cursor (str, optional): The ``next_cursor`` of the previous page.
+            order_by (str): ``created_at`` (ties broken by ``id``) or ``code``.
+
+        Returns:
+            Page[T]: The entities and the cursor of the next page, which is ``None``
+            on the last page.
+
+        Raises:
+            ValueError: If ``order_by`` is not supported or the cursor is invalid.
+        """
+        if order_by not in KEYSET_ORDERINGS:
+            raise ValueError(f"Unsupported ordering: {order_by}")
+        statements = entity_statements(entity_class)
+        params = {"limit": limit + 1}
+        if cursor:
+            params.update(_decode_cursor(cursor, order_by))
 
-        result = await self.session.execute(text(query))
+        result = await self.session.execute(
+            statements.list_page[(order_by, bool(cursor))], params
+        )
         rows = result.fetchall()
-        return [entity_class(**dict(zip(fields, row))) for row in rows]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = dict(zip(statements.fields, rows[-1]))
+            next_cursor = _encode_cursor(
+                order_by, [last[column] for column in KEYSET_ORDERINGS[order_by][2]]
+            )
+        return Page(
+            items=[statements.from_row(row) for row in rows], next_cursor=next_cursor
+        )
+
+    async def stream(
+        self, entity_class: Type[T], batch_size: int = 1000
+    ) -> AsyncIterator[T]:
+        """
+        Stream every entity using a server-side cursor, fetching ``batch_size``
+        rows at a time so memory use does not grow with the table.
+        """
+        statements = entity_statements(entity_class)
+
+        result = await self.session.stream(
+            statements.stream.execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions(batch_size):
+            for row in rows:
+                yield statements.from_row(row)
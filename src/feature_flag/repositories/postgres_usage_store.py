@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from feature_flag.core.usage_store import (
+    UsageCount,
+    UsageCounts,
+    UsageStore,
+    hour_of,
+    hour_start,
+)
+
+# One statement for any number of rows: the rows are bound as four arrays.
+_ADD = text(
+    "INSERT INTO feature_flag_usage (code, hour, result, count)"
+    " SELECT * FROM unnest(CAST(:codes AS VARCHAR[]), CAST(:hours AS TIMESTAMPTZ[]),"
+    " CAST(:results AS BOOLEAN[]), CAST(:counts AS BIGINT[]))"
+    " ON CONFLICT (code, hour, result)"
+    " DO UPDATE SET count = feature_flag_usage.count + EXCLUDED.count;"
+)
+_QUERY = text(
+    "SELECT hour, result, count FROM feature_flag_usage"
+    " WHERE code = :code AND hour >= :since ORDER BY hour, result;"
+)
+
+
+class PostgresUsageStore(UsageStore):
+    """
+    Stores usage in the ``feature_flag_usage`` table, one row per flag, hour and
+    result, incremented with a single multi-row upsert.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        """
+        Initializes the PostgresUsageStore.
+
+        Args:
+            session_factory (Callable[[], AsyncSession]): Factory of database sessions.
+                A new session is used for every flush and query.
+        """
+        self.session_factory = session_factory
+
+    async def add(self, counts: UsageCounts) -> None:
+        if not counts:
+            return
+        params = {"codes": [], "hours": [], "results": [], "counts": []}
+        for (code, result, hour), count in counts.items():
+            params["codes"].append(code)
+            params["hours"].append(hour_start(hour))
+            params["results"].append(result)
+            params["counts"].append(count)
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(_ADD, params)
+
+    async def query(
+        self, code: str, since: Optional[datetime] = None
+    ) -> List[UsageCount]:
+        since = hour_start(hour_of(since) if since is not None else 0)
+        async with self.session_factory() as session:
+            result = await session.execute(_QUERY, {"code": code, "since": since})
+            return [UsageCount(*row) for row in result.fetchall()]
@@ -1,28 +1,155 @@
+import asyncio
+import inspect
 import logging
-from typing import Optional, List, Dict, Any
+from dataclasses import replace
+from datetime import datetime
+from time import perf_counter
+from typing import Optional, List, Dict, Any, Union, Callable, Set, AsyncIterator
 from uuid import UUID
 
-from feature_flag.core import FeatureFlagNotFoundError, FeatureFlagError
-from feature_flag.core.cache import RedisCache
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from feature_flag.core import (
+    FeatureFlagNotFoundError,
+    FeatureFlagError,
+    FeatureFlagConflictError,
+)
+from feature_flag.core.cache import (
+    RedisCache,
+    AsyncRedisCache,
+    TOMBSTONE,
+    orjson_default,
+)
+from feature_flag.core.cache_policy import CachePolicy
+from feature_flag.core.diagnostics import DiagnosticsPolicy, record_phase, traced
+from feature_flag.core.invalidation import CacheInvalidationBus
+from feature_flag.core.local_cache import LocalCache
+from feature_flag.core.metrics import Metrics, get_default_metrics, timed
+from feature_flag.core.single_flight import SingleFlight
+from feature_flag.core.targeting import compile_targeting, evaluator_cache
+from feature_flag.core.usage_store import UsageCount
+from feature_flag.models.codec import feature_flag_codec
 from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.models.outbox_event import OutboxEvent
+from feature_flag.models.page import Page
 from feature_flag.notification.change_status import ChangeStatus
-from feature_flag.notification.notifier import Notifier
+from feature_flag.notification.notifier import AsyncNotifier, Notifier
+from feature_flag.repositories.outbox_repository import OutboxRepository
 from feature_flag.repositories.postgres_repository import PostgresRepository
+from feature_flag.services.snapshot_publisher import SnapshotPublisher
+from feature_flag.services.usage_recorder import UsageRecorder
 
 logger = logging.getLogger(__name__)
 
+# Outcomes of service operations that are not counted as errors.
+_EXPECTED_ERRORS = (FeatureFlagNotFoundError, FeatureFlagConflictError)
+
+# Fields managed by the database, which update_feature_flag ignores.
+_READ_ONLY_FIELDS = frozenset(
+    name
+    for name, field in FeatureFlag.__dataclass_fields__.items()
+    if field.metadata.get("exclude_from_db")
+)
+
+
+def _cache_key(code: str) -> str:
+    """
+    The shared cache key of a feature flag.
+
+    Keys include the codec version, so processes encoding flags with different
+    field layouts, e.g. during a rolling deploy, never read each other's entries.
+    Writes only evict the key of their own layout, so the entries of the other
+    layout are bounded by the cache policy's ``ttl`` only.
+    """
+    return f"{feature_flag_codec.version}:{code}"
+
+
+def _operation(name: str):
+    """
+    Instrument a public service operation with metrics and diagnostics.
+    """
+
+    def decorator(method):
+        return traced(name)(
+            timed("service", name, expected=_EXPECTED_ERRORS, breakdown=False)(method)
+        )
+
+    return decorator
+
+
+# Strong references to background tasks, which the event loop only holds weakly.
+_background_tasks: Set[asyncio.Task] = set()
+
 
 class FeatureFlagService:
     def __init__(
         self,
         repository: PostgresRepository,
-        cache: Optional[RedisCache] = None,
-        notifier: Optional[Notifier] = None,
+        cache: Optional[Union[RedisCache, AsyncRedisCache]] = None,
+        notifier: Optional[Union[Notifier, AsyncNotifier]] = None,
+        local_cache: Optional[LocalCache] = None,
+        invalidation_bus: Optional[CacheInvalidationBus] = None,
+        negative_cache_ttl: Optional[float] = None,
+        single_flight: Optional[SingleFlight] = None,
+        cache_policy: Optional[CachePolicy] = None,
+        background_session_factory: Optional[Callable[[], AsyncSession]] = None,
+        snapshot_publisher: Optional[SnapshotPublisher] = None,
+        outbox: Optional[OutboxRepository] = None,
+        usage_recorder: Optional[UsageRecorder] = None,
+        metrics: Optional[Metrics] = None,
+        diagnostics: Optional[DiagnosticsPolicy] = None,
     ):
+        """
+        Initializes the FeatureFlagService.
+
+        Args:
+            repository (PostgresRepository): The repository storing the feature flags.
+            cache (RedisCache | AsyncRedisCache, optional): The shared cache.
+            notifier (Notifier | AsyncNotifier, optional): Notified about every change. Wrap it in a
+                ``NotificationDispatcher`` to send notifications in the background.
+            local_cache (LocalCache, optional): The in-process cache in front of the shared cache.
+            invalidation_bus (CacheInvalidationBus, optional): Propagates writes to other processes.
+            negative_cache_ttl (float, optional): Time-to-live in seconds of tombstones for unknown codes.
+                ``None`` disables negative caching.
+            single_flight (SingleFlight, optional): Coalesces concurrent database reads of the same code.
+            cache_policy (CachePolicy, optional): How entries are written to and served from the shared cache.
+            background_session_factory (Callable[[], AsyncSession], optional): Factory of database
+                sessions for background work. Required to revalidate stale entries in the background;
+                without it stale entries are refreshed inline.
+            snapshot_publisher (SnapshotPublisher, optional): Rebuilds the snapshot of every flag
+                after each write.
+            outbox (OutboxRepository, optional): Stores notifications for ``OutboxRelay`` instead of
+                sending them. It must use the repository's session, so that notifications are
+                committed together with the change.
+            usage_recorder (UsageRecorder, optional): Counts the results of ``evaluate`` and
+                ``evaluate_batch``, and the ``enabled`` state of flags read with
+                ``get_feature_flag_by_code`` and ``get_feature_flags_by_codes``.
+            metrics (Metrics, optional): Receives the latency and errors of every operation.
+                Defaults to ``get_default_metrics()``.
+            diagnostics (DiagnosticsPolicy, optional): Log sampling, slow-operation logging and
+                call hooks. By default every read is logged and nothing else is done.
+        """
         self.repository = repository
         self.cache = cache
         self.notifier = notifier
-
+        self.local_cache = local_cache
+        self.invalidation_bus = invalidation_bus
+        self.negative_cache_ttl = negative_cache_ttl
+        self.single_flight = (
+            single_flight if single_flight is not None else SingleFlight()
+        )
+        self.cache_policy = cache_policy if cache_policy is not None else CachePolicy()
+        self.background_session_factory = background_session_factory
+        self.snapshot_publisher = snapshot_publisher
+        self.outbox = outbox
+        self.usage_recorder = usage_recorder
+        self.metrics = metrics if metrics is not None else get_default_metrics()
+        self.diagnostics = (
+            diagnostics if diagnostics is not None else DiagnosticsPolicy()
+        )
+
+    @_operation("create_feature_flag")
     async def create_feature_flag(self, flag_data: Dict[str, Any]) -> FeatureFlag:
         """
         Create a new feature flag.
@@ -40,16 +167,15 @@ class FeatureFlagService:
         try:
             logger.info("Creating feature flag with data: %s", flag_data)
             feature_flag = FeatureFlag(**flag_data)
-            entity_id = await self.repository.insert(entity=feature_flag)
-            feature_flag = await self.repository.get_by_id(
-                entity_id=str(entity_id), entity_class=FeatureFlag
-            )
+            compile_targeting(feature_flag)
+            feature_flag = await self.repository.insert_returning(entity=feature_flag)
             feature_flag.id = (
                 str(feature_flag.id)
                 if isinstance(feature_flag.id, UUID)
                 else feature_flag.id
             )
-            self._update_cache(feature_flag)
+            await self._update_cache(feature_flag)
+            await self._publish_invalidation(feature_flag.code)
             logger.info(
                 "Feature flag created successfully with ID: %s", feature_flag.id
             )
@@ -57,10 +183,72 @@ class FeatureFlagService:
         except Exception as e:
             raise FeatureFlagError(f"Failed to create feature flag: {str(e)}") from e
 
+    @_operation("import_feature_flags")
+    async def import_feature_flags(
+        self, flags_data: List[Dict[str, Any]], batch_size: int = 1000
+    ) -> List[FeatureFlag]:
+        """
+        Create or update many feature flags at once, matching existing flags by code.
+
+        Flags are written with batched upserts and the cache is filled with one
+        pipelined write. No notification is sent for imported flags.
+
+        Args:
+            flags_data (List[Dict[str, Any]]): The data of the feature flags.
+            batch_size (int): The number of flags written per database statement.
+
+        Returns:
+            List[FeatureFlag]: The stored feature flags.
+
+        Raises:
+            FeatureFlagValidationError: If the input data is invalid.
+            FeatureFlagDatabaseError: If there's an error in database operation.
+        """
+        try:
+            logger.info("Importing %d feature flags", len(flags_data))
+            feature_flags = [FeatureFlag(**flag_data) for flag_data in flags_data]
+            for feature_flag in feature_flags:
+                compile_targeting(feature_flag)
+            feature_flags = await self.repository.bulk_upsert(
+                entities=feature_flags, batch_size=batch_size
+            )
+            for feature_flag in feature_flags:
+                feature_flag.id = (
+                    str(feature_flag.id)
+                    if isinstance(feature_flag.id, UUID)
+                    else feature_flag.id
+                )
+                if self.local_cache is not None:
+                    self.local_cache.delete(feature_flag.code)
+
+            if self.cache and feature_flags:
+                await self._resolve(
+                    self.cache.set_many(
+                        mapping={
+                            _cache_key(flag.code): feature_flag_codec.encode(flag)
+                            for flag in feature_flags
+                        },
+                        ttl=self.cache_policy.next_expiry(),
+                    )
+                )
+            if feature_flags:
+                if self.invalidation_bus is not None:
+                    await self.invalidation_bus.publish_resync()
+                if self.snapshot_publisher is not None:
+                    self.snapshot_publisher.request_rebuild()
+            logger.info("Imported %d feature flags", len(feature_flags))
+            return feature_flags
+        except Exception as e:
+            raise FeatureFlagError(f"Failed to import feature flags: {str(e)}") from e
+
+    @_operation("get_feature_flag_by_code")
     async def get_feature_flag_by_code(self, code: str) -> FeatureFlag:
         """
         Get a feature flag by its code.
 
+        With a usage recorder, the read is counted with the flag's ``enabled``
+        state as its result.
+
         Args:
             code (str): The code of the feature flag.
 
@@ -72,23 +260,259 @@ class FeatureFlagService:
             FeatureFlagCacheError: If there's an error in cache operation.
             FeatureFlagDatabaseError: If there's an error in database operation.
         """
+        flag = await self._get_feature_flag_by_code(code)
+        if self.usage_recorder is not None:
+            self.usage_recorder.record(code, flag.enabled)
+        return flag
+
+    async def _get_feature_flag_by_code(self, code: str) -> FeatureFlag:
+        """
+        Get a feature flag by its code without recording usage.
+        """
         try:
-            logger.info("Fetching feature flag by code: %s", code)
-            flag = await self._fetch_feature_flag_by_code(code=code)
-            if not flag:
+            log = logger.isEnabledFor(logging.INFO) and self.diagnostics.sample_log()
+            if log:
+                logger.info("Fetching feature flag by code: %s", code)
+            flag = self._get_from_local_cache(code=code)
+            if flag is TOMBSTONE:
                 raise FeatureFlagNotFoundError(
                     f"Feature flag with code {code} not found"
                 )
-
-            flag.id = str(flag.id) if isinstance(flag.id, UUID) else flag.id
-            self._update_cache(flag)
-            logger.info("Feature flag fetched successfully with code: %s", code)
+            if flag is None:
+                flag = await self._fetch_feature_flag_by_code(
+                    code=code, read_through=True
+                )
+                if not flag:
+                    raise FeatureFlagNotFoundError(
+                        f"Feature flag with code {code} not found"
+                    )
+
+                flag.id = str(flag.id) if isinstance(flag.id, UUID) else flag.id
+                if self.local_cache is not None:
+                    self.local_cache.set(code, replace(flag))
+            if log:
+                logger.info("Feature flag fetched successfully with code: %s", code)
             return flag
         except FeatureFlagNotFoundError:
             raise
         except Exception as e:
             raise FeatureFlagError(f"Failed to fetch feature flag: {str(e)}") from e
 
+    @_operation("evaluate")
+    async def evaluate(self, code: str, context: Dict[str, Any]) -> bool:
+        """
+        Evaluate the targeting rules of a feature flag for a context.
+
+        The rules in ``metadata["targeting"]`` are compiled once per version of the
+        flag (see ``compile_targeting``); with a local cache, repeated evaluations
+        do no I/O.
+
+        Args:
+            code (str): The code of the feature flag.
+            context (Dict[str, Any]): Attributes of the subject, e.g. ``{"user_id": "42"}``.
+
+        Returns:
+            bool: Whether the feature flag is on for the context.
+
+        Raises:
+            FeatureFlagNotFoundError: If the feature flag is not found.
+            FeatureFlagError: If the flag cannot be read or its targeting rules are malformed.
+        """
+        feature_flag = await self._get_feature_flag_by_code(code)
+        try:
+            evaluator = evaluator_cache.get(feature_flag)
+        except ValueError as e:
+            raise FeatureFlagError(
+                f"Invalid targeting rules of feature flag {code}: {str(e)}"
+            ) from e
+        result = evaluator(context)
+        if self.usage_recorder is not None:
+            self.usage_recorder.record(code, result)
+        return result
+
+    @_operation("evaluate_batch")
+    async def evaluate_batch(
+        self,
+        codes: List[str],
+        keys: Any,
+        chunk_size: int = 1_000_000,
+        processes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Evaluate feature flags for many keys at once, e.g. in offline jobs.
+
+        Each key is evaluated as the context ``{bucket_by: key}`` with vectorized
+        hashing that produces the same buckets as ``evaluate``. The work runs in a
+        thread, or in a process pool with ``processes``. Requires NumPy, installed
+        with the ``batch`` extra.
+
+        Args:
+            codes (List[str]): The codes of the feature flags.
+            keys (array-like): The keys to evaluate, e.g. a NumPy array of user IDs.
+            chunk_size (int): The number of keys evaluated at once.
+            processes (int, optional): Evaluate the chunks in a pool of this many processes.
+
+        Returns:
+            Dict[str, numpy.ndarray]: A boolean array per flag code, aligned with ``keys``.
+
+        Raises:
+            FeatureFlagNotFoundError: If a feature flag is not found.
+            FeatureFlagError: If NumPy is not installed, a flag cannot be read or its
+                targeting rules are malformed.
+        """
+        try:
+            from feature_flag.core.batch_targeting import evaluate_keys
+        except ImportError as e:
+            raise FeatureFlagError(
+                "Batch evaluation requires NumPy; install the 'batch' extra"
+            ) from e
+
+        feature_flags = await self._get_feature_flags_by_codes(codes)
+        missing = [code for code, flag in feature_flags.items() if flag is None]
+        if missing:
+            raise FeatureFlagNotFoundError(
+                f"Feature flags with codes {', '.join(missing)} not found"
+            )
+        try:
+            evaluators = {
+                code: evaluator_cache.get(flag) for code, flag in feature_flags.items()
+            }
+            results = await asyncio.to_thread(
+                evaluate_keys, evaluators, keys, chunk_size, processes
+            )
+        except Exception as e:
+            raise FeatureFlagError(f"Failed to evaluate feature flags: {str(e)}") from e
+        if self.usage_recorder is not None:
+            for code, result in results.items():
+                enabled = int(result.sum())
+                if enabled:
+                    self.usage_recorder.record(code, True, enabled)
+                if len(result) > enabled:
+                    self.usage_recorder.record(code, False, len(result) - enabled)
+        return results
+
+    async def get_feature_flag_usage(
+        self, code: str, since: Optional[datetime] = None
+    ) -> List[UsageCount]:
+        """
+        Get the hourly evaluation counts of a feature flag, oldest first.
+
+        Args:
+            code (str): The code of the feature flag.
+            since (datetime, optional): Only return the hours from the hour of ``since`` on.
+
+        Returns:
+            List[UsageCount]: The flushed counts per hour and result. A flag without
+            counts has not been evaluated since ``since``.
+
+        Raises:
+            FeatureFlagError: If no usage recorder is configured or the usage cannot be read.
+        """
+        if self.usage_recorder is None:
+            raise FeatureFlagError(
+                "Usage is not recorded: no usage recorder configured"
+            )
+        try:
+            return await self.usage_recorder.usage(code, since=since)
+        except Exception as e:
+            raise FeatureFlagError(
+                f"Failed to fetch feature flag usage: {str(e)}"
+            ) from e
+
+    @_operation("get_feature_flags_by_codes")
+    async def get_feature_flags_by_codes(
+        self, codes: List[str]
+    ) -> Dict[str, Optional[FeatureFlag]]:
+        """
+        Get several feature flags at once.
+
+        Cached flags are read with a single multi-key cache lookup, the misses are
+        loaded with a single database query and written back to the cache in one
+        pipeline. With a usage recorder, every flag found is counted like a read
+        by ``get_feature_flag_by_code``.
+
+        Args:
+            codes (List[str]): The codes of the feature flags.
+
+        Returns:
+            Dict[str, Optional[FeatureFlag]]: The feature flags keyed by code, in the
+            order of ``codes``. Codes that do not exist map to ``None``.
+
+        Raises:
+            FeatureFlagCacheError: If there's an error in cache operation.
+            FeatureFlagDatabaseError: If there's an error in database operation.
+        """
+        flags = await self._get_feature_flags_by_codes(codes)
+        if self.usage_recorder is not None:
+            for code, flag in flags.items():
+                if flag is not None:
+                    self.usage_recorder.record(code, flag.enabled)
+        return flags
+
+    async def _get_feature_flags_by_codes(
+        self, codes: List[str]
+    ) -> Dict[str, Optional[FeatureFlag]]:
+        """
+        Get several feature flags at once without recording usage.
+        """
+        try:
+            codes = list(dict.fromkeys(codes))
+            flags: Dict[str, Optional[FeatureFlag]] = {}
+
+            missing = []
+            for code in codes:
+                flag = self._get_from_local_cache(code=code)
+                if flag is None:
+                    missing.append(code)
+                elif flag is not TOMBSTONE:
+                    flags[code] = flag
+            local_misses = missing
+
+            if missing and self.cache:
+                cached_flags = await self._resolve(
+                    self.cache.get_many(keys=[_cache_key(code) for code in missing])
+                )
+                still_missing = []
+                for code, cached_flag in zip(missing, cached_flags):
+                    if cached_flag is TOMBSTONE:
+                        self._remember_missing_locally(code)
+                    elif cached_flag:
+                        flags[code] = self._decode_cached(cached_flag)
+                    else:
+                        still_missing.append(code)
+                missing = still_missing
+
+            if missing:
+                loaded_flags = await self.repository.get_by_codes(
+                    codes=missing, entity_class=FeatureFlag
+                )
+                for flag in loaded_flags:
+                    flag.id = str(flag.id) if isinstance(flag.id, UUID) else flag.id
+                    flags[flag.code] = flag
+                if self.cache and loaded_flags:
+                    await self._resolve(
+                        self.cache.set_many(
+                            mapping={
+                                _cache_key(flag.code): feature_flag_codec.encode(flag)
+                                for flag in loaded_flags
+                            },
+                            ttl=self.cache_policy.next_expiry(),
+                        )
+                    )
+                await self._remember_missing_many(
+                    [code for code in missing if code not in flags]
+                )
+
+            if self.local_cache is not None:
+                for code in local_misses:
+                    if flags.get(code) is not None:
+                        self.local_cache.set(code, replace(flags[code]))
+
+            return {code: flags.get(code) for code in codes}
+        except Exception as e:
+            raise FeatureFlagError(f"Failed to fetch feature flags: {str(e)}") from e
+
+    @_operation("list_feature_flags")
     async def list_feature_flags(
         self, limit: int = 100, skip: int = 0
     ) -> List[FeatureFlag]:
@@ -112,12 +536,74 @@ class FeatureFlagService:
         except Exception as e:
             raise FeatureFlagError(f"Failed to list feature flags: {str(e)}") from e
 
+    @_operation("list_feature_flags_page")
+    async def list_feature_flags_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: str = "created_at",
+    ) -> Page[FeatureFlag]:
+        """
+        List feature flags with keyset pagination.
+
+        Unlike ``list_feature_flags``, the cost of a page does not grow with its
+        position and pages stay stable while flags are added or removed.
+
+        Args:
+            limit (int): The maximum number of flags to return.
+            cursor (str, optional): The ``next_cursor`` of the previous page.
+            order_by (str): ``created_at`` or ``code``.
+
+        Returns:
+            Page[FeatureFlag]: The feature flags and the cursor of the next page.
+
+        Raises:
+            FeatureFlagDatabaseError: If there's an error in database operation.
+        """
+        try:
+            return await self.repository.list_page(
+                limit=limit, entity_class=FeatureFlag, cursor=cursor, order_by=order_by
+            )
+        except Exception as e:
+            raise FeatureFlagError(f"Failed to list feature flags: {str(e)}") from e
+
+    async def iter_feature_flags(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[FeatureFlag]:
+        """
+        Iterate over every feature flag in constant memory.
+
+        Rows are streamed with a server-side cursor in batches of ``batch_size``.
+
+        Args:
+            batch_size (int): The number of rows fetched per round trip.
+
+        Yields:
+            FeatureFlag: The feature flags, ordered by creation time.
+
+        Raises:
+            FeatureFlagDatabaseError: If there's an error in database operation.
+        """
+        try:
+            async for flag in self.repository.stream(
+                entity_class=FeatureFlag, batch_size=batch_size
+            ):
+                yield flag
+        except Exception as e:
+            raise FeatureFlagError(f"Failed to iterate feature flags: {str(e)}") from e
+
+    @_operation("update_feature_flag")
     async def update_feature_flag(
         self, code: str, flag_data: Dict[str, Any]
     ) -> FeatureFlag:
         """
         Update an existing feature flag.
 
+        Only the fields that differ from the stored flag are written. Fields
+        managed by the database (``id``, ``created_at``, ``updated_at``) are
+        ignored. When nothing changes, the stored flag is returned without a
+        write or a notification.
+
         Args:
             code (str): The code of the feature flag to update.
             flag_data (Dict[str, Any]): The updated data for the feature flag.
@@ -127,6 +613,7 @@ class FeatureFlagService:
 
         Raises:
             FeatureFlagNotFoundError: If the feature flag is not found.
+            FeatureFlagConflictError: If the feature flag was modified since it was read.
             FeatureFlagValidationError: If the input data is invalid.
             FeatureFlagDatabaseError: If there's an error in database operation.
         """
@@ -140,20 +627,48 @@ class FeatureFlagService:
                     f"Feature flag with code {code} not found"
                 )
 
-            for key, value in flag_data.items():
-                setattr(existing_flag, key, value)
+            changes = {
+                key: value
+                for key, value in flag_data.items()
+                if key not in _READ_ONLY_FIELDS and getattr(existing_flag, key) != value
+            }
+            if not changes:
+                return existing_flag
+            if "metadata" in changes:
+                compile_targeting(replace(existing_flag, **changes))
+
+            feature_flag = await self.repository.update_by_code(
+                code=code,
+                values=changes,
+                entity_class=FeatureFlag,
+                expected_version=existing_flag.updated_at or existing_flag.created_at,
+            )
+            if feature_flag is None:
+                # The flag we read is stale: drop every cached copy so the caller
+                # can retry against the current row.
+                await self._evict(code)
+                if await self.repository.get_by_code(
+                    code=code, entity_class=FeatureFlag
+                ):
+                    raise FeatureFlagConflictError(
+                        f"Feature flag with code {code} was modified concurrently"
+                    )
+                raise FeatureFlagNotFoundError(
+                    f"Feature flag with code {code} not found"
+                )
 
-            await self.repository.update(entity=existing_flag)
-            self._update_cache(existing_flag)
-            if self.notifier:
-                self.notifier.send(existing_flag, ChangeStatus.UPDATED)
+            await self._store_written(feature_flag)
+            if feature_flag.code != code:
+                await self._evict(code)
+            await self._notify(feature_flag, ChangeStatus.UPDATED)
             logger.info("Feature flag with code %s updated successfully", code)
-            return existing_flag
-        except FeatureFlagNotFoundError:
+            return feature_flag
+        except (FeatureFlagNotFoundError, FeatureFlagConflictError):
             raise
         except Exception as e:
             raise FeatureFlagError(f"Failed to update feature flag: {str(e)}") from e
 
+    @_operation("delete_feature_flag")
     async def delete_feature_flag(self, code: str) -> None:
         """
         Delete a feature flag.
@@ -176,16 +691,15 @@ class FeatureFlagService:
             await self.repository.delete(
                 entity_id=feature_flag.id, entity_class=FeatureFlag
             )
-            if self.cache:
-                self.cache.delete(key=code)
-            if self.notifier:
-                self.notifier.send(feature_flag, ChangeStatus.DELETED)
+            await self._evict(code)
+            await self._notify(feature_flag, ChangeStatus.DELETED)
             logger.info("Feature flag with code %s deleted successfully", code)
         except FeatureFlagNotFoundError:
             raise
         except Exception as e:
             raise FeatureFlagError(f"Failed to delete feature flag: {str(e)}") from e
 
+    @_operation("enable_feature_flag")
     async def enable_feature_flag(self, code: str) -> FeatureFlag:
         """
         Enable a feature flag.
@@ -203,8 +717,7 @@ class FeatureFlagService:
         try:
             logger.info("Enabling feature flag with code: %s", code)
             feature_flag = await self._set_feature_flag_state(code, True)
-            if self.notifier:
-                self.notifier.send(feature_flag, ChangeStatus.ENABLED)
+            await self._notify(feature_flag, ChangeStatus.ENABLED)
             logger.info("Feature flag with code %s enabled successfully", code)
             return feature_flag
         except FeatureFlagNotFoundError:
@@ -213,6 +726,7 @@ class FeatureFlagService:
         except Exception as e:
             raise FeatureFlagError(f"Failed to enable feature flag: {str(e)}") from e
 
+    @_operation("disable_feature_flag")
     async def disable_feature_flag(self, code: str) -> FeatureFlag:
         """
         Disable a feature flag.
@@ -230,8 +744,7 @@ class FeatureFlagService:
         try:
             logger.info("Disabling feature flag with code: %s", code)
             feature_flag = await self._set_feature_flag_state(code, False)
-            if self.notifier:
-                self.notifier.send(feature_flag, ChangeStatus.DISABLED)
+            await self._notify(feature_flag, ChangeStatus.DISABLED)
             logger.info("Feature flag with code %s disabled successfully", code)
             return feature_flag
         except FeatureFlagNotFoundError:
@@ -243,6 +756,10 @@ class FeatureFlagService:
         """
         Set the state of a feature flag.
 
+        The state is written with a single ``UPDATE ... RETURNING`` without reading
+        the flag first, so a toggle costs one round trip and never writes back
+        other fields from a stale copy.
+
         Args:
             code (str): The code of the feature flag.
             state (bool): The new state of the feature flag.
@@ -254,36 +771,242 @@ class FeatureFlagService:
             FeatureFlagNotFoundError: If the feature flag is not found.
             FeatureFlagDatabaseError: If there's an error in database operation.
         """
-        feature_flag = await self._fetch_feature_flag_by_code(code=code)
+        feature_flag = await self.repository.update_by_code(
+            code=code, values={"enabled": state}, entity_class=FeatureFlag
+        )
         if not feature_flag:
             raise FeatureFlagNotFoundError(f"Feature flag with code {code} not found")
 
-        feature_flag.enabled = state
-        await self.repository.update(entity=feature_flag)
-        self._update_cache(feature_flag)
+        await self._store_written(feature_flag)
         return feature_flag
 
-    async def _fetch_feature_flag_by_code(self, code: str):
+    async def _store_written(self, feature_flag: FeatureFlag) -> None:
+        """
+        Cache a feature flag returned by a write and tell other processes about it.
+        """
+        feature_flag.id = (
+            str(feature_flag.id)
+            if isinstance(feature_flag.id, UUID)
+            else feature_flag.id
+        )
+        await self._update_cache(feature_flag)
+        await self._publish_invalidation(feature_flag.code)
+
+    async def _evict(self, code: str) -> None:
+        """
+        Drop every cached copy of a feature flag, here and in other processes.
+        """
+        if self.local_cache is not None:
+            self.local_cache.delete(code)
+        if self.cache:
+            await self._resolve(self.cache.delete(key=_cache_key(code)))
+        await self._publish_invalidation(code)
+
+    @staticmethod
+    def _decode_cached(cached_flag: Any) -> FeatureFlag:
+        """
+        Decode a feature flag read from the shared cache.
+        """
+        if isinstance(cached_flag, (list, tuple)):
+            start = perf_counter()
+            flag = feature_flag_codec.decode(cached_flag)
+            record_phase("serialization", start)
+            return flag
+        return cached_flag
+
+    async def _fetch_feature_flag_by_code(self, code: str, read_through: bool = False):
+        """
+        Fetch a feature flag from the shared cache, falling back to the repository.
+
+        With ``read_through`` the lookup is treated as a read: misses are written
+        back to the cache, unknown codes are remembered and stale entries are
+        revalidated, all according to the cache policy.
+        """
+        if self.cache:
+            cached_flag, stale = await self._get_cached(code)
+            if cached_flag is TOMBSTONE:
+                if read_through:
+                    self._remember_missing_locally(code)
+                return None
+            if cached_flag and not (stale and self.background_session_factory is None):
+                flag = self._decode_cached(cached_flag)
+                if read_through:
+                    if stale:
+                        self._schedule_revalidation(code)
+                    elif not self.cache_policy.write_on_miss_only:
+                        await self._update_cache(flag)
+                return flag
+
+        flag = await self.single_flight.do(
+            code,
+            lambda: self.repository.get_by_code(code=code, entity_class=FeatureFlag),
+            share=lambda shared_flag: replace(shared_flag) if shared_flag else None,
+        )
+        if read_through:
+            if flag is None:
+                await self._remember_missing(code)
+            else:
+                flag.id = str(flag.id) if isinstance(flag.id, UUID) else flag.id
+                await self._update_cache(flag)
+        return flag
+
+    async def _get_cached(self, code: str):
+        """
+        Read a feature flag from the shared cache.
+
+        Returns:
+            The cached value and whether it is past its time-to-live.
+        """
+        if self.cache_policy.stale_while_revalidate:
+            cached_flag, remaining_ttl = await self._resolve(
+                self.cache.get_with_ttl(key=_cache_key(code))
+            )
+            return cached_flag, self.cache_policy.is_stale(remaining_ttl)
+        return await self._resolve(self.cache.get(key=_cache_key(code))), False
+
+    def _schedule_revalidation(self, code: str) -> None:
+        key = ("revalidate", code)
+        if self.single_flight.in_flight(key):
+            return
+        task = asyncio.create_task(
+            self.single_flight.do(key, lambda: self._revalidate(code))
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _revalidate(self, code: str) -> None:
+        """
+        Refresh a stale cache entry from the repository using a dedicated session.
+        """
+        try:
+            async with self.background_session_factory() as session:
+                repository = PostgresRepository(session)
+                flag = await repository.get_by_code(code=code, entity_class=FeatureFlag)
+            if flag is None:
+                await self._resolve(self.cache.delete(key=_cache_key(code)))
+                return
+            flag.id = str(flag.id) if isinstance(flag.id, UUID) else flag.id
+            await self._update_cache(flag)
+        except Exception as e:
+            logger.warning("Failed to revalidate feature flag %s: %s", code, e)
+
+    async def _remember_missing(self, code: str) -> None:
+        """
+        Cache a short-lived tombstone for a code that does not exist, so repeated
+        lookups of an unknown code do not reach the database.
+        """
+        if self.negative_cache_ttl is None:
+            return
+        self._remember_missing_locally(code)
+        if self.cache:
+            await self._resolve(
+                self.cache.set_tombstone(
+                    key=_cache_key(code), ttl=self.negative_cache_ttl
+                )
+            )
+
+    async def _remember_missing_many(self, codes: List[str]) -> None:
+        """
+        Cache tombstones for several unknown codes with one cache round trip.
+        """
+        if self.negative_cache_ttl is None or not codes:
+            return
+        for code in codes:
+            self._remember_missing_locally(code)
         if self.cache:
-            cached_flag = self.cache.get(key=code)
-            if cached_flag:
-                return (
-                    FeatureFlag(**cached_flag)
-                    if isinstance(cached_flag, dict)
-                    else cached_flag
+            await self._resolve(
+                self.cache.set_tombstones_many(
+                    keys=[_cache_key(code) for code in codes],
+                    ttl=self.negative_cache_ttl,
                 )
+            )
+
+    def _remember_missing_locally(self, code: str) -> None:
+        if self.negative_cache_ttl is not None and self.local_cache is not None:
+            self.local_cache.set_tombstone(code, ttl=self.negative_cache_ttl)
 
-        return await self.repository.get_by_code(code=code, entity_class=FeatureFlag)
+    def _get_from_local_cache(self, code: str) -> Optional[FeatureFlag]:
+        """
+        Get a copy of a feature flag from the in-process cache.
+
+        A copy is returned so callers can mutate it without corrupting the cache.
+        ``TOMBSTONE`` is returned when the code is known not to exist.
+        """
+        if self.local_cache is None:
+            return None
+        flag = self.local_cache.get(code)
+        if flag is None or flag is TOMBSTONE:
+            return flag
+        return replace(flag)
 
-    def _update_cache(self, feature_flag: FeatureFlag) -> None:
+    async def _update_cache(self, feature_flag: FeatureFlag) -> None:
         """
         Update the cache with the given feature flag.
 
+        The in-process cache entry is invalidated rather than updated, so the
+        next read picks up the value from the shared cache or the repository.
+
         Args:
             feature_flag (FeatureFlag): The feature flag to cache.
 
         Raises:
             FeatureFlagCacheError: If there's an error in cache operation.
         """
+        if self.local_cache is not None:
+            self.local_cache.delete(feature_flag.code)
         if self.cache:
-            self.cache.set(key=feature_flag.code, value=feature_flag.__dict__)
+            start = perf_counter()
+            value = feature_flag_codec.encode(feature_flag)
+            record_phase("serialization", start)
+            await self._resolve(
+                self.cache.set(
+                    key=_cache_key(feature_flag.code),
+                    value=value,
+                    ttl=self.cache_policy.next_expiry(),
+                )
+            )
+
+    async def _publish_invalidation(self, code: str) -> None:
+        """
+        Tell other processes to drop their cached copy of the given feature flag
+        and schedule a rebuild of the snapshot.
+        """
+        if self.invalidation_bus is not None:
+            await self.invalidation_bus.publish(code)
+        if self.snapshot_publisher is not None:
+            self.snapshot_publisher.request_rebuild()
+
+    async def _notify(
+        self, feature_flag: FeatureFlag, change_status: ChangeStatus
+    ) -> None:
+        """
+        Notify about a change, through the outbox when there is one.
+        """
+        if self.outbox is not None:
+            await self.outbox.add(
+                OutboxEvent(
+                    code=feature_flag.code,
+                    change_status=change_status.value,
+                    payload=orjson.loads(
+                        orjson.dumps(
+                            feature_flag_codec.as_dict(feature_flag),
+                            default=orjson_default,
+                        )
+                    ),
+                )
+            )
+        elif self.notifier:
+            await self._resolve(self.notifier.send(feature_flag, change_status))
+
+    @staticmethod
+    async def _resolve(result: Any) -> Any:
+        """
+        Await the result of a cache or notifier call when it is asynchronous.
+
+        ``RedisCache`` and ``Notifier`` return plain values while
+        ``AsyncRedisCache`` and ``AsyncNotifier`` return coroutines; this lets the
+        service work with either.
+        """
+        if inspect.isawaitable(result):
+            return await result
+        return result
@@ -0,0 +1,287 @@
+import asyncio
+import logging
+from dataclasses import replace
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, NamedTuple, Optional, Set
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from feature_flag.core import FeatureFlagError
+from feature_flag.core.invalidation import CacheInvalidationBus
+from feature_flag.core.snapshot_store import SnapshotStore
+from feature_flag.core.targeting import TargetingEvaluator, evaluator_cache
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.repositories.postgres_repository import PostgresRepository
+from feature_flag.services.usage_recorder import UsageRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class _Snapshot(NamedTuple):
+    flags: Mapping[str, FeatureFlag]
+    enabled: Mapping[str, bool]
+    evaluators: Mapping[str, TargetingEvaluator]
+
+
+_EMPTY_SNAPSHOT = _Snapshot(
+    MappingProxyType({}), MappingProxyType({}), MappingProxyType({})
+)
+
+
+class FeatureFlagSnapshotClient:
+    """
+    Holds every feature flag in memory and answers lookups without any I/O.
+
+    The full table is loaded once with ``PostgresRepository.list_all`` into an
+    immutable snapshot, which is replaced atomically on every refresh. Refreshes
+    can run periodically (``refresh_interval``) and/or be pushed by a change
+    source that reports committed changes, such as ``PostgresChangeFeed`` (see
+    ``attach``).
+
+    With a ``snapshot_store``, full refreshes download the snapshot published by
+    ``SnapshotPublisher`` instead of querying the database, and are skipped
+    when its version has not changed. The database is only used when no
+    snapshot has been published yet or the store is unavailable.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        refresh_interval: Optional[float] = None,
+        push_debounce: float = 0.05,
+        snapshot_store: Optional[SnapshotStore] = None,
+        usage_recorder: Optional[UsageRecorder] = None,
+    ):
+        """
+        Initializes the FeatureFlagSnapshotClient.
+
+        Args:
+            session_factory (Callable[[], AsyncSession]): Factory of database sessions, e.g. an
+                ``async_sessionmaker``. A new session is used for every refresh.
+            refresh_interval (float, optional): Interval in seconds between periodic full refreshes.
+                ``None`` disables periodic refreshes.
+            push_debounce (float, optional): Delay in seconds used to batch pushed changes.
+            snapshot_store (SnapshotStore, optional): Store of the published snapshot of every flag.
+            usage_recorder (UsageRecorder, optional): Counts the evaluations of known flags.
+        """
+        self.session_factory = session_factory
+        self.refresh_interval = refresh_interval
+        self.push_debounce = push_debounce
+        self.snapshot_store = snapshot_store
+        self.usage_recorder = usage_recorder
+        self._snapshot = _EMPTY_SNAPSHOT
+        self._snapshot_version: Optional[int] = None
+        self._pending_codes: Set[Optional[str]] = set()
+        self._periodic_task: Optional[asyncio.Task] = None
+        self._push_task: Optional[asyncio.Task] = None
+
+    @property
+    def flags(self) -> Mapping[str, FeatureFlag]:
+        return self._snapshot.flags
+
+    def is_enabled(self, code: str, default: bool = False) -> bool:
+        """
+        Check whether a feature flag is enabled.
+
+        Args:
+            code (str): The code of the feature flag.
+            default (bool): The value returned when the flag does not exist.
+
+        Returns:
+            bool: Whether the flag is enabled, or ``default`` if it is unknown.
+        """
+        enabled = self._snapshot.enabled.get(code)
+        if enabled is None:
+            return default
+        if self.usage_recorder is not None:
+            self.usage_recorder.record(code, enabled)
+        return enabled
+
+    def evaluate(
+        self, code: str, context: Mapping[str, Any], default: bool = False
+    ) -> bool:
+        """
+        Evaluate the targeting rules of a feature flag for a context.
+
+        The rules are compiled when the snapshot is swapped in, so evaluation does
+        no I/O. A flag whose rules are malformed evaluates to ``False``.
+
+        Args:
+            code (str): The code of the feature flag.
+            context (Mapping[str, Any]): Attributes of the subject, e.g. ``{"user_id": "42"}``.
+            default (bool): The value returned when the flag does not exist.
+
+        Returns:
+            bool: Whether the flag is on for the context, or ``default`` if it is unknown.
+        """
+        evaluator = self._snapshot.evaluators.get(code)
+        if evaluator is None:
+            return default
+        result = evaluator(context)
+        if self.usage_recorder is not None:
+            self.usage_recorder.record(code, result)
+        return result
+
+    def get(self, code: str) -> Optional[FeatureFlag]:
+        """
+        Get a copy of a feature flag from the snapshot, or ``None`` if it is unknown.
+        """
+        flag = self._snapshot.flags.get(code)
+        return replace(flag) if flag is not None else None
+
+    async def refresh(self) -> None:
+        """
+        Reload every feature flag and swap the snapshot.
+
+        Raises:
+            FeatureFlagError: If the flags cannot be loaded; the previous snapshot is kept.
+        """
+        if self.snapshot_store is not None and await self._refresh_from_store():
+            return
+
+        try:
+            async with self.session_factory() as session:
+                repository = PostgresRepository(session)
+                flags = await repository.list_all(entity_class=FeatureFlag)
+        except Exception as e:
+            raise FeatureFlagError(f"Failed to refresh feature flags: {str(e)}") from e
+
+        self._swap({flag.code: flag for flag in flags})
+        self._snapshot_version = None
+        logger.debug("Feature flag snapshot refreshed with %d flags", len(flags))
+
+    async def start(self) -> None:
+        """
+        Load the initial snapshot and start periodic refreshes if configured.
+        """
+        await self.refresh()
+        if self.refresh_interval and self._periodic_task is None:
+            self._periodic_task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        for task in (self._periodic_task, self._push_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._periodic_task = None
+        self._push_task = None
+
+    def attach(self, source) -> None:
+        """
+        Refresh the snapshot whenever the given change source reports a change.
+
+        The changed flags are read back from the database, so the source must
+        report a change only once it is committed, as ``PostgresChangeFeed``
+        does. ``CacheInvalidationBus`` is rejected: the service publishes to it
+        before the caller commits, so the client could read the previous row and
+        keep it until the next refresh.
+
+        Args:
+            source: Any object with ``add_listener`` that reports committed changes,
+                such as ``PostgresChangeFeed``.
+
+        Raises:
+            ValueError: If the source is a ``CacheInvalidationBus``.
+        """
+        if isinstance(source, CacheInvalidationBus):
+            raise ValueError(
+                "CacheInvalidationBus reports changes before they are committed;"
+                " attach a PostgresChangeFeed instead"
+            )
+        source.add_listener(self._on_change)
+
+    def _on_change(self, code: Optional[str]) -> None:
+        self._pending_codes.add(code)
+        if self._push_task is None or self._push_task.done():
+            self._push_task = asyncio.create_task(self._apply_pending_changes())
+
+    async def _apply_pending_changes(self) -> None:
+        while self._pending_codes:
+            await asyncio.sleep(self.push_debounce)
+            codes, self._pending_codes = self._pending_codes, set()
+            try:
+                if None in codes:
+                    await self.refresh()
+                else:
+                    await self._refresh_codes(codes)
+            except Exception as e:
+                logger.warning("Failed to apply pushed feature flag changes: %s", e)
+
+    async def _refresh_codes(self, codes: Set[str]) -> None:
+        async with self.session_factory() as session:
+            repository = PostgresRepository(session)
+            changed = {
+                code: await repository.get_by_code(code=code, entity_class=FeatureFlag)
+                for code in codes
+            }
+
+        flags = dict(self._snapshot.flags)
+        for code, flag in changed.items():
+            if flag is None:
+                flags.pop(code, None)
+            else:
+                flags[code] = flag
+        self._swap(flags)
+
+    async def _refresh_from_store(self) -> bool:
+        """
+        Swap in the published snapshot if its version changed.
+
+        Returns:
+            bool: Whether the snapshot is current, i.e. the database need not be read.
+        """
+        try:
+            published = await self.snapshot_store.load(
+                known_version=self._snapshot_version
+            )
+        except Exception as e:
+            logger.warning("Failed to load the published feature flag snapshot: %s", e)
+            return False
+
+        if published is None:
+            return self._snapshot_version is not None
+        self._swap({flag.code: flag for flag in published.entities})
+        self._snapshot_version = published.version
+        logger.debug(
+            "Loaded feature flag snapshot %d with %d flags",
+            published.version,
+            len(published.entities),
+        )
+        return True
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except FeatureFlagError as e:
+                logger.warning("%s", e)
+
+    def _swap(self, flags: dict) -> None:
+        for flag in flags.values():
+            if isinstance(flag.id, UUID):
+                flag.id = str(flag.id)
+        self._snapshot = _Snapshot(
+            flags=MappingProxyType(flags),
+            enabled=MappingProxyType(
+                {code: flag.enabled for code, flag in flags.items()}
+            ),
+            evaluators=MappingProxyType(
+                {code: self._compile(flag) for code, flag in flags.items()}
+            ),
+        )
+
+    @staticmethod
+    def _compile(flag: FeatureFlag) -> TargetingEvaluator:
+        try:
+            return evaluator_cache.get(flag)
+        except ValueError as e:
+            logger.warning(
+                "Invalid targeting rules of feature flag %s: %s", flag.code, e
+            )
+            return TargetingEvaluator(enabled=False)
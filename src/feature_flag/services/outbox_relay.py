@@ -0,0 +1,173 @@
+import asyncio
+import inspect
+import logging
+from typing import Callable, List, Optional, Tuple, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from feature_flag.models.codec import feature_flag_codec
+from feature_flag.models.outbox_event import OutboxEvent
+from feature_flag.notification.change_status import ChangeStatus
+from feature_flag.notification.notifier import (
+    AsyncNotifier,
+    NotificationEvent,
+    Notifier,
+)
+from feature_flag.repositories.outbox_repository import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """
+    Delivers the change notifications stored in the outbox to a notifier.
+
+    The relay locks a batch of events with ``FOR UPDATE SKIP LOCKED``, sends it
+    with the notifier's ``send_batch`` and deletes it in the same transaction,
+    so ``send_batch`` must have delivered the events when it returns.
+    Delivery is at-least-once: a batch whose transaction does not commit, for
+    instance because the process dies after sending it, is sent again. Failed
+    batches are kept and retried after ``poll_interval``; several relays can run
+    side by side. An event that cannot be decoded is kept and counted as a failed
+    delivery without holding back the rest of its batch.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        notifier: Union[Notifier, AsyncNotifier],
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        max_attempts: Optional[int] = 10,
+    ):
+        """
+        Initializes the OutboxRelay.
+
+        Args:
+            session_factory (Callable[[], AsyncSession]): Factory of database sessions.
+                A new session is used for every batch.
+            notifier (Notifier | AsyncNotifier): The notifier the events are delivered to.
+            batch_size (int, optional): The maximum number of events sent at once.
+            poll_interval (float, optional): Delay in seconds between polls when the outbox
+                is empty or a delivery failed.
+            max_attempts (int, optional): Events whose delivery failed this many times are
+                logged and discarded. ``None`` retries them forever, which blocks the
+                outbox behind an event that can never be delivered.
+        """
+        self.session_factory = session_factory
+        self.notifier = notifier
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def relay_once(self) -> int:
+        """
+        Deliver one batch of events.
+
+        Returns:
+            int: The number of events delivered.
+
+        Raises:
+            Exception: Whatever the notifier raised; the events stay in the outbox.
+        """
+        error = None
+        async with self.session_factory() as session:
+            async with session.begin():
+                repository = OutboxRepository(session)
+                events = await repository.fetch_batch(limit=self.batch_size)
+                if not events:
+                    return 0
+                decoded, failed = self._decode(events)
+                if decoded:
+                    try:
+                        await self._deliver(
+                            [notification for _, notification in decoded]
+                        )
+                    except Exception as e:
+                        # Commit the failed attempt instead of rolling back.
+                        error = e
+                        failed.extend(event for event, _ in decoded)
+                    else:
+                        await repository.delete([event.id for event, _ in decoded])
+                if failed:
+                    await self._record_failure(repository, failed)
+        if error is not None:
+            raise error
+        return len(decoded)
+
+    @staticmethod
+    def _decode(
+        events: List[OutboxEvent],
+    ) -> Tuple[List[Tuple[OutboxEvent, NotificationEvent]], List[OutboxEvent]]:
+        decoded = []
+        failed = []
+        for event in events:
+            try:
+                notification = (
+                    feature_flag_codec.decode(event.payload),
+                    ChangeStatus(event.change_status),
+                )
+            except Exception as e:
+                logger.warning(
+                    "Failed to decode outbox event %s for %s: %s",
+                    event.id,
+                    event.code,
+                    e,
+                )
+                failed.append(event)
+            else:
+                decoded.append((event, notification))
+        return decoded, failed
+
+    async def _deliver(self, batch: List[NotificationEvent]) -> None:
+        if inspect.iscoroutinefunction(self.notifier.send_batch):
+            await self.notifier.send_batch(batch)
+        else:
+            await asyncio.to_thread(self.notifier.send_batch, batch)
+
+    async def _record_failure(
+        self, repository: OutboxRepository, events: List[OutboxEvent]
+    ) -> None:
+        exhausted = [
+            event.id
+            for event in events
+            if self.max_attempts is not None and event.attempts + 1 >= self.max_attempts
+        ]
+        if exhausted:
+            logger.error(
+                "Discarding %d outbox events after %d failed deliveries: %s",
+                len(exhausted),
+                self.max_attempts,
+                [event for event in events if event.id in exhausted],
+            )
+            await repository.delete(exhausted)
+        retried = [event.id for event in events if event.id not in exhausted]
+        if retried:
+            await repository.record_failure(retried)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delivered = await self.relay_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Failed to relay outbox events: %s", e)
+                delivered = 0
+            if delivered < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
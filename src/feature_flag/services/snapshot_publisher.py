@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from feature_flag.core.snapshot_store import SnapshotStore
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.repositories.postgres_repository import PostgresRepository
+
+logger = logging.getLogger(__name__)
+
+# The database's start time of the rebuild's transaction. Every change committed
+# before it is visible to the read that follows, and it orders rebuilds across
+# processes by a single clock.
+_AS_OF = text("SELECT EXTRACT(EPOCH FROM now());")
+
+
+class SnapshotPublisher:
+    """
+    Rebuilds the snapshot in a ``SnapshotStore`` after feature flags change.
+
+    Rebuild requests are debounced: a burst of writes results in a single
+    full-table read and a single publish once ``debounce`` seconds have passed
+    without a new request. Share one instance per process.
+
+    ``FeatureFlagService`` requests a rebuild while the write's transaction is
+    still open, so that rebuild may not see the write. Attach a source that
+    reports committed changes, such as ``PostgresChangeFeed``, and/or set
+    ``rebuild_interval`` so that every change is published eventually.
+    """
+
+    def __init__(
+        self,
+        store: SnapshotStore,
+        session_factory: Callable[[], AsyncSession],
+        debounce: float = 0.5,
+        rebuild_interval: Optional[float] = None,
+    ):
+        """
+        Initializes the SnapshotPublisher.
+
+        Args:
+            store (SnapshotStore): The store the snapshot is published to.
+            session_factory (Callable[[], AsyncSession]): Factory of database sessions used
+                to read the flags. A new session is used for every rebuild.
+            debounce (float, optional): Quiet period in seconds before a requested rebuild runs.
+            rebuild_interval (float, optional): Interval in seconds between periodic full
+                rebuilds, started by ``start``.
+        """
+        self.store = store
+        self.session_factory = session_factory
+        self.debounce = debounce
+        self.rebuild_interval = rebuild_interval
+        self._requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._periodic_task: Optional[asyncio.Task] = None
+
+    def attach(self, source) -> None:
+        """
+        Request a rebuild whenever the given change source reports a change.
+
+        Args:
+            source: Any object with ``add_listener``, such as ``PostgresChangeFeed``,
+                which reports changes once they are committed.
+        """
+        source.add_listener(self._on_change)
+
+    def _on_change(self, code: Optional[str]) -> None:
+        self.request_rebuild()
+
+    async def start(self) -> None:
+        """
+        Start the periodic rebuilds, if configured.
+        """
+        if self.rebuild_interval and self._periodic_task is None:
+            self._periodic_task = asyncio.create_task(self._rebuild_periodically())
+
+    def request_rebuild(self) -> None:
+        """
+        Schedule a rebuild in the background.
+        """
+        self._requested.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def rebuild(self) -> Optional[int]:
+        """
+        Read every feature flag and publish the snapshot now.
+
+        Returns:
+            Optional[int]: The published version, or ``None`` if a newer snapshot
+            was published concurrently.
+        """
+        async with self.session_factory() as session:
+            result = await session.execute(_AS_OF)
+            as_of = float(result.scalar_one())
+            repository = PostgresRepository(session)
+            flags = await repository.list_all(entity_class=FeatureFlag)
+        for flag in flags:
+            flag.id = str(flag.id) if isinstance(flag.id, UUID) else flag.id
+        version = await self.store.publish(flags, as_of=as_of)
+        logger.debug(
+            "Published feature flag snapshot %s with %d flags", version, len(flags)
+        )
+        return version
+
+    async def stop(self) -> None:
+        """
+        Stop the periodic rebuilds, then run a pending rebuild, if any.
+        """
+        if self._periodic_task is not None:
+            self._periodic_task.cancel()
+            try:
+                await self._periodic_task
+            except asyncio.CancelledError:
+                pass
+            self._periodic_task = None
+        if self._task is None:
+            return
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while self._requested.is_set():
+            self._requested.clear()
+            await asyncio.sleep(self.debounce)
+            if self._requested.is_set():
+                continue
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.warning("Failed to publish feature flag snapshot: %s", e)
+
+    async def _rebuild_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.rebuild_interval)
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.warning("Failed to publish feature flag snapshot: %s", e)
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from feature_flag.core.usage_store import (
+    SECONDS_PER_HOUR,
+    UsageCount,
+    UsageCounts,
+    UsageStore,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class UsageRecorder:
+    """
+    Counts flag evaluations in memory and writes them behind to a ``UsageStore``.
+
+    Recording an evaluation is a single dict increment keyed by code, result and
+    hour; there is no lock and no I/O. A background task swaps the counters for
+    an empty dict every ``flush_interval`` seconds and adds them to the store in
+    one batch. Counts that cannot be written are kept for the next flush.
+
+    Share one instance per process, pass it to ``FeatureFlagService`` and
+    ``FeatureFlagSnapshotClient``, and call ``stop`` on shutdown to write the
+    remaining counts.
+    """
+
+    def __init__(self, store: UsageStore, flush_interval: float = 60.0):
+        """
+        Initializes the UsageRecorder.
+
+        Args:
+            store (UsageStore): Where the counts are written, e.g. ``RedisUsageStore``
+                or ``PostgresUsageStore``.
+            flush_interval (float, optional): Interval in seconds between flushes.
+        """
+        self.store = store
+        self.flush_interval = flush_interval
+        self._counts: UsageCounts = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, code: str, result: bool, count: int = 1) -> None:
+        """
+        Count ``count`` evaluations of a flag with the given result.
+        """
+        key = (code, result, int(time.time()) // SECONDS_PER_HOUR)
+        counts = self._counts
+        counts[key] = counts.get(key, 0) + count
+
+    async def flush(self) -> None:
+        """
+        Write the counted evaluations to the store now.
+
+        Raises:
+            Exception: Whatever the store raised; the counts are kept.
+        """
+        counts, self._counts = self._counts, {}
+        if not counts:
+            return
+        try:
+            await self.store.add(counts)
+        except Exception:
+            counts_now = self._counts
+            for key, count in counts.items():
+                counts_now[key] = counts_now.get(key, 0) + count
+            raise
+
+    async def usage(
+        self, code: str, since: Optional[datetime] = None
+    ) -> List[UsageCount]:
+        """
+        The stored hourly evaluation counts of a flag, oldest first. Evaluations
+        that were not flushed yet are not included.
+
+        Args:
+            code (str): The code of the feature flag.
+            since (datetime, optional): Only return the hours from the hour of ``since`` on.
+        """
+        return await self.store.query(code, since=since)
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background task and write the remaining counts.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("Failed to write feature flag usage: %s", e)
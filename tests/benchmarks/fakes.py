@@ -0,0 +1,185 @@
+import time
+from dataclasses import replace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from feature_flag.core.base_repository import T
+
+
+class _FakeRedisData:
+    """
+    Key-value data with millisecond expiry shared by the fake Redis clients.
+    """
+
+    def __init__(self):
+        self.data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+
+    def _get(self, key: str) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def _set(self, key: str, value: bytes, px: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + px / 1000 if px is not None else None
+        self.data[key] = (value, expires_at)
+        return True
+
+    def _delete(self, *keys: str) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def _pttl(self, key: str) -> int:
+        if self._get(key) is None:
+            return -2
+        expires_at = self.data[key][1]
+        if expires_at is None:
+            return -1
+        return int((expires_at - time.monotonic()) * 1000)
+
+
+class FakeRedis(_FakeRedisData):
+    """
+    In-process stand-in for ``redis.Redis`` implementing the commands used by
+    ``RedisCache``: GET, SET with PX, DELETE, MGET, PTTL and non-transactional
+    pipelines.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._get(key)
+
+    def set(self, key: str, value: bytes, px: Optional[int] = None) -> bool:
+        return self._set(key, value, px=px)
+
+    def delete(self, *keys: str) -> int:
+        return self._delete(*keys)
+
+    def mget(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        return [self._get(key) for key in keys]
+
+    def pttl(self, key: str) -> int:
+        return self._pttl(key)
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakeAsyncRedis(_FakeRedisData):
+    """
+    In-process stand-in for ``redis.asyncio.Redis`` implementing the commands
+    used by ``AsyncRedisCache``: GET, SET with PX, DELETE, MGET, PTTL and
+    non-transactional pipelines.
+    """
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._get(key)
+
+    async def set(self, key: str, value: bytes, px: Optional[int] = None) -> bool:
+        return self._set(key, value, px=px)
+
+    async def delete(self, *keys: str) -> int:
+        return self._delete(*keys)
+
+    async def mget(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        return [self._get(key) for key in keys]
+
+    async def pttl(self, key: str) -> int:
+        return self._pttl(key)
+
+    def pipeline(self, transaction: bool = True) -> "FakeAsyncPipeline":
+        return FakeAsyncPipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis: _FakeRedisData):
+        self.redis = redis
+        self.commands: List[Tuple[str, tuple, dict]] = []
+
+    def get(self, key: str):
+        self.commands.append(("_get", (key,), {}))
+
+    def set(self, key: str, value: bytes, px: Optional[int] = None):
+        self.commands.append(("_set", (key, value), {"px": px}))
+
+    def pttl(self, key: str):
+        self.commands.append(("_pttl", (key,), {}))
+
+    def execute(self) -> List[Any]:
+        commands, self.commands = self.commands, []
+        return [
+            getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in commands
+        ]
+
+
+class FakeAsyncPipeline(FakePipeline):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self) -> List[Any]:
+        return super().execute()
+
+
+class FakeResult:
+    def __init__(self, rows: List[tuple]):
+        self.rows = rows
+
+    def fetchone(self) -> Optional[tuple]:
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self) -> List[tuple]:
+        return self.rows
+
+
+class FakeSession:
+    """
+    Stand-in for ``AsyncSession`` answering every statement with the same rows,
+    so ``PostgresRepository`` runs its full code path without a database.
+    """
+
+    def __init__(self, rows: List[tuple]):
+        self.rows = rows
+
+    async def execute(self, statement: Any, params: Any = None) -> FakeResult:
+        return FakeResult(self.rows)
+
+
+class InMemoryRepository:
+    """
+    Dict-backed stand-in for ``PostgresRepository`` storing entities by code.
+
+    Entities are copied on the way in and out, like rows read from a database.
+    """
+
+    def __init__(self, entities: Iterable[Any] = ()):
+        self.entities: Dict[str, Any] = {entity.code: entity for entity in entities}
+
+    async def insert_returning(self, entity: T) -> T:
+        self.entities[entity.code] = replace(entity)
+        return replace(entity)
+
+    async def get_by_code(self, code: str, entity_class) -> Optional[T]:
+        entity = self.entities.get(code)
+        return replace(entity) if entity is not None else None
+
+    async def get_by_codes(self, codes: List[str], entity_class) -> List[T]:
+        return [replace(self.entities[code]) for code in codes if code in self.entities]
+
+    async def update_by_code(
+        self, code: str, values: Dict[str, Any], entity_class, expected_version=None
+    ) -> Optional[T]:
+        entity = self.entities.get(code)
+        if entity is None:
+            return None
+        entity = replace(entity, **values)
+        self.entities.pop(code)
+        self.entities[entity.code] = entity
+        return replace(entity)
+
+    async def list_all(self, entity_class) -> List[T]:
+        return [replace(entity) for entity in self.entities.values()]
@@ -0,0 +1,386 @@
+"""
+Micro-benchmarks of the library's hot paths.
+
+Every benchmark calls the library's public API, so wrappers such as the metrics
+recorded by ``timed`` are part of the measurement. It runs offline: the caches
+talk to ``FakeRedis`` and ``FakeAsyncRedis``, the repository to a ``FakeSession``
+returning canned rows, and the service to an ``InMemoryRepository``::
+
+    PYTHONPATH=src python -m tests.benchmarks --output results.json
+    PYTHONPATH=src python -m tests.benchmarks --compare results.json
+
+Every benchmark is calibrated to run for at least ``min_time`` seconds per
+round and reports nanoseconds per operation over several rounds.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from feature_flag.core import FeatureFlagNotFoundError
+from feature_flag.core.cache import AsyncRedisCache, RedisCache
+from feature_flag.core.local_cache import LocalCache
+from feature_flag.models.codec import feature_flag_codec
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.repositories.postgres_repository import PostgresRepository
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.benchmarks.fakes import (
+    FakeAsyncRedis,
+    FakeRedis,
+    FakeSession,
+    InMemoryRepository,
+)
+
+SCHEMA_VERSION = 1
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # Returns the operation to time, either a function or a coroutine function.
+    setup: Callable[[], Callable[[], Any]]
+    is_async: bool = False
+
+
+def _make_flag(index: int = 0) -> FeatureFlag:
+    created_at = datetime(2024, 9, 25, tzinfo=timezone.utc)
+    return FeatureFlag(
+        id=str(uuid.UUID(int=index)),
+        name=f"Feature {index}",
+        code=f"feature-{index}",
+        description="Benchmark flag",
+        enabled=index % 2 == 0,
+        metadata={"owner": "benchmarks", "targeting": {"percentage": 50}},
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+
+def _flag_kwargs() -> Dict[str, Any]:
+    flag = _make_flag()
+    return {field: getattr(flag, field) for field in flag.__dataclass_fields__}
+
+
+# Redis caches
+
+
+def _setup_redis_set():
+    cache = RedisCache(FakeRedis(), namespace="bench")
+    flag = _make_flag()
+    return lambda: cache.set(flag.code, feature_flag_codec.encode(flag), ttl=60)
+
+
+def _setup_redis_get():
+    cache = RedisCache(FakeRedis(), namespace="bench")
+    flag = _make_flag()
+    cache.set(flag.code, feature_flag_codec.encode(flag))
+    return lambda: feature_flag_codec.decode(cache.get(flag.code))
+
+
+def _setup_async_redis_set():
+    cache = AsyncRedisCache(FakeAsyncRedis(), namespace="bench")
+    flag = _make_flag()
+
+    async def operation():
+        await cache.set(flag.code, feature_flag_codec.encode(flag), ttl=60)
+
+    return operation
+
+
+def _setup_async_redis_get():
+    redis = FakeAsyncRedis()
+    cache = AsyncRedisCache(redis, namespace="bench")
+    flag = _make_flag()
+    # Both caches format keys and values alike, so the entry is written with a
+    # synchronous cache sharing the data.
+    writer = FakeRedis()
+    writer.data = redis.data
+    RedisCache(writer, namespace="bench").set(
+        flag.code, feature_flag_codec.encode(flag)
+    )
+
+    async def operation():
+        return feature_flag_codec.decode(await cache.get(flag.code))
+
+    return operation
+
+
+# Postgres repository
+
+
+def _row(flag: FeatureFlag) -> tuple:
+    return tuple(getattr(flag, field) for field in flag.__dataclass_fields__)
+
+
+def _setup_repository_get_by_code():
+    flag = _make_flag()
+    repository = PostgresRepository(FakeSession([_row(flag)]))
+
+    async def operation():
+        return await repository.get_by_code(flag.code, FeatureFlag)
+
+    return operation
+
+
+def _setup_repository_insert_returning():
+    flag = _make_flag()
+    repository = PostgresRepository(FakeSession([_row(flag)]))
+
+    async def operation():
+        return await repository.insert_returning(flag)
+
+    return operation
+
+
+def _setup_repository_update_by_code():
+    flag = _make_flag()
+    repository = PostgresRepository(FakeSession([_row(flag)]))
+    values = {"enabled": True, "metadata": flag.metadata}
+
+    async def operation():
+        return await repository.update_by_code(
+            flag.code, values, FeatureFlag, expected_version=flag.created_at
+        )
+
+    return operation
+
+
+def _setup_repository_bulk_upsert():
+    flags = [_make_flag(index) for index in range(100)]
+    repository = PostgresRepository(FakeSession([_row(flag) for flag in flags]))
+
+    async def operation():
+        return await repository.bulk_upsert(flags)
+
+    return operation
+
+
+# Model construction
+
+
+def _setup_flag_construction():
+    kwargs = _flag_kwargs()
+    return lambda: FeatureFlag(**kwargs)
+
+
+# Service read paths
+
+
+def _service(local_cache: bool = False, cache: bool = True, flags: int = 100):
+    redis = FakeAsyncRedis()
+    service = FeatureFlagService(
+        InMemoryRepository(_make_flag(index) for index in range(flags)),
+        cache=AsyncRedisCache(redis, namespace="bench") if cache else None,
+        local_cache=LocalCache(max_size=flags * 2) if local_cache else None,
+    )
+    return service, redis
+
+
+def _setup_get_local_hit():
+    service, _ = _service(local_cache=True)
+
+    async def operation():
+        return await service.get_feature_flag_by_code("feature-1")
+
+    return operation
+
+
+def _setup_get_redis_hit():
+    service, _ = _service()
+
+    async def operation():
+        return await service.get_feature_flag_by_code("feature-1")
+
+    return operation
+
+
+def _setup_get_miss():
+    service, redis = _service()
+
+    async def operation():
+        redis.data.clear()
+        return await service.get_feature_flag_by_code("feature-1")
+
+    return operation
+
+
+def _setup_get_not_found():
+    service, _ = _service()
+
+    async def operation():
+        try:
+            await service.get_feature_flag_by_code("unknown")
+        except FeatureFlagNotFoundError:
+            pass
+
+    return operation
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("redis_cache.set", _setup_redis_set),
+    Benchmark("redis_cache.get", _setup_redis_get),
+    Benchmark("async_redis_cache.set", _setup_async_redis_set, is_async=True),
+    Benchmark("async_redis_cache.get", _setup_async_redis_get, is_async=True),
+    Benchmark(
+        "postgres_repository.get_by_code", _setup_repository_get_by_code, is_async=True
+    ),
+    Benchmark(
+        "postgres_repository.insert_returning",
+        _setup_repository_insert_returning,
+        is_async=True,
+    ),
+    Benchmark(
+        "postgres_repository.update_by_code",
+        _setup_repository_update_by_code,
+        is_async=True,
+    ),
+    Benchmark(
+        "postgres_repository.bulk_upsert_100",
+        _setup_repository_bulk_upsert,
+        is_async=True,
+    ),
+    Benchmark("feature_flag.construct", _setup_flag_construction),
+    Benchmark("service.get_by_code.local_hit", _setup_get_local_hit, is_async=True),
+    Benchmark("service.get_by_code.redis_hit", _setup_get_redis_hit, is_async=True),
+    Benchmark("service.get_by_code.miss", _setup_get_miss, is_async=True),
+    Benchmark("service.get_by_code.not_found", _setup_get_not_found, is_async=True),
+]
+
+
+def _time_sync(operation: Callable[[], Any], number: int) -> int:
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        operation()
+    return time.perf_counter_ns() - start
+
+
+def _time_async(
+    loop: asyncio.AbstractEventLoop,
+    operation: Callable[[], Awaitable[Any]],
+    number: int,
+) -> int:
+    async def run() -> int:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            await operation()
+        return time.perf_counter_ns() - start
+
+    return loop.run_until_complete(run())
+
+
+def run_benchmark(
+    benchmark: Benchmark,
+    loop: asyncio.AbstractEventLoop,
+    rounds: int = 5,
+    min_time: float = 0.05,
+) -> Dict[str, Any]:
+    """
+    Time a benchmark and summarize the nanoseconds per operation.
+    """
+    operation = benchmark.setup()
+
+    def timer(number: int) -> int:
+        if benchmark.is_async:
+            return _time_async(loop, operation, number)
+        return _time_sync(operation, number)
+
+    # Warm up, then double the iteration count until a round is long enough.
+    timer(1)
+    number = 1
+    while timer(number) < min_time * 1e9 and number < 10_000_000:
+        number *= 2
+
+    per_operation = [timer(number) / number for _ in range(rounds)]
+    return {
+        "name": benchmark.name,
+        "iterations": number,
+        "rounds": rounds,
+        "min_ns": min(per_operation),
+        "median_ns": statistics.median(per_operation),
+        "mean_ns": statistics.fmean(per_operation),
+        "stdev_ns": statistics.stdev(per_operation) if rounds > 1 else 0.0,
+    }
+
+
+def run(
+    rounds: int = 5, min_time: float = 0.05, pattern: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run the benchmarks whose name contains ``pattern``, or all of them.
+
+    Returns:
+        Dict[str, Any]: The results, in the JSON document format written by ``main``.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        results = [
+            run_benchmark(benchmark, loop, rounds=rounds, min_time=min_time)
+            for benchmark in BENCHMARKS
+            if pattern is None or pattern in benchmark.name
+        ]
+    finally:
+        loop.close()
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """
+    Format the change of the median of every benchmark present in both runs.
+    """
+    previous = {result["name"]: result for result in baseline["benchmarks"]}
+    lines = []
+    for result in current["benchmarks"]:
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        change = (result["median_ns"] / before["median_ns"] - 1) * 100
+        lines.append(
+            f"{result['name']:<40} {before['median_ns']:>12.1f} ns"
+            f" -> {result['median_ns']:>12.1f} ns ({change:+.1f}%)"
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--compare", help="A previous JSON result to compare with.")
+    parser.add_argument("--filter", help="Only run benchmarks containing this text.")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="Minimum duration of a round in seconds.",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(rounds=args.rounds, min_time=args.min_time, pattern=args.filter)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+            output.write("\n")
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            lines = compare(json.load(baseline), results)
+    else:
+        lines = [
+            f"{result['name']:<40} {result['median_ns']:>12.1f} ns"
+            f"  (min {result['min_ns']:.1f}, {result['iterations']} x {result['rounds']})"
+            for result in results["benchmarks"]
+        ]
+    sys.stdout.write("\n".join(lines) + "\n")
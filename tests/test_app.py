@@ -11,6 +11,7 @@ from feature_flag.services.feature_flag_service import (
     FeatureFlagService,
     FeatureFlagError,
     FeatureFlagNotFoundError,
+    FeatureFlagConflictError,
 )
 from tests.test_utils import get_redis_connection, get_db_session, get_slack_notifier
 
@@ -75,6 +76,8 @@ async def update_flag(
         return jsonable_encoder(updated_flag)
     except FeatureFlagNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except FeatureFlagConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except FeatureFlagError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -8,6 +8,7 @@ import sqlparse
 from faker import Faker
 from redis import RedisCluster
 from sqlalchemy import text
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
@@ -88,12 +89,30 @@ async def setup_database(session: AsyncSession, sql_file="setup.sql"):
 async def teardown_database(session: AsyncSession):
     # SQL command to drop the table
     drop_table_sql = "DROP TABLE IF EXISTS feature_flags;"
+    drop_outbox_table_sql = "DROP TABLE IF EXISTS feature_flag_outbox;"
+    drop_usage_table_sql = "DROP TABLE IF EXISTS feature_flag_usage;"
     drop_routine_sql = "DROP ROUTINE IF EXISTS update_updated_at();"
+    drop_notify_routine_sql = "DROP ROUTINE IF EXISTS notify_feature_flag_change();"
 
     # Execute the SQL command using the async session
     async with session.begin():
         await session.execute(text(drop_table_sql))
+        await session.execute(text(drop_outbox_table_sql))
+        await session.execute(text(drop_usage_table_sql))
         await session.execute(text(drop_routine_sql))
+        await session.execute(text(drop_notify_routine_sql))
+
+
+def bound_parameters(statement, params):
+    """
+    The SQL and the parameter values sent by the asyncpg dialect.
+    """
+    compiled = statement.compile(dialect=asyncpg_dialect())
+    processors = compiled._bind_processors
+    return compiled.string, {
+        name: processors[name](value) if name in processors else value
+        for name, value in compiled.construct_params(params).items()
+    }
 
 
 def random_word(length=10):
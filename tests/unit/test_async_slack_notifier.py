@@ -0,0 +1,126 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import orjson
+
+from feature_flag.core.exceptions import NotifierError
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.notification.async_slack_notifier import AsyncSlackNotifier
+from feature_flag.notification.change_status import ChangeStatus
+
+WEBHOOK_URL = "https://hooks.slack.com/services/T00000000/B00000000/XXXXXXXX"
+
+
+class TestAsyncSlackNotifier(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.responses = []
+        self.requests = []
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(self._handle))
+        self.feature_flag = FeatureFlag(
+            name="Test Feature", code="TEST_FEATURE", enabled=True
+        )
+        self.notifier = AsyncSlackNotifier(
+            WEBHOOK_URL, headers={"Authorization": "Bearer TOKEN"}, client=self.client
+        )
+        patcher = patch(
+            "feature_flag.notification.async_slack_notifier.asyncio.sleep",
+            new_callable=AsyncMock,
+        )
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    def _handle(self, request):
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def test_send(self):
+        self.responses = [httpx.Response(200, text="ok")]
+
+        await self.notifier.send(self.feature_flag, ChangeStatus.ENABLED)
+
+        request = self.requests[0]
+        self.assertEqual(str(request.url), WEBHOOK_URL)
+        self.assertEqual(request.headers["Authorization"], "Bearer TOKEN")
+        self.assertEqual(
+            orjson.loads(request.content),
+            {"text": "Feature Flag[Code=`TEST_FEATURE`] has been enabled"},
+        )
+        self.sleep.assert_not_called()
+
+    async def test_send_batch(self):
+        self.responses = [httpx.Response(200, text="ok")]
+        other_flag = FeatureFlag(name="Other", code="OTHER")
+
+        await self.notifier.send_batch(
+            [
+                (self.feature_flag, ChangeStatus.ENABLED),
+                (other_flag, ChangeStatus.DELETED),
+            ]
+        )
+
+        self.assertEqual(
+            orjson.loads(self.requests[0].content)["text"],
+            "2 feature flag changes:\n"
+            "Feature Flag[Code=`TEST_FEATURE`] has been enabled\n"
+            "Feature Flag[Code=`OTHER`] has been deleted",
+        )
+
+    async def test_excluded_status(self):
+        self.notifier.excluded_statuses = [ChangeStatus.ENABLED]
+
+        await self.notifier.send(self.feature_flag, ChangeStatus.ENABLED)
+
+        self.assertEqual(self.requests, [])
+
+    async def test_rate_limit_honours_retry_after(self):
+        self.responses = [
+            httpx.Response(429, headers={"Retry-After": "7"}),
+            httpx.Response(200, text="ok"),
+        ]
+
+        await self.notifier.send(self.feature_flag, ChangeStatus.ENABLED)
+
+        self.assertEqual(len(self.requests), 2)
+        self.sleep.assert_awaited_once_with(7.0)
+
+    async def test_retries_with_backoff(self):
+        self.responses = [
+            httpx.ConnectTimeout("timed out"),
+            httpx.Response(503),
+            httpx.Response(200, text="ok"),
+        ]
+
+        await self.notifier.send(self.feature_flag, ChangeStatus.DISABLED)
+
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(
+            [call.args[0] for call in self.sleep.await_args_list], [0.5, 1.0]
+        )
+
+    async def test_gives_up_after_max_retries(self):
+        self.responses = [httpx.Response(500)] * 4
+
+        with self.assertRaises(NotifierError):
+            await self.notifier.send(self.feature_flag, ChangeStatus.ENABLED)
+
+        self.assertEqual(len(self.requests), 4)
+
+    async def test_client_error_is_not_retried(self):
+        self.responses = [httpx.Response(404)]
+
+        with self.assertRaises(NotifierError):
+            await self.notifier.send(self.feature_flag, ChangeStatus.ENABLED)
+
+        self.assertEqual(len(self.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
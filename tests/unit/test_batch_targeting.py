@@ -0,0 +1,142 @@
+import unittest
+from unittest.mock import AsyncMock
+
+from feature_flag.core import FeatureFlagNotFoundError
+from feature_flag.core.targeting import bucket, compile_targeting
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.test_utils import random_word
+
+try:
+    import numpy as np
+
+    from feature_flag.core.batch_targeting import buckets, evaluate_keys
+except ImportError:
+    np = None
+
+
+def make_flag(targeting=None, enabled=True):
+    return FeatureFlag(
+        name=random_word(),
+        code=random_word(),
+        enabled=enabled,
+        metadata={"targeting": targeting} if targeting is not None else None,
+    )
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchTargeting(unittest.TestCase):
+
+    def assert_matches_online(self, flag, keys, **kwargs):
+        evaluator = compile_targeting(flag)
+        expected = [evaluator({"user_id": key}) for key in keys]
+
+        result = evaluate_keys({flag.code: evaluator}, np.array(keys), **kwargs)
+
+        self.assertEqual(result[flag.code].tolist(), expected)
+
+    def test_buckets_match_online_bucketing(self):
+        keys = [f"user-{i}" for i in range(500)] + ["ünïcødé-1", "", "x" * 40]
+
+        self.assertEqual(
+            buckets("salt", keys).tolist(), [bucket("salt", key) for key in keys]
+        )
+        self.assertEqual(
+            buckets("salt", np.arange(500)).tolist(),
+            [bucket("salt", key) for key in range(500)],
+        )
+
+    def test_percentage_rollout(self):
+        self.assert_matches_online(
+            make_flag({"percentage": 37.5}), [f"user-{i}" for i in range(2000)]
+        )
+        self.assert_matches_online(make_flag({"percentage": 50}), list(range(2000)))
+
+    def test_rules(self):
+        flag = make_flag(
+            {
+                "segments": {"staff": ["u-1", "u-7", 3]},
+                "rules": [
+                    {"segment": "staff"},
+                    {"attributes": {"user_id": ["u-9"], "plan": ["pro"]}},
+                ],
+                "percentage": 10,
+            }
+        )
+
+        self.assert_matches_online(flag, [f"u-{i}" for i in range(200)])
+        self.assert_matches_online(flag, list(range(200)))
+
+    def test_segment_values_out_of_key_range(self):
+        flag = make_flag(
+            {
+                "segments": {"staff": [-1, 10**20, 2**64, 3]},
+                "rules": [{"segment": "staff"}],
+            }
+        )
+        evaluator = compile_targeting(flag)
+
+        for dtype in (np.uint64, np.int64, np.uint8):
+            keys = np.arange(5, dtype=dtype)
+            result = evaluate_keys({flag.code: evaluator}, keys)
+            self.assertEqual(
+                result[flag.code].tolist(),
+                [evaluator({"user_id": key}) for key in keys.tolist()],
+            )
+
+    def test_mixed_keys(self):
+        self.assert_matches_online(
+            make_flag({"percentage": 50}),
+            [None, 1.5, "u-1", True, 7, "ü"] * 10,
+        )
+
+    def test_flag_states(self):
+        keys = [f"user-{i}" for i in range(100)]
+        self.assert_matches_online(make_flag(), keys)
+        self.assert_matches_online(make_flag({"percentage": 100}, enabled=False), keys)
+
+    def test_chunks_and_process_pool(self):
+        flag = make_flag({"percentage": 20})
+        keys = [f"user-{i}" for i in range(1000)]
+
+        self.assert_matches_online(flag, keys, chunk_size=300)
+        self.assert_matches_online(flag, keys, chunk_size=300, processes=2)
+
+    def test_empty_keys(self):
+        flag = make_flag({"percentage": 20})
+
+        result = evaluate_keys({flag.code: compile_targeting(flag)}, [])
+
+        self.assertEqual(result[flag.code].shape, (0,))
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestServiceEvaluateBatch(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.mock_repository = AsyncMock()
+        self.service = FeatureFlagService(self.mock_repository, None)
+
+    async def test_evaluate_batch(self):
+        rollout = make_flag({"percentage": 30})
+        everyone = make_flag()
+        self.mock_repository.get_by_codes.return_value = [rollout, everyone]
+        keys = np.array([f"user-{i}" for i in range(1000)])
+
+        result = await self.service.evaluate_batch([rollout.code, everyone.code], keys)
+
+        self.assertEqual(
+            result[rollout.code].tolist(),
+            [bucket(rollout.code, key) < 3000 for key in keys.tolist()],
+        )
+        self.assertTrue(result[everyone.code].all())
+
+    async def test_unknown_flag(self):
+        self.mock_repository.get_by_codes.return_value = []
+
+        with self.assertRaises(FeatureFlagNotFoundError):
+            await self.service.evaluate_batch([random_word()], ["user-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
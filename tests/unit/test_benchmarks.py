@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from feature_flag.core.cache import AsyncRedisCache
+from feature_flag.models.codec import feature_flag_codec
+from tests.benchmarks import suite
+from tests.benchmarks.fakes import FakeAsyncRedis, InMemoryRepository
+
+
+class TestFakes(unittest.IsolatedAsyncioTestCase):
+
+    async def test_fake_redis_round_trip(self):
+        cache = AsyncRedisCache(FakeAsyncRedis(), namespace="test")
+        flag = suite._make_flag(1)
+
+        other = suite._make_flag(2)
+        await cache.set(flag.code, feature_flag_codec.encode(flag), ttl=60)
+        await cache.set_many({other.code: feature_flag_codec.encode(other)}, ttl=60)
+
+        cached = await cache.get_many([flag.code, other.code, "unknown"])
+        self.assertEqual(
+            [feature_flag_codec.decode(value) for value in cached[:2]], [flag, other]
+        )
+        self.assertIsNone(cached[2])
+        await cache.delete(flag.code)
+        self.assertIsNone(await cache.get(flag.code))
+
+    async def test_in_memory_repository_returns_copies(self):
+        flag = suite._make_flag(1)
+        repository = InMemoryRepository([flag])
+
+        found = await repository.get_by_code(flag.code, type(flag))
+        found.enabled = not flag.enabled
+
+        self.assertEqual(await repository.get_by_code(flag.code, type(flag)), flag)
+        self.assertIsNone(await repository.get_by_code("unknown", type(flag)))
+
+
+class TestSuite(unittest.TestCase):
+
+    def test_run_writes_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            with redirect_stdout(StringIO()):
+                suite.main(["--output", path, "--rounds", "2", "--min-time", "0"])
+            with open(path) as output:
+                results = json.load(output)
+            with redirect_stdout(StringIO()) as stdout:
+                suite.main(
+                    [
+                        "--compare",
+                        path,
+                        "--filter",
+                        "redis_cache.set",
+                        "--min-time",
+                        "0",
+                    ]
+                )
+
+        self.assertEqual(results["schema_version"], suite.SCHEMA_VERSION)
+        self.assertEqual(
+            [result["name"] for result in results["benchmarks"]],
+            [benchmark.name for benchmark in suite.BENCHMARKS],
+        )
+        for result in results["benchmarks"]:
+            self.assertEqual(result["rounds"], 2)
+            self.assertGreater(result["median_ns"], 0)
+        self.assertIn("async_redis_cache.set", stdout.getvalue())
+        self.assertNotIn("redis_cache.get", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
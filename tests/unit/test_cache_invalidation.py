@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+from redis.exceptions import ConnectionError
+
+from feature_flag.core.invalidation import CacheInvalidationBus
+from feature_flag.core.local_cache import LocalCache
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.test_utils import random_word
+
+
+class FakePubSub:
+    def __init__(self, fail_subscribe=False):
+        self.fail_subscribe = fail_subscribe
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        if self.fail_subscribe:
+            raise ConnectionError("connection refused")
+
+    async def listen(self):
+        while True:
+            message = await self.queue.get()
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+    async def aclose(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self, pubsubs):
+        self.pubsubs = list(pubsubs)
+        self.active = None
+        self.published = []
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        self.active = self.pubsubs.pop(0) if self.pubsubs else FakePubSub()
+        return self.active
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+class TestCacheInvalidationBus(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.local_cache = LocalCache()
+        self.connection = FakeRedis([])
+        self.bus = CacheInvalidationBus(
+            self.connection,
+            local_cache=self.local_cache,
+            namespace="feature-flag",
+            reconnect_delay=0,
+        )
+
+    async def asyncTearDown(self):
+        await self.bus.stop()
+
+    async def _deliver(self, message):
+        await self.connection.active.queue.put(
+            {"type": "message", "data": orjson.dumps(message)}
+        )
+        await asyncio.sleep(0)
+
+    async def test_publish(self):
+        await self.bus.publish("code")
+
+        channel, message = self.connection.published[0]
+        self.assertEqual(channel, "feature-flag:invalidations")
+        self.assertEqual(orjson.loads(message), {"n": self.bus.node_id, "c": "code"})
+
+    async def test_publish_failure_is_swallowed(self):
+        connection = MagicMock()
+        connection.publish = AsyncMock(side_effect=ConnectionError("down"))
+        bus = CacheInvalidationBus(connection)
+
+        await bus.publish("code")
+
+    async def test_message_evicts_local_entry(self):
+        self.local_cache.set("a", 1)
+        self.local_cache.set("b", 2)
+        listener = MagicMock()
+        self.bus.add_listener(listener)
+        await self.bus.start()
+        await self.bus.wait_until_subscribed()
+
+        await self._deliver({"n": "other-node", "c": "a"})
+
+        self.assertIsNone(self.local_cache.get("a"))
+        self.assertEqual(self.local_cache.get("b"), 2)
+        listener.assert_called_once_with("a")
+
+    async def test_own_messages_are_ignored(self):
+        self.local_cache.set("a", 1)
+        await self.bus.start()
+        await self.bus.wait_until_subscribed()
+
+        await self._deliver({"n": self.bus.node_id, "c": "a"})
+
+        self.assertEqual(self.local_cache.get("a"), 1)
+
+    async def test_resync_after_reconnect(self):
+        self.connection.pubsubs = [FakePubSub(), FakePubSub(fail_subscribe=True)]
+        listener = MagicMock()
+        self.bus.add_listener(listener)
+        await self.bus.start()
+        await self.bus.wait_until_subscribed()
+        self.local_cache.set("a", 1)
+
+        await self.connection.active.queue.put(ConnectionError("connection lost"))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        await self.bus.wait_until_subscribed()
+
+        self.assertEqual(len(self.local_cache), 0)
+        listener.assert_called_once_with(None)
+
+    async def test_service_publishes_on_write(self):
+        flag = FeatureFlag(id=str(uuid.uuid4()), name=random_word(), code=random_word())
+        repository = AsyncMock()
+        repository.get_by_code.return_value = flag
+        bus = MagicMock()
+        bus.publish = AsyncMock()
+        service = FeatureFlagService(repository, invalidation_bus=bus)
+
+        await service.enable_feature_flag(flag.code)
+        await service.delete_feature_flag(flag.code)
+
+        self.assertEqual(bus.publish.await_count, 2)
+        bus.publish.assert_awaited_with(flag.code)
+
+
+if __name__ == "__main__":
+    unittest.main()
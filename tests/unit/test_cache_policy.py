@@ -0,0 +1,147 @@
+import asyncio
+import unittest
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from feature_flag.core.cache_policy import CachePolicy
+from feature_flag.models.codec import feature_flag_codec
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.test_utils import random_word
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class TestCachePolicy(unittest.TestCase):
+
+    def test_ttl_with_jitter(self):
+        policy = CachePolicy(ttl=100, jitter=0.1, stale_while_revalidate=30)
+
+        for _ in range(100):
+            self.assertTrue(90 <= policy.next_ttl() <= 110)
+            self.assertTrue(120 <= policy.next_expiry() <= 140)
+
+    def test_no_ttl(self):
+        policy = CachePolicy()
+
+        self.assertIsNone(policy.next_expiry())
+        self.assertFalse(policy.is_stale(None))
+
+    def test_is_stale(self):
+        policy = CachePolicy(ttl=100, stale_while_revalidate=30)
+
+        self.assertFalse(policy.is_stale(31))
+        self.assertTrue(policy.is_stale(30))
+        self.assertFalse(policy.is_stale(None))
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            CachePolicy(ttl=0)
+        with self.assertRaises(ValueError):
+            CachePolicy(ttl=10, jitter=1)
+        with self.assertRaises(ValueError):
+            CachePolicy(stale_while_revalidate=10)
+
+
+class TestFeatureFlagServiceCachePolicy(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.flag = FeatureFlag(
+            id=str(uuid.uuid4()), name=random_word(), code=random_word(), enabled=True
+        )
+        self.mock_repository = AsyncMock()
+        self.mock_cache = MagicMock()
+
+    async def test_cache_hit_is_not_written_back(self):
+        self.mock_cache.get.return_value = feature_flag_codec.encode(self.flag)
+        service = FeatureFlagService(self.mock_repository, self.mock_cache)
+
+        await service.get_feature_flag_by_code(self.flag.code)
+
+        self.mock_cache.set.assert_not_called()
+
+    async def test_cache_hit_is_written_back_when_configured(self):
+        self.mock_cache.get.return_value = feature_flag_codec.encode(self.flag)
+        service = FeatureFlagService(
+            self.mock_repository,
+            self.mock_cache,
+            cache_policy=CachePolicy(write_on_miss_only=False),
+        )
+
+        await service.get_feature_flag_by_code(self.flag.code)
+
+        self.mock_cache.set.assert_called_once()
+
+    async def test_cache_miss_is_written_with_ttl(self):
+        self.mock_cache.get.return_value = None
+        self.mock_repository.get_by_code.return_value = self.flag
+        service = FeatureFlagService(
+            self.mock_repository, self.mock_cache, cache_policy=CachePolicy(ttl=60)
+        )
+
+        await service.get_feature_flag_by_code(self.flag.code)
+
+        self.assertEqual(self.mock_cache.set.call_args[1]["ttl"], 60)
+
+    async def test_stale_entry_is_served_and_revalidated(self):
+        refreshed_flag = FeatureFlag(
+            id=self.flag.id, name=self.flag.name, code=self.flag.code, enabled=False
+        )
+        self.mock_cache.get_with_ttl.return_value = (
+            feature_flag_codec.encode(self.flag),
+            5,
+        )
+        background_repository = AsyncMock()
+        background_repository.get_by_code.return_value = refreshed_flag
+        service = FeatureFlagService(
+            self.mock_repository,
+            self.mock_cache,
+            cache_policy=CachePolicy(ttl=60, stale_while_revalidate=10),
+            background_session_factory=FakeSession,
+        )
+
+        with patch(
+            "feature_flag.services.feature_flag_service.PostgresRepository",
+            return_value=background_repository,
+        ):
+            result = await service.get_feature_flag_by_code(self.flag.code)
+            self.assertTrue(result.enabled)
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+        self.mock_repository.get_by_code.assert_not_called()
+        background_repository.get_by_code.assert_awaited_once()
+        cached_flag = feature_flag_codec.decode(
+            self.mock_cache.set.call_args[1]["value"]
+        )
+        self.assertFalse(cached_flag.enabled)
+        self.assertEqual(self.mock_cache.set.call_args[1]["ttl"], 70)
+
+    async def test_stale_entry_is_refreshed_inline_without_session_factory(self):
+        self.mock_cache.get_with_ttl.return_value = (
+            feature_flag_codec.encode(self.flag),
+            5,
+        )
+        self.mock_repository.get_by_code.return_value = FeatureFlag(
+            id=self.flag.id, name=self.flag.name, code=self.flag.code, enabled=False
+        )
+        service = FeatureFlagService(
+            self.mock_repository,
+            self.mock_cache,
+            cache_policy=CachePolicy(ttl=60, stale_while_revalidate=10),
+        )
+
+        result = await service.get_feature_flag_by_code(self.flag.code)
+
+        self.assertFalse(result.enabled)
+        self.mock_cache.set.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
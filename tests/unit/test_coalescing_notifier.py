@@ -0,0 +1,138 @@
+import asyncio
+import unittest
+import uuid
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.notification.change_status import ChangeStatus
+from feature_flag.notification.coalescing_notifier import CoalescingNotifier
+from feature_flag.notification.slack_notifier import SlackNotifier
+from tests.test_utils import random_word
+
+
+def make_flag(enabled=False):
+    return FeatureFlag(
+        id=str(uuid.uuid4()), name=random_word(), code=random_word(), enabled=enabled
+    )
+
+
+class TestCoalescingNotifier(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.inner = MagicMock()
+        self.inner.send_batch = AsyncMock()
+        self.notifier = CoalescingNotifier(self.inner, window=0.01)
+
+    def sent_events(self):
+        return [
+            (flag.code, status)
+            for flag, status in self.inner.send_batch.call_args[0][0]
+        ]
+
+    async def test_one_digest_per_window(self):
+        flags = [make_flag(enabled=True) for _ in range(50)]
+        for flag in flags:
+            self.notifier.send(flag, ChangeStatus.ENABLED)
+
+        await asyncio.sleep(0.05)
+
+        self.inner.send_batch.assert_awaited_once()
+        self.assertEqual(
+            self.sent_events(), [(flag.code, ChangeStatus.ENABLED) for flag in flags]
+        )
+        self.assertEqual(self.notifier.stats.digests, 1)
+        self.assertEqual(self.notifier.stats.coalesced, 0)
+
+    async def test_changes_collapse_to_net_effect(self):
+        toggled = make_flag()
+        enabled = make_flag()
+        updated = make_flag()
+        deleted = make_flag()
+
+        self.notifier.send(replace(toggled, enabled=True), ChangeStatus.ENABLED)
+        self.notifier.send(toggled, ChangeStatus.DISABLED)
+        self.notifier.send(replace(enabled, enabled=True), ChangeStatus.ENABLED)
+        self.notifier.send(replace(enabled, enabled=False), ChangeStatus.DISABLED)
+        self.notifier.send(replace(enabled, enabled=True), ChangeStatus.ENABLED)
+        self.notifier.send(updated, ChangeStatus.UPDATED)
+        self.notifier.send(replace(updated, enabled=True), ChangeStatus.ENABLED)
+        self.notifier.send(replace(deleted, enabled=True), ChangeStatus.ENABLED)
+        self.notifier.send(deleted, ChangeStatus.DELETED)
+        await self.notifier.stop()
+
+        self.assertEqual(
+            self.sent_events(),
+            [
+                (enabled.code, ChangeStatus.ENABLED),
+                (updated.code, ChangeStatus.UPDATED),
+                (deleted.code, ChangeStatus.DELETED),
+            ],
+        )
+        self.assertTrue(self.inner.send_batch.call_args[0][0][1][0].enabled)
+        self.assertEqual(self.notifier.stats.received, 9)
+        self.assertEqual(self.notifier.stats.coalesced, 6)
+        self.assertEqual(self.notifier.stats.sent, 3)
+
+    async def test_stop_sends_pending_digest(self):
+        notifier = CoalescingNotifier(self.inner, window=60)
+        notifier.send(make_flag(), ChangeStatus.UPDATED)
+
+        await notifier.stop()
+
+        self.inner.send_batch.assert_awaited_once()
+
+    async def test_failures_are_counted(self):
+        self.inner.send_batch.side_effect = Exception("rate limited")
+        self.notifier.send(make_flag(), ChangeStatus.UPDATED)
+
+        await self.notifier.stop()
+
+        self.assertEqual(self.notifier.stats.failed, 1)
+
+    async def test_send_batch_delivers_without_window(self):
+        notifier = CoalescingNotifier(self.inner, window=60)
+        toggled = make_flag()
+        updated = make_flag()
+
+        await notifier.send_batch(
+            [
+                (replace(toggled, enabled=True), ChangeStatus.ENABLED),
+                (toggled, ChangeStatus.DISABLED),
+                (updated, ChangeStatus.UPDATED),
+            ]
+        )
+
+        self.assertEqual(self.sent_events(), [(updated.code, ChangeStatus.UPDATED)])
+        self.assertIsNone(notifier._task)
+        self.assertEqual(notifier.stats.coalesced, 2)
+
+    async def test_send_batch_raises_failures(self):
+        self.inner.send_batch.side_effect = Exception("rate limited")
+
+        with self.assertRaises(Exception):
+            await self.notifier.send_batch([(make_flag(), ChangeStatus.UPDATED)])
+
+        self.assertEqual(self.notifier.stats.failed, 1)
+
+    @patch("requests.post")
+    async def test_slack_digest(self, mock_post):
+        notifier = CoalescingNotifier(SlackNotifier("https://hooks.slack.com/x"))
+        first = make_flag(enabled=True)
+        second = make_flag()
+        notifier.send(first, ChangeStatus.ENABLED)
+        notifier.send(second, ChangeStatus.DELETED)
+
+        await notifier.stop()
+
+        mock_post.assert_called_once()
+        self.assertEqual(
+            mock_post.call_args[1]["json"]["text"],
+            f"2 feature flag changes:\n"
+            f"Feature Flag[Code=`{first.code}`] has been enabled\n"
+            f"Feature Flag[Code=`{second.code}`] has been deleted",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
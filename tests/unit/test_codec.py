@@ -0,0 +1,103 @@
+import unittest
+import uuid
+from dataclasses import FrozenInstanceError, asdict, dataclass, make_dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import orjson
+
+from feature_flag.core.cache import orjson_default
+from feature_flag.models.codec import DataclassCodec, feature_flag_codec
+from feature_flag.models.feature_flag import FeatureFlag
+from tests.test_utils import random_word
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenEntity:
+    code: str
+    created_at: Optional[datetime] = None
+
+
+FIELD_NAMES = list(FeatureFlag.__dataclass_fields__)
+
+
+def round_trip(value):
+    return orjson.loads(orjson.dumps(value, default=orjson_default))
+
+
+class TestDataclassCodec(unittest.TestCase):
+
+    def setUp(self):
+        self.flag = FeatureFlag(
+            id=str(uuid.uuid4()),
+            name=random_word(),
+            code=random_word(),
+            enabled=True,
+            metadata={"owner": random_word()},
+            created_at=datetime(2024, 9, 25, 12, 30, 1, 123456, tzinfo=timezone.utc),
+        )
+
+    def test_round_trip_restores_types(self):
+        decoded = feature_flag_codec.decode(
+            round_trip(feature_flag_codec.encode(self.flag))
+        )
+
+        self.assertEqual(decoded, self.flag)
+        self.assertIsInstance(decoded.created_at, datetime)
+        self.assertIsNone(decoded.updated_at)
+
+    def test_decodes_dicts(self):
+        decoded = feature_flag_codec.decode(round_trip(asdict(self.flag)))
+
+        self.assertEqual(decoded, self.flag)
+
+    def test_dicts_survive_other_field_layouts(self):
+        encoded = round_trip(feature_flag_codec.as_dict(self.flag))
+        smaller = DataclassCodec(
+            make_dataclass("FeatureFlag", [("code", str), ("enabled", bool)])
+        )
+
+        self.assertEqual(encoded, round_trip(asdict(self.flag)))
+        self.assertEqual(
+            smaller.decode(encoded), smaller.entity_class(self.flag.code, True)
+        )
+        self.assertEqual(
+            feature_flag_codec.decode({"name": self.flag.name, "code": self.flag.code}),
+            FeatureFlag(name=self.flag.name, code=self.flag.code),
+        )
+
+    def test_rejects_wrong_number_of_values(self):
+        with self.assertRaises(ValueError):
+            feature_flag_codec.decode([self.flag.name, self.flag.code])
+
+    def test_rejects_other_field_layouts(self):
+        encoded = round_trip(feature_flag_codec.encode(self.flag))
+        reordered = DataclassCodec(
+            make_dataclass(
+                "FeatureFlag", [(field, object) for field in reversed(FIELD_NAMES)]
+            )
+        )
+
+        self.assertNotEqual(reordered.version, feature_flag_codec.version)
+        with self.assertRaises(ValueError):
+            reordered.decode(encoded)
+        with self.assertRaises(ValueError):
+            feature_flag_codec.decode(["0", *encoded[1:]])
+
+    def test_feature_flag_is_slotted(self):
+        self.assertFalse(hasattr(self.flag, "__dict__"))
+        self.assertEqual(FeatureFlag._table_name, "feature_flags")
+
+    def test_frozen_dataclass(self):
+        codec = DataclassCodec(FrozenEntity)
+        entity = FrozenEntity(code=random_word(), created_at=self.flag.created_at)
+
+        decoded = codec.decode(round_trip(codec.encode(entity)))
+
+        self.assertEqual(decoded, entity)
+        with self.assertRaises(FrozenInstanceError):
+            decoded.code = random_word()
+
+
+if __name__ == "__main__":
+    unittest.main()
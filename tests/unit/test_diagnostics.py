@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import pstats
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from feature_flag.core.diagnostics import DiagnosticsPolicy, profile_hook
+from feature_flag.core.local_cache import LocalCache
+from feature_flag.core.metrics import NoopMetrics, timed
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.test_utils import random_word
+
+SERVICE_LOGGER = "feature_flag.services.feature_flag_service"
+DIAGNOSTICS_LOGGER = "feature_flag.core.diagnostics"
+
+
+class SlowRepository:
+    def __init__(self, flag):
+        self.flag = flag
+        self.metrics = NoopMetrics()
+
+    @timed("postgres", "get_by_code")
+    async def get_by_code(self, code, entity_class):
+        await asyncio.sleep(0.01)
+        return self.flag
+
+
+class TestDiagnostics(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.flag = FeatureFlag(name=random_word(), code=random_word(), enabled=True)
+        self.repository = SlowRepository(self.flag)
+
+    async def test_log_sampling(self):
+        service = FeatureFlagService(
+            self.repository, diagnostics=DiagnosticsPolicy(log_sample_rate=0)
+        )
+        with self.assertNoLogs(SERVICE_LOGGER, level=logging.INFO):
+            await service.get_feature_flag_by_code(self.flag.code)
+
+        service.diagnostics.log_sample_rate = 1
+        with self.assertLogs(SERVICE_LOGGER, level=logging.INFO) as logs:
+            await service.get_feature_flag_by_code(self.flag.code)
+        self.assertEqual(len(logs.records), 2)
+
+    async def test_slow_operation_log_has_breakdown(self):
+        service = FeatureFlagService(
+            self.repository,
+            diagnostics=DiagnosticsPolicy(slow_threshold=0.005, log_sample_rate=0),
+        )
+
+        with self.assertLogs(DIAGNOSTICS_LOGGER, level=logging.WARNING) as logs:
+            await service.evaluate(self.flag.code, {})
+
+        self.assertEqual(len(logs.records), 1)
+        message = logs.records[0].getMessage()
+        self.assertIn("Slow feature flag operation evaluate", message)
+        self.assertRegex(message, r"postgres=\d+\.\dms")
+        self.assertIn("other=", message)
+
+    async def test_fast_operations_are_not_logged(self):
+        cache = LocalCache()
+        cache.set(self.flag.code, self.flag)
+        service = FeatureFlagService(
+            self.repository,
+            local_cache=cache,
+            diagnostics=DiagnosticsPolicy(slow_threshold=0.005, log_sample_rate=0),
+        )
+
+        with self.assertNoLogs(DIAGNOSTICS_LOGGER, level=logging.WARNING):
+            await service.get_feature_flag_by_code(self.flag.code)
+
+    async def test_call_hook_wraps_sampled_calls(self):
+        calls = []
+
+        async def hook(operation, call):
+            calls.append(operation)
+            return await call()
+
+        policy = DiagnosticsPolicy(call_hook=hook, log_sample_rate=0)
+        service = FeatureFlagService(self.repository, diagnostics=policy)
+
+        self.assertTrue(await service.evaluate(self.flag.code, {}))
+        policy.hook_sample_rate = 0
+        await service.evaluate(self.flag.code, {})
+
+        self.assertEqual(calls, ["evaluate"])
+
+    async def test_profile_hook(self):
+        report = MagicMock()
+        service = FeatureFlagService(
+            self.repository,
+            diagnostics=DiagnosticsPolicy(
+                call_hook=profile_hook(report), log_sample_rate=0
+            ),
+        )
+
+        await asyncio.gather(
+            service.get_feature_flag_by_code(self.flag.code),
+            service.get_feature_flag_by_code(self.flag.code),
+        )
+
+        report.assert_called_once()
+        operation, stats = report.call_args[0]
+        self.assertEqual(operation, "get_feature_flag_by_code")
+        self.assertIsInstance(stats, pstats.Stats)
+
+    async def test_default_profile_report_is_logged(self):
+        hook = profile_hook(limit=5)
+
+        with self.assertLogs(DIAGNOSTICS_LOGGER, level=logging.INFO) as logs:
+            self.assertEqual(await hook("work", AsyncMock(return_value=1)), 1)
+
+        self.assertIn("Profile of work", logs.records[0].getMessage())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,15 @@
 import unittest
 import uuid
+from dataclasses import replace
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, call, AsyncMock
 
+import orjson
 from faker import Faker
 
+from feature_flag.core import FeatureFlagConflictError
+from feature_flag.core.cache import orjson_default
+from feature_flag.models.codec import feature_flag_codec
 from feature_flag.models.feature_flag import FeatureFlag
 from feature_flag.services.feature_flag_service import FeatureFlagService
 from tests.test_utils import random_word
@@ -11,6 +17,10 @@ from tests.test_utils import random_word
 fake = Faker()
 
 
+def cache_key(code):
+    return f"{feature_flag_codec.version}:{code}"
+
+
 class TestFeatureFlagServiceWithCache(unittest.IsolatedAsyncioTestCase):
 
     async def asyncSetUp(self):
@@ -23,48 +33,48 @@ class TestFeatureFlagServiceWithCache(unittest.IsolatedAsyncioTestCase):
         existing_flag = FeatureFlag(
             id=flag_id, name=random_word(), code=random_word(), enabled=True
         )
-        self.mock_cache.get.return_value = existing_flag
+        self.mock_repository.update_by_code.return_value = replace(
+            existing_flag, enabled=False
+        )
 
         await self.service.disable_feature_flag(code=existing_flag.code)
 
+        self.mock_cache.get.assert_not_called()
         self.mock_repository.get_by_code.assert_not_called()
 
-        expected_flag = FeatureFlag(
-            id=flag_id, name=existing_flag.name, code=existing_flag.code, enabled=False
-        )
-
-        self.mock_repository.update.assert_called_once_with(entity=expected_flag)
+        self.mock_repository.update_by_code.assert_called_once()
         self.mock_cache.set.assert_called_once()
 
         call_args = self.mock_cache.set.call_args
-        self.assertEqual(call_args[1]["key"], existing_flag.code)
-        self.assertEqual(call_args[1]["value"]["name"], existing_flag.name)
-        self.assertEqual(call_args[1]["value"]["code"], existing_flag.code)
-        self.assertEqual(call_args[1]["value"]["id"], existing_flag.id)
-        self.assertFalse(call_args[1]["value"]["enabled"])
+        cached_flag = feature_flag_codec.decode(call_args[1]["value"])
+        self.assertEqual(call_args[1]["key"], cache_key(existing_flag.code))
+        self.assertEqual(cached_flag.name, existing_flag.name)
+        self.assertEqual(cached_flag.code, existing_flag.code)
+        self.assertEqual(cached_flag.id, existing_flag.id)
+        self.assertFalse(cached_flag.enabled)
 
     async def test_enable_feature_flag(self):
         flag_id = str(uuid.uuid4())
         existing_flag = FeatureFlag(
             id=flag_id, name=random_word(), code=random_word(), enabled=False
         )
-        self.mock_cache.get.return_value = existing_flag
+        self.mock_repository.update_by_code.return_value = replace(
+            existing_flag, enabled=True
+        )
 
         await self.service.enable_feature_flag(code=existing_flag.code)
 
+        self.mock_cache.get.assert_not_called()
         self.mock_repository.get_by_code.assert_not_called()
-
-        expected_flag = FeatureFlag(
-            id=flag_id, name=existing_flag.name, code=existing_flag.code, enabled=True
-        )
-        self.mock_repository.update.assert_called_once_with(entity=expected_flag)
+        self.mock_repository.update_by_code.assert_called_once()
         self.mock_cache.set.assert_called_once()
         call_args = self.mock_cache.set.call_args
-        self.assertEqual(call_args[1]["key"], existing_flag.code)
-        self.assertEqual(call_args[1]["value"]["name"], existing_flag.name)
-        self.assertEqual(call_args[1]["value"]["code"], existing_flag.code)
-        self.assertEqual(call_args[1]["value"]["id"], existing_flag.id)
-        self.assertTrue(call_args[1]["value"]["enabled"])
+        cached_flag = feature_flag_codec.decode(call_args[1]["value"])
+        self.assertEqual(call_args[1]["key"], cache_key(existing_flag.code))
+        self.assertEqual(cached_flag.name, existing_flag.name)
+        self.assertEqual(cached_flag.code, existing_flag.code)
+        self.assertEqual(cached_flag.id, existing_flag.id)
+        self.assertTrue(cached_flag.enabled)
 
     async def test_get_feature_flag(self):
         flag_data = FeatureFlag(
@@ -77,8 +87,88 @@ class TestFeatureFlagServiceWithCache(unittest.IsolatedAsyncioTestCase):
         self.mock_repository.get_by_code.assert_not_called()
 
         self.assertEqual(result, flag_data)
-        self.mock_cache.get.assert_called_once_with(key=flag_data.code)
+        self.mock_cache.get.assert_called_once_with(key=cache_key(flag_data.code))
+        self.mock_repository.get_by_code.assert_not_called()
+
+    async def test_get_feature_flags_by_codes(self):
+        cached_flag = FeatureFlag(
+            id=str(uuid.uuid4()), name=random_word(), code=random_word()
+        )
+        stored_flag = FeatureFlag(
+            id=str(uuid.uuid4()), name=random_word(), code=random_word()
+        )
+        missing_code = random_word()
+        self.mock_cache.get_many.return_value = [
+            feature_flag_codec.encode(cached_flag),
+            None,
+            None,
+        ]
+        self.mock_repository.get_by_codes.return_value = [stored_flag]
+
+        result = await self.service.get_feature_flags_by_codes(
+            [cached_flag.code, stored_flag.code, missing_code, cached_flag.code]
+        )
+
+        self.assertEqual(
+            result,
+            {
+                cached_flag.code: cached_flag,
+                stored_flag.code: stored_flag,
+                missing_code: None,
+            },
+        )
+        self.mock_cache.get_many.assert_called_once_with(
+            keys=[
+                cache_key(code)
+                for code in (cached_flag.code, stored_flag.code, missing_code)
+            ]
+        )
+        self.mock_repository.get_by_codes.assert_called_once_with(
+            codes=[stored_flag.code, missing_code], entity_class=FeatureFlag
+        )
+        self.mock_cache.set_many.assert_called_once_with(
+            mapping={
+                cache_key(stored_flag.code): feature_flag_codec.encode(stored_flag)
+            },
+            ttl=None,
+        )
         self.mock_repository.get_by_code.assert_not_called()
+        self.mock_cache.set_tombstones_many.assert_not_called()
+
+    async def test_get_feature_flags_by_codes_batches_tombstones(self):
+        self.service.negative_cache_ttl = 5
+        self.mock_cache.get_many.return_value = [None, None, None]
+        self.mock_repository.get_by_codes.return_value = []
+        codes = [random_word() for _ in range(3)]
+
+        result = await self.service.get_feature_flags_by_codes(codes)
+
+        self.assertEqual(result, dict.fromkeys(codes))
+        self.mock_cache.set_tombstones_many.assert_called_once_with(
+            keys=[cache_key(code) for code in codes], ttl=5
+        )
+        self.mock_cache.set_tombstone.assert_not_called()
+
+    async def test_import_feature_flags(self):
+        flags = [
+            FeatureFlag(id=uuid.uuid4(), name=random_word(), code=random_word())
+            for _ in range(3)
+        ]
+        self.mock_repository.bulk_upsert.return_value = flags
+
+        result = await self.service.import_feature_flags(
+            [{"name": flag.name, "code": flag.code} for flag in flags]
+        )
+
+        self.assertEqual([flag.code for flag in result], [flag.code for flag in flags])
+        self.assertTrue(all(isinstance(flag.id, str) for flag in result))
+        self.mock_repository.bulk_upsert.assert_awaited_once()
+        self.mock_cache.set_many.assert_called_once()
+        self.assertEqual(
+            list(self.mock_cache.set_many.call_args[1]["mapping"]),
+            [cache_key(flag.code) for flag in flags],
+        )
+        self.mock_cache.set.assert_not_called()
 
     async def test_list_feature_flags(self):
         limit = 10
@@ -105,9 +195,57 @@ class TestFeatureFlagServiceWithCache(unittest.IsolatedAsyncioTestCase):
 
         self.mock_repository.get_by_code.assert_not_called()
 
-        self.mock_repository.update.assert_called_once()
+        self.mock_repository.update_by_code.assert_called_once()
         self.mock_cache.set.assert_called_once()
 
+    async def test_update_renaming_code_evicts_old_code(self):
+        existing_flag = FeatureFlag(
+            id=str(uuid.uuid4()), name=random_word(), code=random_word()
+        )
+        self.mock_cache.get.return_value = existing_flag
+        new_code = random_word()
+        self.mock_repository.update_by_code.return_value = replace(
+            existing_flag, code=new_code
+        )
+
+        await self.service.update_feature_flag(
+            code=existing_flag.code, flag_data={"code": new_code}
+        )
+
+        self.assertEqual(self.mock_cache.set.call_args[1]["key"], cache_key(new_code))
+        self.mock_cache.delete.assert_called_once_with(
+            key=cache_key(existing_flag.code)
+        )
+
+    async def test_update_conflict_evicts_stale_entry(self):
+        existing_flag = FeatureFlag(
+            id=str(uuid.uuid4()),
+            name=random_word(),
+            code=random_word(),
+            updated_at=datetime(2024, 9, 25, tzinfo=timezone.utc),
+        )
+        # Cached entries carry their timestamps as ISO 8601 strings.
+        self.mock_cache.get.return_value = orjson.loads(
+            orjson.dumps(
+                feature_flag_codec.encode(existing_flag), default=orjson_default
+            )
+        )
+        self.mock_repository.update_by_code.return_value = None
+
+        with self.assertRaises(FeatureFlagConflictError):
+            await self.service.update_feature_flag(
+                code=existing_flag.code, flag_data={"enabled": True}
+            )
+
+        self.assertEqual(
+            self.mock_repository.update_by_code.call_args[1]["expected_version"],
+            datetime(2024, 9, 25, tzinfo=timezone.utc),
+        )
+        self.mock_cache.delete.assert_called_once_with(
+            key=cache_key(existing_flag.code)
+        )
+        self.mock_cache.set.assert_not_called()
+
     async def test_delete_feature_flag(self):
         existing_flag = FeatureFlag(
             id=str(uuid.uuid4()), name=random_word(), code=random_word()
@@ -121,7 +259,9 @@ class TestFeatureFlagServiceWithCache(unittest.IsolatedAsyncioTestCase):
         self.mock_repository.delete.assert_called_once_with(
             entity_id=existing_flag.id, entity_class=FeatureFlag
         )
-        self.mock_cache.delete.assert_called_once_with(key=existing_flag.code)
+        self.mock_cache.delete.assert_called_once_with(
+            key=cache_key(existing_flag.code)
+        )
 
 
 if __name__ == "__main__":
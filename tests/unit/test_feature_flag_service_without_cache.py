@@ -1,9 +1,12 @@
 import unittest
 import uuid
+from dataclasses import replace
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock
 
 from faker import Faker
 
+from feature_flag.core import FeatureFlagConflictError, FeatureFlagNotFoundError
 from feature_flag.models.feature_flag import FeatureFlag
 from feature_flag.services.feature_flag_service import FeatureFlagService
 from tests.test_utils import random_word
@@ -18,37 +21,61 @@ class TestFeatureFlagServiceWithoutCache(unittest.IsolatedAsyncioTestCase):
         self.service = FeatureFlagService(self.mock_repository, None)
 
     async def test_disable_feature_flag(self):
-        flag_id = str(uuid.uuid4())
         existing_flag = FeatureFlag(
-            id=flag_id, name=random_word(), code=random_word(), enabled=True
+            id=uuid.uuid4(), name=random_word(), code=random_word(), enabled=True
+        )
+        self.mock_repository.update_by_code.return_value = replace(
+            existing_flag, enabled=False
         )
-        self.mock_repository.get_by_code.return_value = existing_flag
 
-        await self.service.disable_feature_flag(flag_id)
+        result = await self.service.disable_feature_flag(existing_flag.code)
 
-        expected_flag = FeatureFlag(
-            id=flag_id, name=existing_flag.name, code=existing_flag.code, enabled=False
+        self.mock_repository.update_by_code.assert_called_once_with(
+            code=existing_flag.code,
+            values={"enabled": False},
+            entity_class=FeatureFlag,
         )
-        self.mock_repository.update.assert_called_once_with(entity=expected_flag)
+        self.mock_repository.get_by_code.assert_not_called()
+        self.assertIs(result.enabled, False)
+        self.assertEqual(result.id, str(existing_flag.id))
 
     async def test_enable_feature_flag(self):
-        flag_id = str(uuid.uuid4())
         existing_flag = FeatureFlag(
-            id=flag_id, name=random_word(), code=random_word(), enabled=False
+            id=uuid.uuid4(), name=random_word(), code=random_word(), enabled=False
+        )
+        self.mock_repository.update_by_code.return_value = replace(
+            existing_flag, enabled=True
         )
-        self.mock_repository.get_by_code.return_value = existing_flag
 
-        await self.service.enable_feature_flag(flag_id)
+        result = await self.service.enable_feature_flag(existing_flag.code)
 
-        expected_flag = FeatureFlag(
-            id=flag_id, name=existing_flag.name, code=existing_flag.code, enabled=True
+        self.mock_repository.update_by_code.assert_called_once_with(
+            code=existing_flag.code,
+            values={"enabled": True},
+            entity_class=FeatureFlag,
         )
-        self.mock_repository.update.assert_called_once_with(entity=expected_flag)
+        self.mock_repository.get_by_code.assert_not_called()
+        self.assertIs(result.enabled, True)
+        self.assertEqual(result.id, str(existing_flag.id))
 
     async def test_create_feature_flag(self):
         flag_data = {"name": random_word(), "code": random_word()}
-        await self.service.create_feature_flag(flag_data)
-        self.mock_repository.insert.assert_called_once()
+        stored_flag = FeatureFlag(id=uuid.uuid4(), **flag_data)
+        self.mock_repository.insert_returning.return_value = stored_flag
+
+        result = await self.service.create_feature_flag(flag_data)
+
+        self.mock_repository.insert_returning.assert_called_once_with(
+            entity=FeatureFlag(**flag_data)
+        )
+        self.mock_repository.get_by_id.assert_not_called()
+        self.assertIsInstance(result.id, str)
+
+    async def test_toggle_unknown_flag(self):
+        self.mock_repository.update_by_code.return_value = None
+
+        with self.assertRaises(FeatureFlagNotFoundError):
+            await self.service.enable_feature_flag(random_word())
 
     async def test_get_feature_flag(self):
         flag_data = FeatureFlag(
@@ -64,10 +91,113 @@ class TestFeatureFlagServiceWithoutCache(unittest.IsolatedAsyncioTestCase):
         await self.service.list_feature_flags(limit=limit, skip=skip)
         self.mock_repository.list.assert_called_once_with(limit=limit, skip=skip, entity_class=FeatureFlag)
 
+    async def test_iter_feature_flags(self):
+        flags = [
+            FeatureFlag(id=str(uuid.uuid4()), name=random_word(), code=random_word())
+            for _ in range(3)
+        ]
+
+        async def stream(entity_class, batch_size):
+            for flag in flags:
+                yield flag
+
+        self.mock_repository.stream = stream
+        result = [flag async for flag in self.service.iter_feature_flags(batch_size=2)]
+        self.assertEqual(result, flags)
+
     async def test_update_feature_flag(self):
         flag_data = {"name": random_word(), "code": random_word()}
         await self.service.update_feature_flag(str(uuid.uuid4()), flag_data)
-        self.mock_repository.update.assert_called_once()
+        self.mock_repository.update_by_code.assert_called_once()
+
+    async def test_update_sends_changed_fields_with_version(self):
+        updated_at = datetime(2024, 9, 25, tzinfo=timezone.utc)
+        existing_flag = FeatureFlag(
+            id=str(uuid.uuid4()),
+            name=random_word(),
+            code=random_word(),
+            updated_at=updated_at,
+        )
+        self.mock_repository.get_by_code.return_value = existing_flag
+        self.mock_repository.update_by_code.return_value = replace(
+            existing_flag, enabled=True
+        )
+
+        result = await self.service.update_feature_flag(
+            existing_flag.code, {"name": existing_flag.name, "enabled": True}
+        )
+
+        self.mock_repository.update_by_code.assert_called_once_with(
+            code=existing_flag.code,
+            values={"enabled": True},
+            entity_class=FeatureFlag,
+            expected_version=updated_at,
+        )
+        self.assertTrue(result.enabled)
+
+    async def test_update_without_changes_does_not_write(self):
+        existing_flag = FeatureFlag(
+            id=str(uuid.uuid4()), name=random_word(), code=random_word()
+        )
+        self.mock_repository.get_by_code.return_value = existing_flag
+
+        notifier = AsyncMock()
+        self.service.notifier = notifier
+
+        result = await self.service.update_feature_flag(
+            existing_flag.code, {"name": existing_flag.name}
+        )
+
+        self.assertEqual(result, existing_flag)
+        self.mock_repository.update_by_code.assert_not_called()
+        notifier.send.assert_not_called()
+
+    async def test_update_ignores_database_managed_fields(self):
+        existing_flag = FeatureFlag(
+            id=str(uuid.uuid4()),
+            name=random_word(),
+            code=random_word(),
+            created_at=datetime(2024, 9, 25, tzinfo=timezone.utc),
+        )
+        self.mock_repository.get_by_code.return_value = existing_flag
+        self.mock_repository.update_by_code.return_value = replace(
+            existing_flag, enabled=True
+        )
+
+        await self.service.update_feature_flag(
+            existing_flag.code,
+            {
+                "id": str(uuid.uuid4()),
+                "created_at": "2024-09-26T00:00:00+00:00",
+                "enabled": True,
+            },
+        )
+
+        self.assertEqual(
+            self.mock_repository.update_by_code.call_args[1]["values"],
+            {"enabled": True},
+        )
+
+    async def test_concurrent_update_raises_conflict(self):
+        existing_flag = FeatureFlag(
+            id=str(uuid.uuid4()),
+            name=random_word(),
+            code=random_word(),
+            created_at=datetime(2024, 9, 25, tzinfo=timezone.utc),
+        )
+        self.mock_repository.get_by_code.return_value = existing_flag
+        self.mock_repository.update_by_code.return_value = None
+
+        with self.assertRaises(FeatureFlagConflictError):
+            await self.service.update_feature_flag(
+                existing_flag.code, {"name": random_word()}
+            )
+
+        self.mock_repository.get_by_code.return_value = None
+        with self.assertRaises(FeatureFlagNotFoundError):
+            await self.service.update_feature_flag(
+                existing_flag.code, {"name": random_word()}
+            )
 
     async def test_delete_feature_flag(self):
         feature_flag = FeatureFlag(id=str(uuid.uuid4()), name=random_word(), code=random_word())
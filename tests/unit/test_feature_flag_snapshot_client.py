@@ -0,0 +1,172 @@
+import asyncio
+import unittest
+import uuid
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import orjson
+
+from feature_flag.core import FeatureFlagError
+from feature_flag.core.invalidation import CacheInvalidationBus
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.repositories.postgres_change_feed import PostgresChangeFeed
+from feature_flag.services.feature_flag_snapshot_client import (
+    FeatureFlagSnapshotClient,
+)
+from tests.test_utils import random_word
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class TestFeatureFlagSnapshotClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.enabled_flag = FeatureFlag(
+            id=uuid.uuid4(), name=random_word(), code=random_word(), enabled=True
+        )
+        self.disabled_flag = FeatureFlag(
+            id=str(uuid.uuid4()), name=random_word(), code=random_word()
+        )
+        self.mock_repository = AsyncMock()
+        self.mock_repository.list_all.return_value = [
+            self.enabled_flag,
+            self.disabled_flag,
+        ]
+        patcher = patch(
+            "feature_flag.services.feature_flag_snapshot_client.PostgresRepository",
+            return_value=self.mock_repository,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = FeatureFlagSnapshotClient(FakeSession, push_debounce=0)
+
+    async def asyncTearDown(self):
+        await self.client.stop()
+
+    async def test_is_enabled(self):
+        self.assertFalse(self.client.is_enabled(self.enabled_flag.code))
+
+        await self.client.start()
+
+        self.assertTrue(self.client.is_enabled(self.enabled_flag.code))
+        self.assertFalse(self.client.is_enabled(self.disabled_flag.code))
+        self.assertTrue(self.client.is_enabled("unknown", default=True))
+        self.assertIsInstance(self.client.get(self.enabled_flag.code).id, str)
+
+    async def test_evaluate(self):
+        self.enabled_flag.metadata = {
+            "targeting": {"rules": [{"attributes": {"plan": ["pro"]}}]}
+        }
+        invalid_flag = FeatureFlag(
+            name=random_word(),
+            code=random_word(),
+            enabled=True,
+            metadata={"targeting": {"percentage": 200}},
+        )
+        self.mock_repository.list_all.return_value.append(invalid_flag)
+
+        await self.client.start()
+
+        self.assertTrue(self.client.evaluate(self.enabled_flag.code, {"plan": "pro"}))
+        self.assertFalse(self.client.evaluate(self.enabled_flag.code, {}))
+        self.assertFalse(self.client.evaluate(self.disabled_flag.code, {}))
+        self.assertFalse(self.client.evaluate(invalid_flag.code, {}))
+        self.assertTrue(self.client.evaluate("unknown", {}, default=True))
+
+    async def test_evaluations_are_recorded(self):
+        recorder = MagicMock()
+        self.client.usage_recorder = recorder
+        await self.client.start()
+
+        self.client.is_enabled(self.enabled_flag.code)
+        self.client.evaluate(self.disabled_flag.code, {})
+        self.client.is_enabled("unknown")
+
+        recorder.record.assert_has_calls(
+            [call(self.enabled_flag.code, True), call(self.disabled_flag.code, False)]
+        )
+        self.assertEqual(recorder.record.call_count, 2)
+
+    async def test_snapshot_is_immutable(self):
+        await self.client.start()
+
+        with self.assertRaises(TypeError):
+            self.client.flags["other"] = self.enabled_flag
+
+        self.client.get(self.enabled_flag.code).enabled = False
+        self.assertTrue(self.client.is_enabled(self.enabled_flag.code))
+
+    async def test_failed_refresh_keeps_previous_snapshot(self):
+        await self.client.start()
+        self.mock_repository.list_all.side_effect = Exception("connection lost")
+
+        with self.assertRaises(FeatureFlagError):
+            await self.client.refresh()
+
+        self.assertTrue(self.client.is_enabled(self.enabled_flag.code))
+
+    async def test_pushed_changes(self):
+        source = MagicMock()
+        self.client.attach(source)
+        listener = source.add_listener.call_args[0][0]
+        await self.client.start()
+        updated_flag = FeatureFlag(
+            id=str(uuid.uuid4()),
+            name=random_word(),
+            code=self.disabled_flag.code,
+            enabled=True,
+        )
+        self.mock_repository.get_by_code.side_effect = lambda code, entity_class: (
+            updated_flag if code == updated_flag.code else None
+        )
+
+        listener(self.disabled_flag.code)
+        listener(self.enabled_flag.code)
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        self.assertTrue(self.client.is_enabled(self.disabled_flag.code))
+        self.assertIsNone(self.client.get(self.enabled_flag.code))
+        self.assertEqual(self.mock_repository.list_all.await_count, 1)
+
+    async def test_rejects_sources_reporting_before_commit(self):
+        # The service publishes to the bus inside the caller's transaction, so a
+        # refresh it triggers may read the row before the change commits.
+        bus = CacheInvalidationBus(AsyncMock())
+
+        with self.assertRaises(ValueError):
+            self.client.attach(bus)
+        self.assertEqual(bus._listeners, [])
+
+    async def test_change_feed_reports_after_commit(self):
+        feed = PostgresChangeFeed(dsn="postgresql://localhost/test")
+        self.client.attach(feed)
+        await self.client.start()
+        committed = FeatureFlag(
+            id=self.disabled_flag.id,
+            name=self.disabled_flag.name,
+            code=self.disabled_flag.code,
+            enabled=True,
+        )
+        self.mock_repository.get_by_code.return_value = committed
+
+        # The trigger's notification is delivered once the transaction commits.
+        feed._on_notification(
+            None,
+            0,
+            feed.channel,
+            orjson.dumps({"op": "UPDATE", "code": committed.code}).decode(),
+        )
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        self.assertTrue(self.client.is_enabled(committed.code))
+
+
+if __name__ == "__main__":
+    unittest.main()
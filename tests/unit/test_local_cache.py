@@ -0,0 +1,132 @@
+import unittest
+import uuid
+from dataclasses import replace
+from unittest.mock import AsyncMock
+
+from feature_flag.core import FeatureFlagNotFoundError
+from feature_flag.core.cache import TOMBSTONE
+from feature_flag.core.local_cache import LocalCache
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.test_utils import random_word
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLocalCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = LocalCache(max_size=2, ttl=10, clock=self.clock)
+
+    def test_get_and_set(self):
+        self.cache.set("a", 1)
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.stats.hits, 1)
+        self.assertEqual(self.cache.stats.misses, 1)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+        self.assertEqual(self.cache.stats.evictions, 1)
+
+    def test_entries_expire(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2, ttl=30)
+        self.clock.now = 15
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), 2)
+        self.assertEqual(self.cache.stats.expirations, 1)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_tombstones(self):
+        self.cache.set_tombstone("a", ttl=1)
+
+        self.assertIs(self.cache.get("a"), TOMBSTONE)
+        self.clock.now = 2
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats.tombstones, 1)
+        self.assertEqual(self.cache.stats.tombstone_hits, 1)
+
+    def test_delete_and_clear(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+
+        self.cache.delete("a")
+        self.assertIsNone(self.cache.get("a"))
+
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestFeatureFlagServiceWithLocalCache(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.mock_repository = AsyncMock()
+        self.local_cache = LocalCache()
+        self.service = FeatureFlagService(
+            self.mock_repository, local_cache=self.local_cache
+        )
+
+    async def test_get_feature_flag_served_from_local_cache(self):
+        flag = FeatureFlag(id=str(uuid.uuid4()), name=random_word(), code=random_word())
+        self.mock_repository.get_by_code.return_value = flag
+
+        first = await self.service.get_feature_flag_by_code(flag.code)
+        second = await self.service.get_feature_flag_by_code(flag.code)
+
+        self.mock_repository.get_by_code.assert_awaited_once()
+        self.assertEqual(first, flag)
+        self.assertEqual(second, flag)
+        self.assertIsNot(second, first)
+        self.assertEqual(self.local_cache.stats.hits, 1)
+
+    async def test_writes_invalidate_local_cache(self):
+        flag = FeatureFlag(id=str(uuid.uuid4()), name=random_word(), code=random_word())
+        self.mock_repository.get_by_code.return_value = flag
+        await self.service.get_feature_flag_by_code(flag.code)
+
+        self.mock_repository.update_by_code.return_value = replace(flag, enabled=True)
+        await self.service.enable_feature_flag(flag.code)
+        self.assertIsNone(self.local_cache.get(flag.code))
+
+        await self.service.get_feature_flag_by_code(flag.code)
+        await self.service.delete_feature_flag(flag.code)
+        self.assertIsNone(self.local_cache.get(flag.code))
+
+    async def test_unknown_code_is_negatively_cached(self):
+        self.service.negative_cache_ttl = 5
+        self.mock_repository.get_by_code.return_value = None
+        code = random_word()
+
+        for _ in range(3):
+            with self.assertRaises(FeatureFlagNotFoundError):
+                await self.service.get_feature_flag_by_code(code)
+
+        self.mock_repository.get_by_code.assert_awaited_once()
+        self.assertEqual(self.local_cache.stats.tombstone_hits, 2)
+
+        self.mock_repository.insert_returning.return_value = FeatureFlag(
+            id=str(uuid.uuid4()), name=random_word(), code=code
+        )
+        await self.service.create_feature_flag({"name": random_word(), "code": code})
+        self.assertIsNone(self.local_cache.get(code))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+import unittest
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+
+from feature_flag.core import FeatureFlagNotFoundError
+from feature_flag.core.cache import AsyncRedisCache, RedisCache
+from feature_flag.core.local_cache import LocalCache
+from feature_flag.core.metrics import (
+    NoopMetrics,
+    PrometheusMetrics,
+    get_default_metrics,
+    set_default_metrics,
+    timed,
+)
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.notification.change_status import ChangeStatus
+from feature_flag.notification.dispatcher import NotificationDispatcher
+from feature_flag.repositories.postgres_repository import PostgresRepository
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.test_utils import random_word
+
+
+class Component:
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    @timed("test", "work")
+    def work(self, fail=False):
+        if fail:
+            raise ValueError("boom")
+        return "done"
+
+    @timed("test", "lookup", expected=(KeyError,))
+    async def lookup(self, error=None):
+        if error is not None:
+            raise error
+        return "found"
+
+
+class TestPrometheusMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = PrometheusMetrics(buckets=(0.1, 1))
+
+    def test_render(self):
+        self.metrics.counter("requests_total", tier="local", result="hit").inc()
+        self.metrics.counter("requests_total", tier="local", result="hit").inc(2)
+        self.metrics.gauge("queue_depth").set(3)
+        histogram = self.metrics.histogram("latency_seconds", operation='say "hi"')
+        for value in (0.05, 0.1, 0.5, 7):
+            histogram.observe(value)
+
+        self.assertEqual(
+            self.metrics.render(),
+            "# TYPE latency_seconds histogram\n"
+            'latency_seconds_bucket{operation="say \\"hi\\"",le="0.1"} 2\n'
+            'latency_seconds_bucket{operation="say \\"hi\\"",le="1.0"} 3\n'
+            'latency_seconds_bucket{operation="say \\"hi\\"",le="+Inf"} 4\n'
+            'latency_seconds_sum{operation="say \\"hi\\""} 7.65\n'
+            'latency_seconds_count{operation="say \\"hi\\""} 4\n'
+            "# TYPE queue_depth gauge\n"
+            "queue_depth 3\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{result="hit",tier="local"} 3\n',
+        )
+
+    def test_instrument_kinds_cannot_be_mixed(self):
+        self.metrics.counter("value")
+
+        with self.assertRaises(ValueError):
+            self.metrics.gauge("value")
+
+    def test_noop_metrics_is_the_default(self):
+        metrics = NoopMetrics()
+        metrics.counter("requests_total").inc()
+        metrics.timer("test", "work").latency.observe(1)
+
+        self.assertIsInstance(get_default_metrics(), NoopMetrics)
+
+
+class TestTimed(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.metrics = PrometheusMetrics()
+        self.component = Component(self.metrics)
+
+    async def test_records_latency_and_errors(self):
+        self.assertEqual(self.component.work(), "done")
+        with self.assertRaises(ValueError):
+            self.component.work(fail=True)
+        self.assertEqual(await self.component.lookup(), "found")
+        with self.assertRaises(KeyError):
+            await self.component.lookup(KeyError("code"))
+        with self.assertRaises(RuntimeError):
+            await self.component.lookup(RuntimeError())
+
+        output = self.metrics.render()
+        self.assertIn(
+            'feature_flag_operation_duration_seconds_count{component="test",operation="work"} 2',
+            output,
+        )
+        self.assertIn(
+            'feature_flag_operation_errors_total{component="test",operation="work"} 1',
+            output,
+        )
+        self.assertIn(
+            'feature_flag_operation_duration_seconds_count{component="test",operation="lookup"} 3',
+            output,
+        )
+        self.assertIn(
+            'feature_flag_operation_errors_total{component="test",operation="lookup"} 1',
+            output,
+        )
+
+
+class TestInstrumentedComponents(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.metrics = PrometheusMetrics()
+
+    def value(self, name, **labels):
+        return self.metrics.counter(name, **labels).value
+
+    def test_local_cache(self):
+        cache = LocalCache(max_size=1, metrics=self.metrics)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        cache.set("b", 2)
+
+        self.assertEqual(
+            self.value("feature_flag_cache_requests_total", tier="local", result="hit"),
+            1,
+        )
+        self.assertEqual(
+            self.value(
+                "feature_flag_cache_requests_total", tier="local", result="miss"
+            ),
+            1,
+        )
+        self.assertEqual(
+            self.value("feature_flag_cache_evictions_total", tier="local"), 1
+        )
+
+    def test_redis_cache(self):
+        connection = MagicMock()
+        connection.get.side_effect = [orjson.dumps(1), None, Exception("timeout")]
+        cache = RedisCache(connection, metrics=self.metrics)
+
+        cache.get("a")
+        cache.get("b")
+        with self.assertRaises(Exception):
+            cache.get("c")
+
+        self.assertEqual(
+            self.value("feature_flag_cache_requests_total", tier="redis", result="hit"),
+            1,
+        )
+        self.assertEqual(
+            self.value(
+                "feature_flag_cache_requests_total", tier="redis", result="miss"
+            ),
+            1,
+        )
+        self.assertEqual(
+            self.value(
+                "feature_flag_operation_errors_total",
+                component="redis",
+                operation="get",
+            ),
+            1,
+        )
+
+    async def test_default_metrics(self):
+        set_default_metrics(self.metrics)
+        self.addCleanup(set_default_metrics, NoopMetrics())
+        connection = MagicMock()
+        connection.get = AsyncMock(return_value=None)
+        session = AsyncMock()
+        session.execute.return_value.fetchone = MagicMock(return_value=None)
+
+        await AsyncRedisCache(connection).get("a")
+        await PostgresRepository(session).get_by_code("a", entity_class=FeatureFlag)
+
+        output = self.metrics.render()
+        self.assertIn('component="redis",operation="get"} 1', output)
+        self.assertIn('component="postgres",operation="get_by_code"} 1', output)
+
+    async def test_service_does_not_count_not_found_as_error(self):
+        repository = AsyncMock()
+        repository.get_by_code.return_value = None
+        service = FeatureFlagService(repository, metrics=self.metrics)
+
+        with self.assertRaises(FeatureFlagNotFoundError):
+            await service.get_feature_flag_by_code(random_word())
+
+        self.assertEqual(
+            self.value(
+                "feature_flag_operation_errors_total",
+                component="service",
+                operation="get_feature_flag_by_code",
+            ),
+            0,
+        )
+
+    async def test_dispatcher_queue_depth(self):
+        dispatcher = NotificationDispatcher(MagicMock(), metrics=self.metrics)
+        flag = FeatureFlag(id=str(uuid.uuid4()), name=random_word(), code=random_word())
+
+        dispatcher.send(flag, ChangeStatus.ENABLED)
+        dispatcher.send(flag, ChangeStatus.DISABLED)
+
+        self.assertEqual(
+            self.metrics.gauge("feature_flag_notification_queue_depth").value, 2
+        )
+        await dispatcher.start()
+        await dispatcher.stop()
+        self.assertEqual(
+            self.metrics.gauge("feature_flag_notification_queue_depth").value, 0
+        )
+        self.assertEqual(
+            self.value("feature_flag_notifications_total", result="sent"), 2
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
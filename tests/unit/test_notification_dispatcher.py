@@ -0,0 +1,99 @@
+import asyncio
+import unittest
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.notification.change_status import ChangeStatus
+from feature_flag.notification.dispatcher import NotificationDispatcher
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.test_utils import random_word
+
+
+class TestNotificationDispatcher(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.feature_flag = FeatureFlag(
+            id=str(uuid.uuid4()), name=random_word(), code=random_word()
+        )
+
+    async def test_delivers_in_background(self):
+        notifier = MagicMock()
+        notifier.send = AsyncMock()
+        dispatcher = NotificationDispatcher(notifier)
+        await dispatcher.start()
+
+        dispatcher.send(self.feature_flag, ChangeStatus.ENABLED)
+        self.feature_flag.enabled = True
+        notifier.send.assert_not_called()
+        await dispatcher.stop()
+
+        notifier.send.assert_awaited_once()
+        sent_flag, change_status = notifier.send.call_args[0]
+        self.assertFalse(sent_flag.enabled)
+        self.assertEqual(change_status, ChangeStatus.ENABLED)
+        self.assertEqual(dispatcher.stats.sent, 1)
+
+    async def test_sync_notifier_runs_in_thread(self):
+        notifier = MagicMock()
+        dispatcher = NotificationDispatcher(notifier)
+        await dispatcher.start()
+
+        dispatcher.send(self.feature_flag, ChangeStatus.DISABLED)
+        await dispatcher.stop()
+
+        notifier.send.assert_called_once()
+
+    async def test_failures_are_counted(self):
+        notifier = MagicMock()
+        notifier.send = AsyncMock(side_effect=[Exception("down"), None])
+        dispatcher = NotificationDispatcher(notifier)
+        await dispatcher.start()
+
+        dispatcher.send(self.feature_flag, ChangeStatus.ENABLED)
+        dispatcher.send(self.feature_flag, ChangeStatus.DISABLED)
+        await dispatcher.stop()
+
+        self.assertEqual((dispatcher.stats.sent, dispatcher.stats.failed), (1, 1))
+
+    async def test_full_queue_drops_events(self):
+        dispatcher = NotificationDispatcher(MagicMock(), max_queue_size=1)
+
+        dispatcher.send(self.feature_flag, ChangeStatus.ENABLED)
+        dispatcher.send(self.feature_flag, ChangeStatus.DISABLED)
+
+        self.assertEqual(dispatcher.stats.dropped, 1)
+
+    async def test_stop_gives_up_after_drain_timeout(self):
+        async def send(feature_flag, change_status):
+            await asyncio.sleep(10)
+
+        notifier = MagicMock()
+        notifier.send = AsyncMock(side_effect=send)
+        dispatcher = NotificationDispatcher(notifier, drain_timeout=0.01)
+        await dispatcher.start()
+
+        dispatcher.send(self.feature_flag, ChangeStatus.ENABLED)
+        dispatcher.send(self.feature_flag, ChangeStatus.DISABLED)
+        await dispatcher.stop()
+
+        self.assertEqual(dispatcher.stats.sent, 0)
+
+    async def test_service_does_not_wait_for_delivery(self):
+        notifier = MagicMock()
+        notifier.send = AsyncMock()
+        dispatcher = NotificationDispatcher(notifier)
+        repository = AsyncMock()
+        repository.update_by_code.return_value = self.feature_flag
+        service = FeatureFlagService(repository, notifier=dispatcher)
+
+        await service.enable_feature_flag(self.feature_flag.code)
+
+        notifier.send.assert_not_called()
+        await dispatcher.start()
+        await dispatcher.stop()
+        notifier.send.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
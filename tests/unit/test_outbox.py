@@ -0,0 +1,238 @@
+import unittest
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import httpx
+import orjson
+
+from feature_flag.core.cache import orjson_default
+from feature_flag.models.codec import feature_flag_codec
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.models.outbox_event import OutboxEvent
+from feature_flag.notification.async_slack_notifier import AsyncSlackNotifier
+from feature_flag.notification.change_status import ChangeStatus
+from feature_flag.notification.coalescing_notifier import CoalescingNotifier
+from feature_flag.repositories.outbox_repository import OutboxRepository
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from feature_flag.services.outbox_relay import OutboxRelay
+from tests.test_utils import bound_parameters, random_word
+
+
+class FakeTransaction:
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, *args):
+        self.session.committed = exc_type is None
+        return False
+
+
+class FakeSession:
+    def __init__(self):
+        self.committed = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def begin(self):
+        return FakeTransaction(self)
+
+
+def make_event(flag, change_status, event_id, attempts=0):
+    payload = orjson.loads(
+        orjson.dumps(feature_flag_codec.as_dict(flag), default=orjson_default)
+    )
+    return OutboxEvent(
+        id=event_id,
+        code=flag.code,
+        change_status=change_status.value,
+        payload=payload,
+        attempts=attempts,
+    )
+
+
+class TestOutboxRepository(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.session = AsyncMock()
+        self.repository = OutboxRepository(self.session)
+
+    def executed(self):
+        statement, params = self.session.execute.call_args[0]
+        return str(statement), params
+
+    async def test_add(self):
+        created_at = datetime(2024, 9, 25, tzinfo=timezone.utc)
+        await self.repository.add(
+            OutboxEvent(
+                code="code",
+                change_status="enabled",
+                payload={"code": "code", "created_at": created_at},
+            )
+        )
+
+        sql, params = bound_parameters(*self.session.execute.call_args[0])
+        self.assertIn("INSERT INTO feature_flag_outbox", sql)
+        self.assertIn("$3::JSONB", sql)
+        self.assertEqual(
+            params,
+            {
+                "code": "code",
+                "change_status": "enabled",
+                "payload": '{"code":"code","created_at":"2024-09-25T00:00:00+00:00"}',
+                "attempts": 0,
+            },
+        )
+
+    async def test_fetch_batch_skips_locked_rows(self):
+        self.session.execute.return_value.fetchall = MagicMock(
+            return_value=[("code", "enabled", {"code": "code"}, 7, 0, None)]
+        )
+
+        events = await self.repository.fetch_batch(limit=10)
+
+        query, params = self.executed()
+        self.assertIn("ORDER BY id LIMIT :limit FOR UPDATE SKIP LOCKED", query)
+        self.assertEqual(params, {"limit": 10})
+        self.assertEqual(events[0].id, 7)
+
+
+class TestOutboxRelay(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.flag = FeatureFlag(
+            id=str(uuid.uuid4()),
+            name=random_word(),
+            code=random_word(),
+            enabled=True,
+            created_at=datetime(2024, 9, 25, tzinfo=timezone.utc),
+        )
+        self.repository = AsyncMock()
+        patcher = patch(
+            "feature_flag.services.outbox_relay.OutboxRepository",
+            return_value=self.repository,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session = FakeSession()
+        self.notifier = MagicMock()
+        self.notifier.send_batch = AsyncMock()
+        self.relay = OutboxRelay(lambda: self.session, self.notifier)
+
+    async def test_delivers_and_deletes_batch(self):
+        self.repository.fetch_batch.return_value = [
+            make_event(self.flag, ChangeStatus.ENABLED, 1),
+            make_event(self.flag, ChangeStatus.UPDATED, 2),
+        ]
+
+        self.assertEqual(await self.relay.relay_once(), 2)
+
+        events = self.notifier.send_batch.call_args[0][0]
+        self.assertEqual(
+            events,
+            [(self.flag, ChangeStatus.ENABLED), (self.flag, ChangeStatus.UPDATED)],
+        )
+        self.repository.delete.assert_awaited_once_with([1, 2])
+        self.assertTrue(self.session.committed)
+
+    async def test_empty_outbox(self):
+        self.repository.fetch_batch.return_value = []
+
+        self.assertEqual(await self.relay.relay_once(), 0)
+        self.notifier.send_batch.assert_not_called()
+
+    async def test_failed_delivery_is_kept_and_counted(self):
+        self.relay.max_attempts = 3
+        self.repository.fetch_batch.return_value = [
+            make_event(self.flag, ChangeStatus.ENABLED, 1, attempts=2),
+            make_event(self.flag, ChangeStatus.DISABLED, 2),
+        ]
+        self.notifier.send_batch.side_effect = Exception("slack is down")
+
+        with self.assertRaises(Exception):
+            await self.relay.relay_once()
+
+        self.repository.delete.assert_awaited_once_with([1])
+        self.repository.record_failure.assert_awaited_once_with([2])
+        self.assertTrue(self.session.committed)
+
+    async def test_undecodable_event_does_not_block_batch(self):
+        # Written by a release whose flags had a required field this one lacks.
+        foreign = make_event(self.flag, ChangeStatus.ENABLED, 1, attempts=9)
+        foreign.payload = {"code": self.flag.code}
+        self.repository.fetch_batch.return_value = [
+            foreign,
+            make_event(self.flag, ChangeStatus.UPDATED, 2),
+        ]
+
+        self.assertEqual(await self.relay.relay_once(), 1)
+
+        self.assertEqual(
+            self.notifier.send_batch.call_args[0][0],
+            [(self.flag, ChangeStatus.UPDATED)],
+        )
+        # The default max_attempts of 10 discards it on this failure.
+        self.repository.delete.assert_has_awaits([call([2]), call([1])])
+        self.repository.record_failure.assert_not_called()
+        self.assertTrue(self.session.committed)
+
+    async def test_delivers_through_coalescing_slack_notifier(self):
+        requests = []
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: requests.append(request) or httpx.Response(200)
+            )
+        )
+        self.addAsyncCleanup(client.aclose)
+        notifier = CoalescingNotifier(
+            AsyncSlackNotifier("https://hooks.slack.com/x", client=client), window=60
+        )
+        relay = OutboxRelay(lambda: self.session, notifier)
+        other = FeatureFlag(name=random_word(), code=random_word())
+        self.repository.fetch_batch.return_value = [
+            make_event(self.flag, ChangeStatus.ENABLED, 1),
+            make_event(other, ChangeStatus.DELETED, 2),
+        ]
+
+        self.assertEqual(await relay.relay_once(), 2)
+
+        # The digest was sent before the events were deleted.
+        self.assertEqual(
+            orjson.loads(requests[0].content)["text"],
+            f"2 feature flag changes:\n"
+            f"Feature Flag[Code=`{self.flag.code}`] has been enabled\n"
+            f"Feature Flag[Code=`{other.code}`] has been deleted",
+        )
+        self.repository.delete.assert_awaited_once_with([1, 2])
+        self.assertTrue(self.session.committed)
+
+
+class TestServiceOutbox(unittest.IsolatedAsyncioTestCase):
+
+    async def test_notifications_go_to_outbox(self):
+        flag = FeatureFlag(id=str(uuid.uuid4()), name=random_word(), code=random_word())
+        repository = AsyncMock()
+        repository.update_by_code.return_value = flag
+        outbox = AsyncMock()
+        notifier = MagicMock()
+        service = FeatureFlagService(repository, notifier=notifier, outbox=outbox)
+
+        await service.disable_feature_flag(flag.code)
+
+        event = outbox.add.call_args[0][0]
+        self.assertEqual(
+            (event.code, event.change_status), (flag.code, ChangeStatus.DISABLED.value)
+        )
+        self.assertEqual(feature_flag_codec.decode(event.payload), flag)
+        notifier.send.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+import unittest
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.repositories.postgres_repository import PostgresRepository
+from tests.test_utils import bound_parameters, random_word
+
+FIELDS = list(FeatureFlag.__dataclass_fields__.keys())
+
+
+def make_row(created_at, code=None):
+    flag = FeatureFlag(
+        id=uuid.uuid4(),
+        name=random_word(),
+        code=code or random_word(),
+        created_at=created_at,
+    )
+    return tuple(getattr(flag, field) for field in FIELDS)
+
+
+class TestPostgresRepository(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.session = AsyncMock()
+        self.result = MagicMock()
+        self.session.execute.return_value = self.result
+        self.repository = PostgresRepository(self.session)
+
+    def executed(self):
+        statement, params = self.session.execute.call_args[0]
+        return str(statement), params
+
+    async def test_list_is_ordered_and_parameterized(self):
+        self.result.fetchall.return_value = []
+
+        await self.repository.list(skip=20, limit=10, entity_class=FeatureFlag)
+
+        query, params = self.executed()
+        self.assertIn("ORDER BY created_at, id LIMIT :limit OFFSET :skip", query)
+        self.assertEqual(params, {"limit": 10, "skip": 20})
+
+    async def test_statements_are_reused(self):
+        row = make_row(datetime(2024, 9, 25, tzinfo=timezone.utc))
+        self.result.fetchone.return_value = row
+
+        first = await self.repository.get_by_code(row[1], FeatureFlag)
+        second = await self.repository.get_by_code(row[1], FeatureFlag)
+
+        first_statement, second_statement = (
+            call[0][0] for call in self.session.execute.call_args_list
+        )
+        self.assertIs(first_statement, second_statement)
+        self.assertEqual(first, FeatureFlag(**dict(zip(FIELDS, row))))
+        self.assertEqual(first, second)
+
+    async def test_insert_returning(self):
+        row = make_row(datetime(2024, 9, 25, tzinfo=timezone.utc))
+        self.result.fetchone.return_value = row
+        flag = FeatureFlag(name=row[0], code=row[1])
+
+        stored = await self.repository.insert_returning(flag)
+
+        query, params = self.executed()
+        self.assertIn(f"RETURNING {', '.join(FIELDS)}", query)
+        self.assertEqual(params["code"], flag.code)
+        self.assertEqual(stored.created_at, row[FIELDS.index("created_at")])
+
+    async def test_metadata_is_bound_as_jsonb(self):
+        self.result.fetchone.return_value = make_row(None)
+        flag = FeatureFlag(name="name", code="code", metadata={"targeting": [1]})
+
+        await self.repository.insert_returning(flag)
+        sql, params = bound_parameters(*self.session.execute.call_args[0])
+        self.assertIn("$5::JSONB", sql)
+        self.assertEqual(params["metadata"], '{"targeting":[1]}')
+
+        await self.repository.update_by_code(
+            "code", {"metadata": {"a": None}}, FeatureFlag
+        )
+        sql, params = bound_parameters(*self.session.execute.call_args[0])
+        self.assertIn("metadata = $1::JSONB", sql)
+        self.assertEqual(params["metadata"], '{"a":null}')
+
+        await self.repository.update_by_code("code", {"metadata": None}, FeatureFlag)
+        _, params = bound_parameters(*self.session.execute.call_args[0])
+        self.assertIsNone(params["metadata"])
+
+    async def test_update_sends_only_given_fields(self):
+        row = make_row(datetime(2024, 9, 25, tzinfo=timezone.utc))
+        self.result.fetchone.return_value = row
+        flag = FeatureFlag(**dict(zip(FIELDS, row)))
+
+        stored = await self.repository.update(flag, fields=["enabled"])
+
+        query, params = self.executed()
+        self.assertIn(
+            "UPDATE feature_flags SET enabled = :enabled WHERE id = :id", query
+        )
+        self.assertEqual(params, {"enabled": flag.enabled, "id": flag.id})
+        self.assertEqual(stored, flag)
+
+    async def test_update_missing_row(self):
+        self.result.fetchone.return_value = None
+        flag = FeatureFlag(id=str(uuid.uuid4()), name=random_word(), code=random_word())
+
+        self.assertIsNone(await self.repository.update(flag))
+        query, params = self.executed()
+        self.assertIn("SET name = :name, code = :code, description", query)
+
+    async def test_update_rejects_unknown_fields(self):
+        flag = FeatureFlag(id=str(uuid.uuid4()), name=random_word(), code=random_word())
+
+        with self.assertRaises(ValueError):
+            await self.repository.update(flag, fields=["created_at"])
+        with self.assertRaises(ValueError):
+            await self.repository.update(flag, fields=[])
+        self.session.execute.assert_not_called()
+
+    async def test_update_by_code_compare_and_set(self):
+        version = datetime(2024, 9, 25, tzinfo=timezone.utc)
+        self.result.fetchone.return_value = None
+
+        stored = await self.repository.update_by_code(
+            "old", {"code": "new"}, FeatureFlag, expected_version=version
+        )
+
+        query, params = self.executed()
+        self.assertIsNone(stored)
+        self.assertIn(
+            "SET code = :code WHERE code = :match_code"
+            " AND COALESCE(updated_at, created_at) = :expected_version RETURNING",
+            query,
+        )
+        self.assertEqual(
+            params, {"code": "new", "match_code": "old", "expected_version": version}
+        )
+
+    async def test_update_by_code_unconditional(self):
+        row = make_row(datetime(2024, 9, 25, tzinfo=timezone.utc))
+        self.result.fetchone.return_value = row
+
+        stored = await self.repository.update_by_code(
+            row[1], {"enabled": True}, FeatureFlag
+        )
+
+        query, params = self.executed()
+        self.assertIn(
+            "SET enabled = :enabled WHERE code = :match_code RETURNING", query
+        )
+        self.assertEqual(params, {"enabled": True, "match_code": row[1]})
+        self.assertEqual(stored.code, row[1])
+
+    async def test_list_page_walks_pages_with_cursor(self):
+        created_at = datetime(2024, 9, 25, tzinfo=timezone.utc)
+        rows = [make_row(created_at) for _ in range(3)]
+        self.result.fetchall.return_value = rows
+
+        page = await self.repository.list_page(limit=2, entity_class=FeatureFlag)
+
+        query, params = self.executed()
+        self.assertNotIn("WHERE", query)
+        self.assertIn("ORDER BY created_at, id LIMIT :limit", query)
+        self.assertEqual(params, {"limit": 3})
+        self.assertEqual(len(page.items), 2)
+        self.assertIsNotNone(page.next_cursor)
+
+        self.result.fetchall.return_value = rows[2:]
+        page = await self.repository.list_page(
+            limit=2, entity_class=FeatureFlag, cursor=page.next_cursor
+        )
+
+        query, params = self.executed()
+        self.assertIn(
+            "WHERE (created_at, id) > (:created_at, CAST(:id AS uuid))", query
+        )
+        self.assertEqual(params["created_at"], created_at)
+        self.assertEqual(params["id"], str(rows[1][FIELDS.index("id")]))
+        self.assertEqual(len(page.items), 1)
+        self.assertIsNone(page.next_cursor)
+
+    async def test_list_page_by_code(self):
+        self.result.fetchall.return_value = [make_row(None, "a"), make_row(None, "b")]
+
+        page = await self.repository.list_page(
+            limit=1, entity_class=FeatureFlag, order_by="code"
+        )
+        await self.repository.list_page(
+            limit=1, entity_class=FeatureFlag, cursor=page.next_cursor, order_by="code"
+        )
+
+        query, params = self.executed()
+        self.assertIn("WHERE code > :code ORDER BY code", query)
+        self.assertEqual(params["code"], "a")
+
+    async def test_list_page_rejects_invalid_cursor(self):
+        self.result.fetchall.return_value = [make_row(None, "a"), make_row(None, "b")]
+        page = await self.repository.list_page(
+            limit=1, entity_class=FeatureFlag, order_by="code"
+        )
+
+        with self.assertRaises(ValueError):
+            await self.repository.list_page(
+                limit=1, entity_class=FeatureFlag, cursor="not-a-cursor"
+            )
+        with self.assertRaises(ValueError):
+            await self.repository.list_page(
+                limit=1, entity_class=FeatureFlag, cursor=page.next_cursor
+            )
+        with self.assertRaises(ValueError):
+            await self.repository.list_page(
+                limit=1, entity_class=FeatureFlag, order_by="name"
+            )
+
+    async def test_bulk_upsert(self):
+        self.result.fetchall.side_effect = [
+            [make_row(None, "a"), make_row(None, "b")],
+            [make_row(None, "c")],
+        ]
+        entities = [
+            FeatureFlag(name="first", code="a"),
+            FeatureFlag(name="second", code="b", metadata={"owner": "team"}),
+            FeatureFlag(name="third", code="a"),
+            FeatureFlag(name="fourth", code="c"),
+        ]
+
+        stored = await self.repository.bulk_upsert(entities, batch_size=2)
+
+        self.assertEqual([flag.code for flag in stored], ["a", "b", "c"])
+        self.assertEqual(self.session.execute.await_count, 2)
+        first_query, first_params = self.session.execute.call_args_list[0][0]
+        self.assertIn(
+            "INSERT INTO feature_flags (name, code, description, enabled, metadata)"
+            " VALUES (:name_0, :code_0, :description_0, :enabled_0, :metadata_0),"
+            " (:name_1, :code_1, :description_1, :enabled_1, :metadata_1)"
+            " ON CONFLICT (code) DO UPDATE SET name = EXCLUDED.name,",
+            str(first_query),
+        )
+        self.assertIn("RETURNING name, code, id,", str(first_query))
+        self.assertEqual(first_params["name_0"], "third")
+        self.assertEqual(first_params["code_1"], "b")
+        _, bound = bound_parameters(first_query, first_params)
+        self.assertIsNone(bound["metadata_0"])
+        self.assertEqual(bound["metadata_1"], '{"owner":"team"}')
+
+    async def test_bulk_upsert_batches_stay_under_parameter_limit(self):
+        self.result.fetchall.return_value = []
+        entities = [
+            FeatureFlag(name=str(index), code=str(index)) for index in range(7000)
+        ]
+
+        await self.repository.bulk_upsert(entities, batch_size=10_000)
+
+        # 5 fields per row: 6553 rows fit in 32767 parameters.
+        batches = [len(call[0][1]) for call in self.session.execute.call_args_list]
+        self.assertEqual(batches, [6553 * 5, 447 * 5])
+
+    async def test_bulk_upsert_without_entities(self):
+        self.assertEqual(await self.repository.bulk_upsert([]), [])
+        self.session.execute.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
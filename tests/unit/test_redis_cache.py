@@ -0,0 +1,150 @@
+import unittest
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import orjson
+
+from feature_flag.core.cache import TOMBSTONE, AsyncRedisCache, RedisCache
+from feature_flag.models.codec import feature_flag_codec
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.test_utils import random_word
+
+
+class TestRedisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = MagicMock()
+        self.cache = RedisCache(self.connection, namespace="feature-flag")
+
+    def test_set_uses_namespace(self):
+        self.cache.set(key="code", value={"enabled": True})
+
+        self.connection.set.assert_called_once_with(
+            "feature-flag:code", orjson.dumps({"enabled": True}), px=None
+        )
+
+    def test_set_with_ttl(self):
+        self.cache.set(key="code", value=1, ttl=1.5)
+
+        self.connection.set.assert_called_once_with(
+            "feature-flag:code", orjson.dumps(1), px=1500
+        )
+
+    def test_get_with_ttl(self):
+        pipeline = self.connection.pipeline.return_value
+        pipeline.execute.side_effect = [[orjson.dumps(1), 2500], [None, -2]]
+
+        self.assertEqual(self.cache.get_with_ttl(key="code"), (1, 2.5))
+        self.assertEqual(self.cache.get_with_ttl(key="code"), (None, None))
+
+    def test_get_missing_key(self):
+        self.connection.get.return_value = None
+
+        self.assertIsNone(self.cache.get(key="code"))
+
+    def test_get_many_uses_non_atomic_mget_on_cluster(self):
+        self.connection.mget_nonatomic.return_value = [orjson.dumps(1), None]
+
+        result = self.cache.get_many(keys=["a", "b"])
+
+        self.connection.mget_nonatomic.assert_called_once_with(
+            ["feature-flag:a", "feature-flag:b"]
+        )
+        self.assertEqual(result, [1, None])
+
+    def test_set_many_uses_pipeline(self):
+        pipeline = self.connection.pipeline.return_value
+
+        self.cache.set_many(mapping={"a": 1, "b": 2})
+
+        self.connection.pipeline.assert_called_once_with(transaction=False)
+        self.assertEqual(pipeline.set.call_count, 2)
+        pipeline.execute.assert_called_once()
+
+    def test_set_tombstones_many_uses_pipeline(self):
+        pipeline = self.connection.pipeline.return_value
+
+        self.cache.set_tombstones_many(keys=["a", "b"], ttl=2.5)
+
+        self.connection.pipeline.assert_called_once_with(transaction=False)
+        self.assertEqual(
+            [call[0][0] for call in pipeline.set.call_args_list],
+            ["feature-flag:a", "feature-flag:b"],
+        )
+        self.assertEqual(pipeline.set.call_args[1], {"px": 2500})
+        pipeline.execute.assert_called_once()
+        self.assertEqual(self.cache.stats.tombstones, 2)
+
+
+class TestAsyncRedisCache(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.connection = AsyncMock()
+        self.cache = AsyncRedisCache(self.connection, namespace="feature-flag")
+
+    async def test_set_and_get(self):
+        value = {"code": "code", "enabled": True}
+        self.connection.get.return_value = orjson.dumps(value)
+
+        await self.cache.set(key="code", value=value)
+        result = await self.cache.get(key="code")
+
+        self.connection.set.assert_awaited_once_with(
+            "feature-flag:code", orjson.dumps(value), px=None
+        )
+        self.connection.get.assert_awaited_once_with("feature-flag:code")
+        self.assertEqual(result, value)
+
+    async def test_get_missing_key(self):
+        self.connection.get.return_value = None
+
+        self.assertIsNone(await self.cache.get(key="code"))
+
+    async def test_tombstone(self):
+        await self.cache.set_tombstone(key="code", ttl=2.5)
+        payload = self.connection.set.call_args[0][1]
+        self.connection.get.return_value = payload
+
+        self.assertIs(await self.cache.get(key="code"), TOMBSTONE)
+        self.connection.set.assert_awaited_once_with(
+            "feature-flag:code", payload, px=2500
+        )
+        self.assertEqual(self.cache.stats.tombstones, 1)
+        self.assertEqual(self.cache.stats.tombstone_hits, 1)
+
+    async def test_set_tombstones_many(self):
+        pipeline = MagicMock()
+        pipeline.execute = AsyncMock()
+        self.connection.pipeline = MagicMock(return_value=pipeline)
+        pipeline.__aenter__ = AsyncMock(return_value=pipeline)
+        pipeline.__aexit__ = AsyncMock(return_value=False)
+
+        await self.cache.set_tombstones_many(keys=["a", "b"], ttl=2.5)
+        await self.cache.set_tombstones_many(keys=[], ttl=2.5)
+
+        self.connection.pipeline.assert_called_once_with(transaction=False)
+        self.assertEqual(pipeline.set.call_count, 2)
+        pipeline.execute.assert_awaited_once()
+
+    async def test_delete(self):
+        await self.cache.delete(key="code")
+
+        self.connection.delete.assert_awaited_once_with("feature-flag:code")
+
+    async def test_service_awaits_async_cache(self):
+        flag = FeatureFlag(
+            id=str(uuid.uuid4()), name=random_word(), code=random_word(), enabled=True
+        )
+        self.connection.get.return_value = orjson.dumps(feature_flag_codec.encode(flag))
+        repository = AsyncMock()
+        service = FeatureFlagService(repository, self.cache)
+
+        result = await service.get_feature_flag_by_code(code=flag.code)
+
+        self.assertEqual(result, flag)
+        repository.get_by_code.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
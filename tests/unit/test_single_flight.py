@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+import uuid
+from unittest.mock import AsyncMock
+
+from feature_flag.core.single_flight import SingleFlight
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.test_utils import random_word
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.single_flight = SingleFlight()
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def _fetch(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.calls
+
+    async def test_concurrent_calls_are_coalesced(self):
+        tasks = [
+            asyncio.create_task(self.single_flight.do("key", self._fetch))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        self.release.set()
+
+        results = await asyncio.gather(*tasks)
+
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(self.single_flight), 0)
+
+    async def test_exception_is_shared(self):
+        async def fail():
+            await self.release.wait()
+            raise ValueError("boom")
+
+        tasks = [
+            asyncio.create_task(self.single_flight.do("key", fail)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        self.release.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    async def test_waiter_takes_over_when_leader_is_cancelled(self):
+        leader = asyncio.create_task(self.single_flight.do("key", self._fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(self.single_flight.do("key", self._fetch))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        self.release.set()
+
+        self.assertEqual(await waiter, 2)
+        self.assertTrue(leader.cancelled())
+
+    async def test_service_fetches_once_for_concurrent_misses(self):
+        flag = FeatureFlag(id=str(uuid.uuid4()), name=random_word(), code=random_word())
+        repository = AsyncMock()
+
+        async def get_by_code(code, entity_class):
+            await self.release.wait()
+            return flag
+
+        repository.get_by_code.side_effect = get_by_code
+        service = FeatureFlagService(repository, single_flight=self.single_flight)
+        tasks = [
+            asyncio.create_task(service.get_feature_flag_by_code(flag.code))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        self.release.set()
+
+        results = await asyncio.gather(*tasks)
+
+        repository.get_by_code.assert_awaited_once()
+        self.assertTrue(all(result == flag for result in results))
+        self.assertEqual(len({id(result) for result in results}), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+import asyncio
+import time
+import unittest
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from feature_flag.core.snapshot_store import Snapshot, SnapshotStore
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from feature_flag.services.feature_flag_snapshot_client import (
+    FeatureFlagSnapshotClient,
+)
+from feature_flag.services.snapshot_publisher import SnapshotPublisher
+from tests.test_utils import random_word
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class TimedSession(FakeSession):
+    """
+    A session answering the database time query of ``SnapshotPublisher``.
+    """
+
+    as_of = 1727222400.5
+
+    async def execute(self, statement):
+        result = MagicMock()
+        result.scalar_one.return_value = Decimal(str(self.as_of))
+        return result
+
+
+def make_flags(count):
+    return [
+        FeatureFlag(
+            id=str(uuid.uuid4()),
+            name=random_word(),
+            code=f"{random_word()}-{index}",
+            enabled=index % 2 == 0,
+            created_at=datetime(2024, 9, 25, tzinfo=timezone.utc),
+        )
+        for index in range(count)
+    ]
+
+
+class TestSnapshotStore(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.connection = MagicMock()
+        self.connection.eval = AsyncMock(return_value=3)
+        self.connection.hget = AsyncMock()
+        self.connection.hmget = AsyncMock()
+        self.store = SnapshotStore(self.connection, namespace="feature-flag")
+        self.flags = make_flags(50)
+
+    async def test_publish(self):
+        version = await self.store.publish(self.flags, as_of=1727222400.5)
+
+        self.assertEqual(version, 3)
+        script, key_count, key, as_of, data = self.connection.eval.call_args[0]
+        self.assertEqual((key_count, key), (1, "feature-flag:snapshot"))
+        self.assertEqual(as_of, "1727222400.5")
+        self.assertEqual(self.store.decode(data), self.flags)
+
+    async def test_superseded_publish(self):
+        self.connection.eval.return_value = 0
+
+        self.assertIsNone(await self.store.publish(self.flags, as_of=time.time()))
+
+    async def test_load(self):
+        data = self.store.encode(self.flags)
+        self.connection.hmget.return_value = [b"3", data]
+
+        snapshot = await self.store.load()
+
+        self.assertEqual(snapshot, Snapshot(version=3, entities=self.flags))
+        self.assertIsInstance(snapshot.entities[0].created_at, datetime)
+        self.connection.hget.assert_not_called()
+
+    async def test_load_skips_current_version(self):
+        self.connection.hget.return_value = b"3"
+
+        self.assertIsNone(await self.store.load(known_version=3))
+        self.connection.hmget.assert_not_called()
+
+        self.connection.hmget.return_value = [b"4", self.store.encode(self.flags)]
+        snapshot = await self.store.load(known_version=2)
+        self.assertEqual(snapshot.version, 4)
+
+    async def test_load_without_snapshot(self):
+        self.connection.hmget.return_value = [None, None]
+
+        self.assertIsNone(await self.store.load())
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.store.decode(b"\x00" + self.store.encode(self.flags)[1:])
+
+
+class TestSnapshotPublisher(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.flags = make_flags(3)
+        self.repository = AsyncMock()
+        self.repository.list_all.return_value = self.flags
+        patcher = patch(
+            "feature_flag.services.snapshot_publisher.PostgresRepository",
+            return_value=self.repository,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = MagicMock()
+        self.store.publish = AsyncMock(return_value=1)
+        self.publisher = SnapshotPublisher(self.store, TimedSession, debounce=0)
+
+    async def asyncTearDown(self):
+        await self.publisher.stop()
+
+    async def test_rebuild_requests_are_debounced(self):
+        for _ in range(5):
+            self.publisher.request_rebuild()
+            await asyncio.sleep(0)
+        await self.publisher.stop()
+
+        self.repository.list_all.assert_awaited_once()
+        self.store.publish.assert_awaited_once()
+        self.assertEqual(self.store.publish.call_args[0][0], self.flags)
+        self.assertEqual(self.store.publish.call_args[1], {"as_of": TimedSession.as_of})
+
+    async def test_attached_source_requests_rebuild(self):
+        source = MagicMock()
+        self.publisher.attach(source)
+        listener = source.add_listener.call_args[0][0]
+
+        listener("code")
+        await self.publisher.stop()
+
+        self.store.publish.assert_awaited_once()
+
+    async def test_periodic_rebuild(self):
+        self.publisher.rebuild_interval = 0.01
+        await self.publisher.start()
+        await asyncio.sleep(0.05)
+        await self.publisher.stop()
+
+        self.assertGreaterEqual(self.store.publish.await_count, 2)
+
+    async def test_service_requests_rebuild_on_write(self):
+        publisher = MagicMock()
+        repository = AsyncMock()
+        repository.update_by_code.return_value = self.flags[0]
+        service = FeatureFlagService(repository, snapshot_publisher=publisher)
+
+        await service.enable_feature_flag(self.flags[0].code)
+
+        publisher.request_rebuild.assert_called_once()
+
+
+class TestSnapshotClientBootstrap(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.flags = make_flags(3)
+        self.repository = AsyncMock()
+        patcher = patch(
+            "feature_flag.services.feature_flag_snapshot_client.PostgresRepository",
+            return_value=self.repository,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = MagicMock()
+        self.store.load = AsyncMock(return_value=Snapshot(1, self.flags))
+        self.client = FeatureFlagSnapshotClient(FakeSession, snapshot_store=self.store)
+
+    async def test_bootstraps_from_store(self):
+        await self.client.start()
+
+        self.assertEqual(self.client.is_enabled(self.flags[0].code), True)
+        self.repository.list_all.assert_not_called()
+
+        self.store.load.return_value = None
+        await self.client.refresh()
+        self.store.load.assert_awaited_with(known_version=1)
+        self.repository.list_all.assert_not_called()
+
+    async def test_falls_back_to_database(self):
+        self.store.load.side_effect = ConnectionError("down")
+        self.repository.list_all.return_value = self.flags
+
+        await self.client.start()
+
+        self.assertEqual(len(self.client.flags), 3)
+        self.repository.list_all.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import unittest
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+from feature_flag.core import FeatureFlagError
+from feature_flag.core.targeting import (
+    BUCKETS,
+    EvaluatorCache,
+    bucket,
+    compile_targeting,
+)
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from tests.test_utils import random_word
+
+
+def make_flag(targeting=None, enabled=True, **kwargs):
+    metadata = {"targeting": targeting} if targeting is not None else None
+    return FeatureFlag(
+        name=random_word(),
+        code=random_word(),
+        enabled=enabled,
+        metadata=metadata,
+        **kwargs,
+    )
+
+
+class TestCompileTargeting(unittest.TestCase):
+
+    def test_without_targeting_follows_enabled(self):
+        self.assertTrue(compile_targeting(make_flag())({}))
+        self.assertFalse(compile_targeting(make_flag(enabled=False))({}))
+
+    def test_disabled_flag_is_off_for_every_context(self):
+        evaluator = compile_targeting(
+            make_flag({"rules": [{"attributes": {"plan": ["pro"]}}]}, enabled=False)
+        )
+
+        self.assertFalse(evaluator({"plan": "pro"}))
+
+    def test_attribute_rules(self):
+        evaluator = compile_targeting(
+            make_flag(
+                {
+                    "rules": [
+                        {"attributes": {"country": ["DE", "AT"], "plan": ["pro"]}},
+                        {"attributes": {"beta": [True]}},
+                    ]
+                }
+            )
+        )
+
+        self.assertTrue(evaluator({"country": "AT", "plan": "pro"}))
+        self.assertTrue(evaluator({"beta": True}))
+        self.assertFalse(evaluator({"country": "AT", "plan": "free"}))
+        self.assertFalse(evaluator({"country": "FR", "plan": "pro"}))
+        self.assertFalse(evaluator({}))
+        self.assertFalse(evaluator({"country": ["DE"], "plan": "pro"}))
+
+    def test_segment_rules_match_the_bucketing_key(self):
+        evaluator = compile_targeting(
+            make_flag(
+                {
+                    "segments": {"staff": ["u-1", "u-2"]},
+                    "rules": [{"segment": "staff"}],
+                    "bucket_by": "account_id",
+                }
+            )
+        )
+
+        self.assertTrue(evaluator({"account_id": "u-2"}))
+        self.assertFalse(evaluator({"user_id": "u-2"}))
+
+    def test_percentage_rollout(self):
+        flag = make_flag({"percentage": 30})
+        evaluator = compile_targeting(flag)
+
+        enabled = [evaluator({"user_id": f"user-{i}"}) for i in range(20000)]
+
+        self.assertAlmostEqual(sum(enabled) / len(enabled), 0.30, delta=0.02)
+        for i, value in enumerate(enabled[:100]):
+            self.assertEqual(
+                value, bucket(flag.code, f"user-{i}") < 30 * BUCKETS // 100
+            )
+        self.assertFalse(evaluator({}))
+
+    def test_rollouts_are_stable_and_monotonic(self):
+        flag = make_flag({"percentage": 10, "salt": "checkout"})
+        wider = replace(
+            flag, metadata={"targeting": {"percentage": 50, "salt": "checkout"}}
+        )
+        users = [{"user_id": i} for i in range(1000)]
+
+        narrow = [compile_targeting(flag)(user) for user in users]
+        wide = [compile_targeting(wider)(user) for user in users]
+
+        self.assertEqual(narrow, [compile_targeting(flag)(user) for user in users])
+        self.assertTrue(all(w for n, w in zip(narrow, wide) if n))
+        self.assertEqual(bucket("checkout", 42), 181)
+
+    def test_rules_take_precedence_over_percentage(self):
+        evaluator = compile_targeting(
+            make_flag({"rules": [{"attributes": {"plan": ["pro"]}}], "percentage": 0})
+        )
+
+        self.assertTrue(evaluator({"plan": "pro", "user_id": "1"}))
+        self.assertFalse(evaluator({"plan": "free", "user_id": "1"}))
+
+    def test_empty_targeting_enables_everyone(self):
+        self.assertTrue(compile_targeting(make_flag({}))({}))
+
+    def test_invalid_targeting(self):
+        invalid = [
+            [],
+            {"rules": {}},
+            {"rules": [{}]},
+            {"rules": [{"segment": "unknown"}]},
+            {"rules": [{"attributes": {"plan": "pro"}}]},
+            {"rules": [{"attributes": {"plan": [["pro"]]}}]},
+            {"rules": [{"attribute": "plan"}]},
+            {"percentage": 101},
+            {"percentage": "50"},
+            {"percentage": True},
+            {"segments": []},
+            {"bucket_by": 1},
+        ]
+        for targeting in invalid:
+            with self.subTest(targeting=targeting), self.assertRaises(ValueError):
+                compile_targeting(make_flag(targeting))
+
+
+class TestEvaluatorCache(unittest.TestCase):
+
+    def test_compiles_once_per_version(self):
+        cache = EvaluatorCache(maxsize=2)
+        created_at = datetime(2024, 9, 25, tzinfo=timezone.utc)
+        flag = make_flag({"percentage": 100}, created_at=created_at)
+
+        evaluator = cache.get(flag)
+
+        self.assertIs(cache.get(replace(flag)), evaluator)
+        updated = replace(
+            flag, enabled=False, updated_at=created_at + timedelta(seconds=1)
+        )
+        self.assertFalse(cache.get(updated)({"user_id": "1"}))
+        cache.get(make_flag(created_at=created_at))
+        self.assertEqual(len(cache), 2)
+
+    def test_flags_without_version_are_not_cached(self):
+        cache = EvaluatorCache()
+
+        cache.get(make_flag())
+
+        self.assertEqual(len(cache), 0)
+
+
+class TestServiceEvaluate(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.mock_repository = AsyncMock()
+        self.service = FeatureFlagService(self.mock_repository, None)
+
+    async def test_evaluate(self):
+        flag = make_flag({"rules": [{"attributes": {"plan": ["pro"]}}]})
+        self.mock_repository.get_by_code.return_value = flag
+
+        self.assertTrue(await self.service.evaluate(flag.code, {"plan": "pro"}))
+        self.assertFalse(await self.service.evaluate(flag.code, {"plan": "free"}))
+
+    async def test_evaluate_invalid_rules(self):
+        flag = make_flag({"percentage": 200})
+        self.mock_repository.get_by_code.return_value = flag
+
+        with self.assertRaises(FeatureFlagError):
+            await self.service.evaluate(flag.code, {})
+
+    async def test_invalid_rules_are_rejected_on_write(self):
+        with self.assertRaises(FeatureFlagError):
+            await self.service.create_feature_flag(
+                {
+                    "name": random_word(),
+                    "code": random_word(),
+                    "metadata": {"targeting": {"rules": [{}]}},
+                }
+            )
+        self.mock_repository.insert_returning.assert_not_called()
+
+        existing = make_flag()
+        self.mock_repository.get_by_code.return_value = existing
+        with self.assertRaises(FeatureFlagError):
+            await self.service.update_feature_flag(
+                existing.code, {"metadata": {"targeting": {"percentage": -1}}}
+            )
+        self.mock_repository.update_by_code.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
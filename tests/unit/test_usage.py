@@ -0,0 +1,193 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+from feature_flag.core import FeatureFlagError
+from feature_flag.core.usage_store import RedisUsageStore, UsageCount, hour_of
+from feature_flag.models.feature_flag import FeatureFlag
+from feature_flag.repositories.postgres_usage_store import PostgresUsageStore
+from feature_flag.services.feature_flag_service import FeatureFlagService
+from feature_flag.services.usage_recorder import UsageRecorder
+from tests.test_utils import random_word
+
+HOUR = hour_of(datetime(2024, 9, 25, 10, 30, tzinfo=timezone.utc))
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeSession:
+    def __init__(self):
+        self.execute = AsyncMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def begin(self):
+        return FakeTransaction()
+
+
+class TestUsageRecorder(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.store = AsyncMock()
+        self.recorder = UsageRecorder(self.store, flush_interval=60)
+
+    @patch("feature_flag.services.usage_recorder.time.time")
+    async def test_flush_writes_counts_per_code_result_and_hour(self, mock_time):
+        mock_time.return_value = HOUR * 3600 + 10
+        self.recorder.record("a", True)
+        self.recorder.record("a", True)
+        self.recorder.record("a", False, 5)
+        mock_time.return_value = (HOUR + 1) * 3600
+        self.recorder.record("a", True)
+
+        await self.recorder.flush()
+        await self.recorder.flush()
+
+        self.store.add.assert_awaited_once_with(
+            {
+                ("a", True, HOUR): 2,
+                ("a", False, HOUR): 5,
+                ("a", True, HOUR + 1): 1,
+            }
+        )
+
+    @patch("feature_flag.services.usage_recorder.time.time")
+    async def test_failed_flush_keeps_counts(self, mock_time):
+        mock_time.return_value = HOUR * 3600
+        self.store.add.side_effect = [Exception("redis is down"), None]
+        self.recorder.record("a", True, 2)
+
+        with self.assertRaises(Exception):
+            await self.recorder.flush()
+        self.recorder.record("a", True)
+        await self.recorder.flush()
+
+        self.store.add.assert_awaited_with({("a", True, HOUR): 3})
+
+    async def test_stop_flushes(self):
+        await self.recorder.start()
+        self.recorder.record("a", True)
+
+        await self.recorder.stop()
+
+        self.store.add.assert_awaited_once()
+
+
+class TestRedisUsageStore(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.connection = MagicMock()
+        self.pipeline = MagicMock()
+        self.pipeline.execute = AsyncMock()
+        self.connection.pipeline.return_value = self.pipeline
+        self.connection.hgetall = AsyncMock()
+        self.store = RedisUsageStore(self.connection, namespace="ff", retention=3600)
+
+    async def test_add_uses_one_pipeline(self):
+        await self.store.add({("a", True, HOUR): 2, ("a", False, HOUR): 1})
+
+        self.pipeline.hincrby.assert_any_call("ff:usage:a", f"{HOUR}:1", 2)
+        self.pipeline.hincrby.assert_any_call("ff:usage:a", f"{HOUR}:0", 1)
+        self.pipeline.expire.assert_called_once_with("ff:usage:a", 3600)
+        self.pipeline.execute.assert_awaited_once()
+
+    async def test_query(self):
+        self.connection.hgetall.return_value = {
+            f"{HOUR + 1}:1".encode(): b"4",
+            f"{HOUR}:0".encode(): b"2",
+            f"{HOUR - 5}:1".encode(): b"9",
+        }
+
+        usage = await self.store.query(
+            "a", since=datetime(2024, 9, 25, 10, 59, tzinfo=timezone.utc)
+        )
+
+        self.assertEqual(
+            usage,
+            [
+                UsageCount(datetime(2024, 9, 25, 10, tzinfo=timezone.utc), False, 2),
+                UsageCount(datetime(2024, 9, 25, 11, tzinfo=timezone.utc), True, 4),
+            ],
+        )
+
+
+class TestPostgresUsageStore(unittest.IsolatedAsyncioTestCase):
+
+    async def test_add_is_one_upsert(self):
+        session = FakeSession()
+        store = PostgresUsageStore(lambda: session)
+
+        await store.add({("a", True, HOUR): 2, ("b", False, HOUR): 1})
+
+        statement, params = session.execute.call_args[0]
+        self.assertIn("unnest", str(statement))
+        self.assertIn(
+            "count = feature_flag_usage.count + EXCLUDED.count", str(statement)
+        )
+        self.assertEqual(params["codes"], ["a", "b"])
+        self.assertEqual(
+            params["hours"], [datetime(2024, 9, 25, 10, tzinfo=timezone.utc)] * 2
+        )
+        self.assertEqual(params["results"], [True, False])
+        self.assertEqual(params["counts"], [2, 1])
+
+
+class TestServiceUsage(unittest.IsolatedAsyncioTestCase):
+
+    async def test_evaluate_is_recorded(self):
+        flag = FeatureFlag(name=random_word(), code=random_word(), enabled=True)
+        repository = AsyncMock()
+        repository.get_by_code.return_value = flag
+        recorder = MagicMock()
+        recorder.usage = AsyncMock(return_value=[])
+        service = FeatureFlagService(repository, usage_recorder=recorder)
+
+        await service.evaluate(flag.code, {})
+
+        recorder.record.assert_called_once_with(flag.code, True)
+        self.assertEqual(await service.get_feature_flag_usage(flag.code), [])
+
+    async def test_reads_are_recorded(self):
+        flags = [
+            FeatureFlag(name=random_word(), code=random_word(), enabled=enabled)
+            for enabled in (True, False)
+        ]
+        repository = AsyncMock()
+        repository.get_by_code.return_value = flags[0]
+        repository.get_by_codes.return_value = flags
+        recorder = MagicMock()
+        service = FeatureFlagService(repository, usage_recorder=recorder)
+
+        await service.get_feature_flag_by_code(flags[0].code)
+        await service.get_feature_flags_by_codes(
+            [flag.code for flag in flags] + ["unknown"]
+        )
+
+        self.assertEqual(
+            recorder.record.call_args_list,
+            [
+                call(flags[0].code, True),
+                call(flags[0].code, True),
+                call(flags[1].code, False),
+            ],
+        )
+
+    async def test_usage_requires_recorder(self):
+        service = FeatureFlagService(AsyncMock())
+
+        with self.assertRaises(FeatureFlagError):
+            await service.get_feature_flag_usage(random_word())
+
+
+if __name__ == "__main__":
+    unittest.main()